@@ -0,0 +1,80 @@
+"""Compares model construction and enum property access with the schema layer
+against the previous implementation, which checked every key with
+`hasattr(Ticket, key)` and rebuilt the enum maps on each property access.
+
+    $ python benchmarks/bench_models.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from freshdesk.v2.models import FreshdeskModel, Ticket, _convert  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "freshdesk", "v2", "tests", "sample_json_data", "ticket_1.json")
+
+
+class LegacyTicket(Ticket):
+    def __init__(self, **kwargs):
+        self._keys = set()
+        if "custom_field" in kwargs.keys() and len(kwargs["custom_field"]) > 0:
+            custom_fields = kwargs.pop("custom_field")
+            kwargs.update(custom_fields)
+        for k, v in kwargs.items():
+            if hasattr(Ticket, k):
+                k = "_" + k
+            setattr(self, k, _convert(k, v))
+            self._keys.add(k)
+
+    @property
+    def priority(self):
+        _p = {1: "low", 2: "medium", 3: "high", 4: "urgent"}
+        return _p[self._priority]
+
+    @property
+    def status(self):
+        _s = {2: "open", 3: "pending", 4: "resolved", 5: "closed"}
+        try:
+            return _s[self._status]
+        except KeyError:
+            return "status_{}".format(self._status)
+
+    @property
+    def source(self):
+        _s = {1: "email", 2: "portal", 3: "phone", 4: "forum", 5: "twitter", 6: "facebook", 7: "chat"}
+        return _s[self._source]
+
+
+def bench(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def report(name, legacy, schema):
+    print("{:<24} legacy {:7.2f} us   schema {:7.2f} us   {:5.2f}x".format(name, legacy * 1e6, schema * 1e6, legacy / schema))
+
+
+def main(number=20000):
+    with open(SAMPLE) as f:
+        data = json.load(f)
+    # Timestamps are parsed the same way by both, so leave them out to isolate the key handling
+    data = dict((k, v) for k, v in data.items() if not (k.endswith("_at") or k.endswith("due_by")))
+    assert issubclass(LegacyTicket, FreshdeskModel)
+
+    report(
+        "construction",
+        bench(lambda: LegacyTicket(**data), number),
+        bench(lambda: Ticket(**data), number),
+    )
+
+    legacy, ticket = LegacyTicket(**data), Ticket(**data)
+    report(
+        "status/priority/source",
+        bench(lambda: (legacy.status, legacy.priority, legacy.source), number * 5),
+        bench(lambda: (ticket.status, ticket.priority, ticket.source), number * 5),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Compares the fast timestamp parser with dateutil's generic parser.
+
+    $ python benchmarks/bench_timestamps.py
+"""
+import os
+import sys
+import timeit
+
+import dateutil.parser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from freshdesk.v2.models import parse_timestamp  # noqa: E402
+
+TIMESTAMPS = ["2020-07-24T15:35:21Z", "2014-12-31T12:27:09+10:00"]
+
+
+def bench(func, timestamp, number):
+    return min(timeit.repeat(lambda: func(timestamp), number=number, repeat=5)) / number
+
+
+def main(number=20000):
+    for timestamp in TIMESTAMPS:
+        slow = bench(dateutil.parser.parse, timestamp, number)
+        fast = bench(parse_timestamp, timestamp, number)
+        print(
+            "{:<28} dateutil {:7.2f} us   parse_timestamp {:6.2f} us   {:5.1f}x".format(
+                timestamp, slow * 1e6, fast * 1e6, slow / fast
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
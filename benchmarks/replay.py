@@ -0,0 +1,64 @@
+"""Replays a recorded crawl against the current client, reporting wall time, CPU time and peak memory.
+
+Record the crawl once with `freshdesk.v2.adapters.RecordingAdapter`, then run the same
+crawl function against the cassette with each version of the client:
+
+    $ python benchmarks/replay.py crawl.jsonl.gz mycrawl:run --speed 0 --output replay.json
+
+The crawl function is given an `API` whose requests are answered from the cassette.
+--speed 1 (the default) waits for each response's recorded latency, 0 doesn't wait.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, os.getcwd())
+
+from freshdesk import __version__  # noqa: E402
+from freshdesk.v2.adapters import ReplayAdapter  # noqa: E402
+from freshdesk.v2.api import API  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette")
+    parser.add_argument("crawl", help="the crawl function, as module:function")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--memory", action="store_true", help="trace peak memory (slows the crawl down)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    module, function = args.crawl.split(":")
+    crawl = getattr(importlib.import_module(module), function)
+    adapter = ReplayAdapter(args.cassette, speed=args.speed or None)
+    api = adapter.mount(API("replay.freshdesk.com", "replay"))
+
+    if args.memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    crawl(api)
+    result = {
+        "wall_seconds": time.perf_counter() - wall,
+        "cpu_seconds": time.process_time() - cpu,
+        "requests": adapter.replayed,
+        "version": __version__,
+        "python": platform.python_version(),
+    }
+    if args.memory:
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(json.dumps(result, indent=2, sort_keys=True))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Benchmarks of the client's hot paths, with results saved as JSON for comparison.
+
+    $ python benchmarks/suite.py --output results.json
+    $ python benchmarks/suite.py --baseline results.json       # after a change
+    $ python benchmarks/suite.py --full list_tickets           # larger sizes, matching benchmarks only
+
+Every benchmark runs against a zero-latency fake transport (see transport.py), so
+it measures the client rather than the network. Each result records the best wall
+time of several repeats, the throughput in items per second, and the peak memory
+and number of allocations traced by tracemalloc in a separate run.
+
+bench_timestamps.py and bench_models.py compare single code paths with their
+previous implementations instead.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from freshdesk import __version__  # noqa: E402
+from freshdesk.v2.api import API  # noqa: E402
+from freshdesk.v2.models import Ticket, parse_timestamp  # noqa: E402
+
+from transport import FakeTransport, listing  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), os.pardir, "freshdesk", "v2", "tests", "sample_json_data")
+DOMAIN = "benchmark.freshdesk.com"
+
+_perf_counter = getattr(time, "perf_counter", time.time)
+
+
+def ticket_records(n):
+    """Returns `n` records shaped like all_tickets.json, with distinct ids."""
+    with open(os.path.join(SAMPLE, "all_tickets.json")) as f:
+        template = json.load(f)[0]
+    records = []
+    for i in range(n):
+        record = copy.copy(template)
+        record["id"] = i + 1
+        record["requester_id"] = 5004272351 + i % 1000
+        records.append(record)
+    return records
+
+
+class Benchmark(object):
+    """A benchmark: `setup()` returns the state passed to each run of `run()`, which processes
+    `items` items (records, unless `unit` says otherwise)."""
+
+    def __init__(self, name, items, setup, run, repeat=5, trace=True, unit="records"):
+        self.name = name
+        self.items = items
+        self.unit = unit
+        self.setup = setup
+        self.run = run
+        self.repeat = repeat
+        self.trace = trace
+
+    def measure(self):
+        times = []
+        for _ in range(self.repeat):
+            state = self.setup()
+            start = _perf_counter()
+            self.run(state)
+            times.append(_perf_counter() - start)
+        result = {"items": self.items, "unit": self.unit, "seconds": min(times), "per_second": self.items / min(times)}
+
+        if self.trace:
+            state = self.setup()
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            # Keep the result alive until the snapshot, so its memory counts as allocated
+            self._kept = self.run(state)
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats = after.compare_to(before, "filename")
+            result["peak_bytes"] = peak
+            result["allocated_bytes"] = sum(s.size_diff for s in stats if s.size_diff > 0)
+            result["allocated_blocks"] = sum(s.count_diff for s in stats if s.count_diff > 0)
+            del self._kept
+        return result
+
+
+def list_tickets(n, **api_kwargs):
+    records = ticket_records(n)
+    handler = listing(records)
+
+    def setup():
+        return FakeTransport(handler).mount(API(DOMAIN, "key", **api_kwargs))
+
+    name = "list_tickets[{}]".format(",".join([str(n)] + ["{}={}".format(*kv) for kv in sorted(api_kwargs.items())]))
+    return Benchmark(name, n, setup, lambda api: api.tickets.list_tickets(filter_name=None))
+
+
+def ticket_construction(n, mode="eager"):
+    records = ticket_records(n)
+    build = getattr(Ticket, "lazy" if mode == "lazy" else "compact") if mode != "eager" else None
+
+    def run(records):
+        if build is None:
+            return [Ticket(**d) for d in records]
+        return [build(d) for d in records]
+
+    # tracemalloc multiplies the run time, so only trace the smaller sizes
+    return Benchmark("ticket_construction[{},{}]".format(n, mode), n, lambda: records, run, repeat=3, trace=n <= 100000)
+
+
+def search(n=300):
+    handler = listing(ticket_records(n))
+
+    def setup():
+        return FakeTransport(handler).mount(API(DOMAIN, "key"))
+
+    return Benchmark("filter_tickets[{}]".format(n), n, setup, lambda api: api.tickets.filter_tickets("status:2"))
+
+
+def multipart(count=5, size=1 << 20):
+    directory = tempfile.mkdtemp()
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, "attachment{}.bin".format(i))
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        paths.append(path)
+    with open(os.path.join(SAMPLE, "ticket_1.json"), "rb") as f:
+        ticket = f.read()
+
+    def setup():
+        return FakeTransport(lambda request: (201, {}, ticket)).mount(API(DOMAIN, "key"))
+
+    def run(api):
+        return api.tickets.create_ticket("Attachments", description="x", email="a@example.com", attachments=paths)
+
+    return Benchmark("create_ticket_with_attachments[{}x{}]".format(count, size), count * size, setup, run, unit="bytes")
+
+
+def timestamps(n=100000):
+    values = ["2020-07-24T15:35:21Z", "2014-12-31T12:27:09+10:00"] * (n // 2)
+    return Benchmark("parse_timestamp[{}]".format(n), n, lambda: values, lambda values: [parse_timestamp(v) for v in values])
+
+
+def benchmarks(full=False):
+    sizes = (10000, 100000, 1000000) if full else (10000, 100000)
+    result = [list_tickets(10000), list_tickets(10000, page_concurrency=4), search(), multipart(), timestamps()]
+    for n in sizes:
+        for mode in ("eager", "lazy", "compact"):
+            result.append(ticket_construction(n, mode))
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Prints each result against the baseline, and returns the names of those slower by more than `threshold`."""
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print("{:<52} {:>14.1f} {}/s   (no baseline)".format(name, result["per_second"], result["unit"]))
+            continue
+        change = result["seconds"] / base["seconds"] - 1
+        memory = ""
+        if result.get("peak_bytes") and base.get("peak_bytes"):
+            memory = "   peak memory {:+6.1%}".format(result["peak_bytes"] / float(base["peak_bytes"]) - 1)
+        print("{:<52} {:>14.1f} {}/s   time {:+6.1%}{}".format(name, result["per_second"], result["unit"], change, memory))
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="only run benchmarks whose name starts with one of these")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown to report as a regression (default 0.1)")
+    parser.add_argument("--full", action="store_true", help="include the largest sizes (1M records)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for benchmark in benchmarks(args.full):
+        if args.names and not any(benchmark.name.startswith(n) for n in args.names):
+            continue
+        results[benchmark.name] = result = benchmark.measure()
+        if not args.baseline:
+            print(
+                "{:<52} {:>14.1f} {}/s   {:9.4f} s   peak {}".format(
+                    benchmark.name,
+                    result["per_second"],
+                    benchmark.unit,
+                    result["seconds"],
+                    "{:.1f} MB".format(result["peak_bytes"] / 1e6) if "peak_bytes" in result else "-",
+                )
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "version": __version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nSlower than the baseline: {}".format(", ".join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import base64
+import gzip
+import hashlib
+import json
+import socket
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+
+from freshdesk.v2.ratelimit import _monotonic
+
+
+def keepalive_socket_options(idle, interval=None, count=None):
+    """Returns urllib3 socket options enabling TCP keep-alive probes after `idle` seconds."""
+    interval = interval or idle
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        # macOS names the idle time option differently
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if count is not None and hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+
+class FreshdeskAdapter(HTTPAdapter):
+    """HTTPAdapter with optional TCP keep-alive, so pooled connections to Freshdesk
+    survive idle periods instead of being dropped by NAT gateways and load balancers.
+
+    Arguments:
+      tcp_keepalive:  seconds of idle time before keep-alive probes are sent, or None to
+                      leave keep-alive to the operating system
+
+    Any other keyword arguments (`pool_connections`, `pool_maxsize`, ...) are passed to HTTPAdapter.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["tcp_keepalive"]
+
+    def __init__(self, tcp_keepalive=None, **kwargs):
+        # Set before HTTPAdapter.__init__, which creates the pool manager
+        self.tcp_keepalive = tcp_keepalive
+        super(FreshdeskAdapter, self).__init__(**kwargs)
+
+    def _socket_options(self):
+        return HTTPConnection.default_socket_options + keepalive_socket_options(self.tcp_keepalive)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.tcp_keepalive:
+            kwargs.setdefault("socket_options", self._socket_options())
+        super(FreshdeskAdapter, self).init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.tcp_keepalive:
+            proxy_kwargs.setdefault("socket_options", self._socket_options())
+        return super(FreshdeskAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+
+
+CASSETTE_VERSION = 1
+_API_PATH = "/api/v2/"
+
+# Response headers kept in cassettes; others (cookies, tracing ids, ...) are dropped to keep them small and safe to share
+CASSETTE_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "Location",
+    "Retry-After",
+    "X-RateLimit-Total",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Used-CurrentRequest",
+)
+
+
+class CassetteMiss(requests.RequestException):
+    """Raised when replaying a request which isn't in the cassette. Not a ConnectionError, so
+    retry policies don't back off and try again."""
+
+
+def _request_key(request):
+    """Identifies a request in a cassette by its method, path relative to the API and body.
+
+    Multipart bodies have random boundaries, so only their size is compared."""
+    url = urlparse(request.url)
+    path = url.path
+    if _API_PATH in path:
+        path = path.split(_API_PATH, 1)[1]
+    if url.query:
+        path += "?" + url.query
+    body = request.body
+    if body is None:
+        digest = None
+    elif (request.headers.get("Content-Type") or "").startswith("multipart/"):
+        digest = "multipart"
+    elif not isinstance(body, (bytes, type(u""))):
+        # A streamed body, which can only be read once
+        digest = "stream"
+    else:
+        if not isinstance(body, bytes):
+            body = body.encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()
+    return request.method, path, digest
+
+
+def _mount(adapter, api):
+    api._session.mount("https://", adapter)
+    api._session.mount("http://", adapter)
+    return api
+
+
+def _open_cassette(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def load_cassette(path):
+    """Returns the interactions recorded in a cassette file, in order."""
+    interactions = []
+    with _open_cassette(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                interactions.append(json.loads(line.decode("utf-8")))
+    if not interactions or interactions[0].get("cassette") != CASSETTE_VERSION:
+        raise ValueError("{} is not a cassette".format(path))
+    return interactions[1:]
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter recording every request and response it sends to a cassette file,
+    for replaying with `ReplayAdapter` later:
+
+        RecordingAdapter("crawl.jsonl.gz").mount(api)
+        api.tickets.list_tickets()
+        api._session.close()        # or adapter.close(), to finish writing the cassette
+
+    A cassette holds one JSON line per interaction: the method, the URL relative to the
+    API prefix, a digest of the request body, the status, the headers in `CASSETTE_HEADERS`,
+    the response body and the latency. Credentials are never written. Paths ending in .gz
+    are gzip compressed.
+
+    Arguments:
+      path:     the cassette file to write
+      adapter:  the adapter sending the requests; by default, the one mount() replaces
+    """
+
+    def __init__(self, path, adapter=None):
+        super(RecordingAdapter, self).__init__()
+        self.path = path
+        self.adapter = adapter
+        self._lock = threading.Lock()
+        self._file = _open_cassette(path, "wb")
+        self._write({"cassette": CASSETTE_VERSION, "recorded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+
+    def mount(self, api):
+        """Mounts the adapter on an `API`, replacing its transport. Returns `api`."""
+        if self.adapter is None:
+            self.adapter = api._session.get_adapter(api._api_prefix)
+        return _mount(self, api)
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n"
+        with self._lock:
+            self._file.write(line.encode("utf-8"))
+
+    def send(self, request, **kwargs):
+        if self.adapter is None:
+            self.adapter = FreshdeskAdapter()
+        start = _monotonic()
+        response = self.adapter.send(request, **kwargs)
+        content = response.content
+        latency = _monotonic() - start
+
+        method, path, digest = _request_key(request)
+        record = {
+            "method": method,
+            "url": path,
+            "body": digest,
+            "status": response.status_code,
+            "headers": dict((k, response.headers[k]) for k in CASSETTE_HEADERS if k in response.headers),
+            "latency": round(latency, 6),
+        }
+        try:
+            record["content"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            record["content"] = base64.b64encode(content).decode("ascii")
+            record["base64"] = True
+        self._write(record)
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        if self.adapter is not None:
+            self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering requests from a cassette written by `RecordingAdapter`,
+    without a network or a live account:
+
+        ReplayAdapter("crawl.jsonl.gz", speed=None).mount(api)
+
+    Requests are matched by method, URL and body. A request made several times is answered
+    with its recorded responses in order, and then with the last one again. A request missing
+    from the cassette raises `CassetteMiss`.
+
+    Arguments:
+      path:   the cassette file to replay
+      speed:  how fast to replay: 1 waits for each response's recorded latency, 2 for half
+              of it, and so on; None replays at full speed without waiting
+      sleep:  the function used to wait
+    """
+
+    def __init__(self, path, speed=1.0, sleep=time.sleep):
+        super(ReplayAdapter, self).__init__()
+        self.path = path
+        self.speed = speed
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._responses = {}
+        for record in load_cassette(path):
+            key = (record["method"], record["url"], record["body"])
+            self._responses.setdefault(key, []).append(record)
+        self._next = dict((key, 0) for key in self._responses)
+        self.replayed = 0
+
+    def mount(self, api):
+        """Mounts the adapter on an `API`, replacing its transport. Returns `api`."""
+        return _mount(self, api)
+
+    def send(self, request, **kwargs):
+        key = _request_key(request)
+        with self._lock:
+            records = self._responses.get(key)
+            if records is None:
+                raise CassetteMiss("{} {} was not recorded in {}".format(key[0], key[1], self.path), request=request)
+            i = self._next[key]
+            self._next[key] = min(i + 1, len(records) - 1)
+            self.replayed += 1
+        record = records[i]
+
+        if self.speed:
+            self.sleep(record["latency"] / float(self.speed))
+
+        content = record["content"]
+        content = base64.b64decode(content) if record.get("base64") else content.encode("utf-8")
+        response = Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.reason = ""
+        return response
+
+    def close(self):
+        pass
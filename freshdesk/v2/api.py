@@ -1,8 +1,19 @@
-import json
+import datetime
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 
 import requests
 from requests import HTTPError
 
+from freshdesk.v2.adapters import FreshdeskAdapter
+from freshdesk.v2.cache import LRUCache, cache_key
+from freshdesk.v2.codec import get_codec
+from freshdesk.v2.columnar import ColumnarResult
+from freshdesk.v2.hooks import RequestEvent
+from freshdesk.v2.identity import NESTED, IdentityMap
 from freshdesk.v2.errors import (
     FreshdeskAccessDenied,
     FreshdeskBadRequest,
@@ -27,6 +38,59 @@ from freshdesk.v2.models import (
     SolutionFolder,
     SolutionArticle,
 )
+from freshdesk.v2.multipart import MultipartEncoder, form_fields
+from freshdesk.v2.ratelimit import _monotonic
+
+_MISSING = object()
+
+_MODEL_MODES = ("eager", "lazy", "compact")
+
+# Statuses of a background job (e.g. a bulk ticket update) that has finished
+_JOB_DONE = ("SUCCESS", "PARTIAL", "FAILED")
+
+# Search returns pages of 30 records, and no more than 10 pages per query
+_SEARCH_PAGE_SIZE = 30
+_SEARCH_MAX_PAGES = 10
+_SEARCH_CAP = _SEARCH_PAGE_SIZE * _SEARCH_MAX_PAGES
+# The earliest date searched when splitting a query into date ranges
+SEARCH_START = datetime.date(2010, 1, 1)
+
+
+def _partition_query(query, conditions):
+    """Returns `query` restricted to the (field, first day, last day) ranges in `conditions`."""
+    if not conditions:
+        return query
+    ranges = " AND ".join(
+        "{0}:>'{1:%Y-%m-%d}' AND {0}:<'{2:%Y-%m-%d}'".format(field, start, end) for field, start, end in conditions
+    )
+    query = "({}) AND {}".format(query, ranges)
+    if len(query) > 512:
+        raise AttributeError("Query string can have up to 512 characters, including the date ranges of an exhaustive search")
+    return query
+
+
+def _split_search(conditions):
+    """Splits a search partition matching too many records in two, or returns None if it can't be.
+
+    The query is split into halves of created_at dates (both bounds are inclusive), down to
+    single days. A single day of created_at is then split by updated_at, which can't be earlier.
+    """
+    tomorrow = datetime.datetime.utcnow().date() + datetime.timedelta(days=1)
+    if not conditions:
+        field, start, end = "created_at", SEARCH_START, tomorrow
+    else:
+        field, start, end = conditions[-1]
+        conditions = conditions[:-1]
+        if start == end:
+            if field != "created_at" or start >= tomorrow:
+                return None
+            conditions += ((field, start, end),)
+            field, end = "updated_at", tomorrow
+    middle = start + datetime.timedelta(days=(end - start).days // 2)
+    return [
+        conditions + ((field, start, middle),),
+        conditions + ((field, middle + datetime.timedelta(days=1), end),),
+    ]
 
 
 class TicketAPI(object):
@@ -42,14 +106,15 @@ class TicketAPI(object):
         """
         url = "tickets/%d%s" % (ticket_id, "?include=%s" % ",".join(include) if include else "")
         ticket = self._api._get(url)
-        return Ticket(**ticket)
+        return self._api._model(Ticket, ticket)
 
     def create_ticket(self, subject, **kwargs):
         """
         Creates a ticket
         To create ticket with attachments,
-        pass a key 'attachments' with value as list of fully qualified file paths in string format.
-        ex: attachments = ('/path/to/attachment1', '/path/to/attachment2')
+        pass a key 'attachments' with a list of file paths, binary file objects, bytes or
+        (filename, file) tuples. They are streamed, and may add up to 20MB.
+        ex: attachments = ('/path/to/attachment1', ('report.csv', open('/path/to/report', 'rb')))
         """
 
         url = "tickets"
@@ -62,36 +127,10 @@ class TicketAPI(object):
         }
         data.update(kwargs)
         if "attachments" in data:
-            ticket = self._create_ticket_with_attachment(url, data)
-            return Ticket(**ticket)
+            return self._api._model(Ticket, self._api._post_multipart(url, data))
 
-        ticket = self._api._post(url, data=json.dumps(data))
-        return Ticket(**ticket)
-
-    def _create_ticket_with_attachment(self, url, data):
-        attachments = data["attachments"]
-        del data["attachments"]
-        multipart_data = []
-
-        for attachment in attachments:
-            file_name = attachment.split("/")[-1:][0]
-            multipart_data.append(("attachments[]", (file_name, open(attachment, "rb"), None)))
-
-        for key, value in data.copy().items():
-            # Reformat ticket properties to work with the multipart/form-data encoding.
-            if isinstance(value, list) and not key.endswith("[]"):
-                data[key + "[]"] = value
-                del data[key]
-
-        if "custom_fields" in data and isinstance(data["custom_fields"], dict):
-            # Reformat custom fields to work with the multipart/form-data encoding.
-            for field, value in data["custom_fields"].items():
-                data["custom_fields[{}]".format(field)] = value
-            del data["custom_fields"]
-
-        # Override the content type so that `requests` correctly sets it to multipart/form-data instead of JSON.
-        ticket = self._api._post(url, data=data, files=multipart_data, headers={"Content-Type": None})
-        return ticket
+        ticket = self._api._post(url, data=self._api._dumps(data))
+        return self._api._model(Ticket, ticket)
 
     def create_outbound_email(self, subject, description, email, email_config_id, **kwargs):
         """Creates an outbound email"""
@@ -105,34 +144,33 @@ class TicketAPI(object):
             "email_config_id": email_config_id,
         }
         data.update(kwargs)
-        ticket = self._api._post(url, data=json.dumps(data))
-        return Ticket(**ticket)
+        ticket = self._api._post(url, data=self._api._dumps(data))
+        return self._api._model(Ticket, ticket)
 
     def update_ticket(self, ticket_id, **kwargs):
         """Updates a ticket from a given ticket ID"""
         url = "tickets/%d" % ticket_id
-        ticket = self._api._put(url, data=json.dumps(kwargs))
-        return Ticket(**ticket)
+        ticket = self._api._put(url, data=self._api._dumps(kwargs))
+        return self._api._model(Ticket, ticket)
 
     def delete_ticket(self, ticket_id):
         """Delete the ticket for the given ticket ID"""
         url = "tickets/%d" % ticket_id
         self._api._delete(url)
 
-    def list_tickets(self, **kwargs):
-        """List all tickets, optionally filtered by a view. Specify filters as
-        keyword arguments, such as:
-
-        filter_name = one of ['new_and_my_open', 'watching', 'spam', 'deleted',
-                              None]
-            (defaults to 'new_and_my_open')
-            Passing None means that no named filter will be passed to
-            Freshdesk, which mimics the behavior of the 'all_tickets' filter
-            in v1 of the API.
+    def iter_tickets(self, **kwargs):
+        """Like list_tickets(), but yields each ticket as its page is fetched instead of returning a list."""
+        for this_page in self._pages(kwargs):
+            for t in this_page:
+                yield self._api._model(Ticket, t)
 
-        Multiple filters are AND'd together.
-        """
+    def list_tickets_columnar(self, fields=None, **kwargs):
+        """Like list_tickets(), but returns a `freshdesk.v2.columnar.ColumnarResult` holding
+        one typed column per field instead of a Ticket per record. If `fields` is given,
+        only those fields are kept."""
+        return ColumnarResult.from_pages(self._pages(kwargs), fields, Ticket)
 
+    def _pages(self, kwargs):
         filter_name = "new_and_my_open"
         if "filter_name" in kwargs:
             filter_name = kwargs["filter_name"]
@@ -147,21 +185,64 @@ class TicketAPI(object):
         if "updated_since" in kwargs:
             url += "updated_since=%s&" % kwargs["updated_since"]
 
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
+        return self._api._get_pages(url, kwargs)
+
+    def bulk_update_tickets(self, ids, wait=True, chunk_size=100, poll_interval=2, timeout=300, **properties):
+        """Updates the given properties on many tickets at once, e.g.:
 
-        tickets = []
+        bulk_update_tickets([1, 2, 3], status=4, tags=["reviewed"])
 
-        # Skip pagination by looping over each page and adding tickets if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
+        The IDs are submitted in chunks of `chunk_size` as background jobs. Unless
+        `wait` is False, the jobs are polled every `poll_interval` seconds until they
+        have finished, or for at most `timeout` seconds (None to wait indefinitely).
+        Returns the jobs, whose 'status' is one of 'SUCCESS', 'PARTIAL' or 'FAILED'
+        once finished; jobs still queued or in progress at the timeout are returned
+        as last polled, and can be polled further with `api.jobs.get_job()`.
+        """
+        return self._bulk_action(
+            "tickets/bulk_update", ids, {"properties": properties}, wait, chunk_size, poll_interval, timeout
+        )
+
+    def bulk_delete_tickets(self, ids, wait=True, chunk_size=100, poll_interval=2, timeout=300):
+        """Deletes many tickets at once. See bulk_update_tickets() for the arguments."""
+        return self._bulk_action("tickets/bulk_delete", ids, {}, wait, chunk_size, poll_interval, timeout)
+
+    def _bulk_action(self, url, ids, action, wait, chunk_size, poll_interval, timeout):
+        ids = list(ids)
+        jobs = []
+        for i in range(0, len(ids), chunk_size):
+            bulk_action = dict(action, ids=ids[i:i + chunk_size])
+            jobs.append(self._api._post(url, data=self._api._dumps({"bulk_action": bulk_action})))
+
+        if not wait:
+            return jobs
+
+        job_ids = [job["job_id"] for job in jobs]
+        jobs = {}
+        deadline = None if timeout is None else _monotonic() + timeout
         while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            tickets += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-            page += 1
+            for job_id in job_ids:
+                if job_id not in jobs or jobs[job_id].get("status", "").upper() not in _JOB_DONE:
+                    jobs[job_id] = self._api.jobs.get_job(job_id)
+            finished = all(job.get("status", "").upper() in _JOB_DONE for job in jobs.values())
+            if finished or (deadline is not None and _monotonic() + poll_interval > deadline):
+                return [jobs[job_id] for job_id in job_ids]
+            time.sleep(poll_interval)
+
+    def list_tickets(self, **kwargs):
+        """List all tickets, optionally filtered by a view. Specify filters as
+        keyword arguments, such as:
 
-        return [Ticket(**t) for t in tickets]
+        filter_name = one of ['new_and_my_open', 'watching', 'spam', 'deleted',
+                              None]
+            (defaults to 'new_and_my_open')
+            Passing None means that no named filter will be passed to
+            Freshdesk, which mimics the behavior of the 'all_tickets' filter
+            in v1 of the API.
+
+        Multiple filters are AND'd together.
+        """
+        return list(self.iter_tickets(**kwargs))
 
     def list_new_and_my_open_tickets(self):
         """List all new and open tickets."""
@@ -175,95 +256,85 @@ class TicketAPI(object):
         """Lists all deleted tickets."""
         return self.list_tickets(filter_name="deleted")
 
-    def filter_tickets(self, query, **kwargs):
+    def filter_tickets(self, query, exhaustive=False, **kwargs):
         """Filter tickets by a given query string. The query string must be in
         the format specified in the API documentation at:
           https://developer.freshdesk.com/api/#filter_tickets
 
         query = "(ticket_field:integer OR ticket_field:'string') AND ticket_field:boolean"
+
+        A query matches at most 300 records (10 pages of 30). With `exhaustive=True`, a
+        query matching more is split into created_at/updated_at date ranges of up to 300
+        records each, which are fetched (in parallel when `page_concurrency` is set) and merged.
         """
         if len(query) > 512:
             raise AttributeError("Query string can have up to 512 characters")
 
-        url = "search/tickets?"
-        page = kwargs.get("page", 1)
-        per_page = 30
-
-        tickets = []
-        while True:
-            this_page = self._api._get(url + 'page={}&query="{}"'.format(page, query), kwargs)
-            this_page = this_page["results"]
-            tickets += this_page
-            if len(this_page) < per_page or page == 10 or "page" in kwargs:
-                break
-            page += 1
-
-        return [Ticket(**t) for t in tickets]
+        tickets = self._api._search("search/tickets?", query, kwargs, exhaustive)
+        return [self._api._model(Ticket, t) for t in tickets]
 
 
 class CommentAPI(object):
     def __init__(self, api):
         self._api = api
 
-    def list_comments(self, ticket_id, **kwargs):
+    def iter_comments(self, ticket_id, **kwargs):
+        """Like list_comments(), but yields each comment as its page is fetched instead of returning a list."""
         url = "tickets/%d/conversations?" % ticket_id
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
-
-        comments = []
+        for this_page in self._api._get_pages(url, kwargs):
+            for c in this_page:
+                yield self._api._model(Comment, c)
 
-        # Skip pagination by looping over each page and adding comments if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
-        while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            comments += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-            page += 1
-
-        return [Comment(**c) for c in comments]
+    def list_comments(self, ticket_id, **kwargs):
+        return list(self.iter_comments(ticket_id, **kwargs))
 
     def create_note(self, ticket_id, body, **kwargs):
         url = "tickets/%d/notes" % ticket_id
         data = {"body": body}
         data.update(kwargs)
-        return Comment(**self._api._post(url, data=json.dumps(data)))
+        if "attachments" in data:
+            return self._api._model(Comment, self._api._post_multipart(url, data))
+        return self._api._model(Comment, self._api._post(url, data=self._api._dumps(data)))
 
     def create_reply(self, ticket_id, body, **kwargs):
         url = "tickets/%d/reply" % ticket_id
         data = {"body": body}
         data.update(kwargs)
-        return Comment(**self._api._post(url, data=json.dumps(data)))
+        if "attachments" in data:
+            return self._api._model(Comment, self._api._post_multipart(url, data))
+        return self._api._model(Comment, self._api._post(url, data=self._api._dumps(data)))
 
 
 class GroupAPI(object):
     def __init__(self, api):
         self._api = api
 
-    def list_groups(self, **kwargs):
+    def iter_groups(self, **kwargs):
+        """Like list_groups(), but yields each group as its page is fetched instead of returning a list."""
         url = "groups?"
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
+        for this_page in self._api._get_pages(url, kwargs):
+            for g in this_page:
+                yield self._api._model(Group, g)
 
-        groups = []
-        while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            groups += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-            page += 1
-
-        return [Group(**g) for g in groups]
+    def list_groups(self, **kwargs):
+        return list(self.iter_groups(**kwargs))
 
     def get_group(self, group_id):
         url = "groups/%s" % group_id
-        return Group(**self._api._get(url))
+        return self._api._model(Group, self._api._get(url))
 
 
 class ContactAPI(object):
     def __init__(self, api):
         self._api = api
 
+    def iter_contacts(self, **kwargs):
+        """Like list_contacts(), but yields each contact as its page is fetched instead of returning a list."""
+        url = "contacts?"
+        for this_page in self._api._get_pages(url, kwargs):
+            for c in this_page:
+                yield self._api._model(Contact, c)
+
     def list_contacts(self, **kwargs):
         """
         List all contacts, optionally filtered by a query. Specify filters as
@@ -286,66 +357,45 @@ class ContactAPI(object):
         Freshdesk, which returns list of all contacts
 
         """
+        return list(self.iter_contacts(**kwargs))
 
+    def list_contacts_columnar(self, fields=None, **kwargs):
+        """Like list_contacts(), but returns a `freshdesk.v2.columnar.ColumnarResult`.
+        See TicketAPI.list_tickets_columnar()."""
         url = "contacts?"
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
-
-        contacts = []
+        return ColumnarResult.from_pages(self._api._get_pages(url, kwargs), fields)
 
-        # Skip pagination by looping over each page and adding tickets if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
-        while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            contacts += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-
-            page += 1
-
-        return [Contact(**c) for c in contacts]
-
-    def filter_contacts(self, query, **kwargs):
+    def filter_contacts(self, query, exhaustive=False, **kwargs):
         """Filter contacts by a given query string. The query string must be in
         the format specified in the API documentation at:
           https://developers.freshdesk.com/api/#filter_contacts
 
         query = "(contact_field:integer OR contact_field:'string') AND contact_field:boolean"
+
+        A query matches at most 300 records (10 pages of 30). With `exhaustive=True`, a
+        query matching more is split into created_at/updated_at date ranges of up to 300
+        records each, which are fetched (in parallel when `page_concurrency` is set) and merged.
         """
         if len(query) > 512:
             raise AttributeError("Query string can have up to 512 characters")
 
-        url = "search/contacts?"
-        page = kwargs.get("page", 1)
-        per_page = 30
-
-        contacts = []
-        while True:
-            this_page = self._api._get(
-                url + 'page={}&query="{}"'.format(page, query), kwargs
-            )
-            this_page = this_page["results"]
-            contacts += this_page
-            if len(this_page) < per_page or page == 10 or "page" in kwargs:
-                break
-            page += 1
-
-        return [Contact(**c) for c in contacts]
+        contacts = self._api._search("search/contacts?", query, kwargs, exhaustive)
+        return [self._api._model(Contact, c) for c in contacts]
 
     def create_contact(self, *args, **kwargs):
         """Creates a contact"""
         url = "contacts"
         data = {"view_all_tickets": False, "description": "Freshdesk Contact"}
         data.update(kwargs)
-        return Contact(**self._api._post(url, data=json.dumps(data)))
+        return self._api._model(Contact, self._api._post(url, data=self._api._dumps(data)))
 
     def get_contact(self, contact_id):
         url = "contacts/%d" % contact_id
-        return Contact(**self._api._get(url))
+        return self._api._model(Contact, self._api._get(url))
 
     def update_contact(self, contact_id, **data):
         url = "contacts/%d" % contact_id
-        return Contact(**self._api._put(url, data=json.dumps(data)))
+        return self._api._model(Contact, self._api._put(url, data=self._api._dumps(data)))
 
     def soft_delete_contact(self, contact_id):
         url = "contacts/%d" % contact_id
@@ -366,7 +416,7 @@ class ContactAPI(object):
             "ticket_scope": 2,
         }
         data.update(kwargs)
-        contact = self._api._put(url, data=json.dumps(data))
+        contact = self._api._put(url, data=self._api._dumps(data))
         return self._api.agents.get_agent(contact["agent"]["id"])
 
 
@@ -376,7 +426,7 @@ class CustomerAPI(object):
 
     def get_customer(self, company_id):
         url = "customers/%s" % company_id
-        return Customer(**self._api._get(url))
+        return self._api._model(Customer, self._api._get(url))
 
     def get_customer_from_contact(self, contact):
         return self.get_customer(contact.customer_id)
@@ -388,51 +438,40 @@ class CompanyAPI(object):
 
     def get_company(self, company_id):
         url = "companies/%s" % company_id
-        return Company(**self._api._get(url))
+        return self._api._model(Company, self._api._get(url))
 
-    def list_companies(self, **kwargs):
+    def iter_companies(self, **kwargs):
+        """Like list_companies(), but yields each company as its page is fetched instead of returning a list."""
         url = "companies?"
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
-
-        companies = []
+        for this_page in self._api._get_pages(url, kwargs):
+            for c in this_page:
+                yield self._api._model(Company, c)
 
-        # Skip pagination by looping over each page and adding companies if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
-        while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            companies += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-
-            page += 1
+    def list_companies(self, **kwargs):
+        return list(self.iter_companies(**kwargs))
 
-        return [Company(**c) for c in companies]
+    def list_companies_columnar(self, fields=None, **kwargs):
+        """Like list_companies(), but returns a `freshdesk.v2.columnar.ColumnarResult`.
+        See TicketAPI.list_tickets_columnar()."""
+        url = "companies?"
+        return ColumnarResult.from_pages(self._api._get_pages(url, kwargs), fields)
 
-    def filter_companies(self, query, **kwargs):
+    def filter_companies(self, query, exhaustive=False, **kwargs):
         """Filter companies by a given query string. The query string must be in
         the format specified in the API documentation at:
           https://developers.freshdesk.com/api/#filter_companies
 
         query = "(company_field:integer OR company_field:'string') AND company_field:boolean"
+
+        A query matches at most 300 records (10 pages of 30). With `exhaustive=True`, a
+        query matching more is split into created_at/updated_at date ranges of up to 300
+        records each, which are fetched (in parallel when `page_concurrency` is set) and merged.
         """
         if len(query) > 512:
             raise AttributeError("Query string can have up to 512 characters")
 
-        url = "search/companies?"
-        page = kwargs.get("page", 1)
-        per_page = 30
-
-        companies = []
-        while True:
-            this_page = self._api._get(url + 'page={}&query="{}"'.format(page, query), kwargs)
-            this_page = this_page["results"]
-            companies += this_page
-            if len(this_page) < per_page or page == 10 or "page" in kwargs:
-                break
-            page += 1
-
-        return [Company(**c) for c in companies]
+        companies = self._api._search("search/companies?", query, kwargs, exhaustive)
+        return [self._api._model(Company, c) for c in companies]
 
     def delete_company(self, company_id):
         """Delete the company for the given company ID"""
@@ -442,11 +481,11 @@ class CompanyAPI(object):
     def create_company(self, *args, **kwargs):
         """Creates a company"""
         url = "companies"
-        return Company(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(Company, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def update_company(self, company_id, **data):
         url = "companies/%d" % company_id
-        return Company(**self._api._put(url, data=json.dumps(data)))
+        return self._api._model(Company, self._api._put(url, data=self._api._dumps(data)))
 
 class RoleAPI(object):
     def __init__(self, api):
@@ -456,40 +495,31 @@ class RoleAPI(object):
         url = "roles"
         roles = []
         for r in self._api._get(url):
-            roles.append(Role(**r))
+            roles.append(self._api._model(Role, r))
         return roles
 
     def get_role(self, role_id):
         url = "roles/%s" % role_id
-        return Role(**self._api._get(url))
+        return self._api._model(Role, self._api._get(url))
 
 
 class TimeEntryAPI(object):
     def __init__(self, api):
         self._api = api
 
-    def list_time_entries(self, ticket_id=None, **kwargs):
+    def iter_time_entries(self, ticket_id=None, **kwargs):
+        """Like list_time_entries(), but yields each time entry as its page is fetched instead of returning a list."""
         url = "time_entries?"
 
         if ticket_id is not None:
             url = "tickets/%d/time_entries?" % ticket_id
 
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
-
-        time_entries = []
+        for this_page in self._api._get_pages(url, kwargs):
+            for c in this_page:
+                yield self._api._model(TimeEntry, c)
 
-        # Skip pagination by looping over each page and adding tickets if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
-        while True:
-            this_page = self._api._get(url + 'page={}&per_page={}'.format(page, per_page), kwargs)
-            time_entries += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-
-            page += 1
-
-        return [TimeEntry(**c) for c in time_entries]
+    def list_time_entries(self, ticket_id=None, **kwargs):
+        return list(self.iter_time_entries(ticket_id, **kwargs))
 
 
 class TicketFieldAPI(object):
@@ -504,7 +534,7 @@ class TicketFieldAPI(object):
             url = "{}?type={}".format(url, kwargs["type"])
 
         for tf in self._api._get(url):
-            ticket_fields.append(TicketField(**tf))
+            ticket_fields.append(self._api._model(TicketField, tf))
         return ticket_fields
 
 
@@ -512,6 +542,13 @@ class AgentAPI(object):
     def __init__(self, api):
         self._api = api
 
+    def iter_agents(self, **kwargs):
+        """Like list_agents(), but yields each agent as its page is fetched instead of returning a list."""
+        url = "agents?"
+        for this_page in self._api._get_pages(url, kwargs):
+            for a in this_page:
+                yield self._api._model(Agent, a)
+
     def list_agents(self, **kwargs):
         """List all agents, optionally filtered by a view. Specify filters as
         keyword arguments, such as:
@@ -528,34 +565,18 @@ class AgentAPI(object):
 
         Multiple filters are AND'd together.
         """
-
-        url = "agents?"
-        page = kwargs.get("page", 1)
-        per_page = kwargs.get("per_page", 100)
-
-        agents = []
-
-        # Skip pagination by looping over each page and adding tickets if 'page' key is not in kwargs.
-        # else return the requested page and break the loop
-        while True:
-            this_page = self._api._get(url + "page=%d&per_page=%d" % (page, per_page), kwargs)
-            agents += this_page
-            if len(this_page) < per_page or "page" in kwargs:
-                break
-            page += 1
-
-        return [Agent(**a) for a in agents]
+        return list(self.iter_agents(**kwargs))
 
     def get_agent(self, agent_id):
         """Fetches the agent for the given agent ID"""
         url = "agents/%s" % agent_id
-        return Agent(**self._api._get(url))
+        return self._api._model(Agent, self._api._get(url))
 
     def update_agent(self, agent_id, **kwargs):
         """Updates an agent"""
         url = "agents/%s" % agent_id
-        agent = self._api._put(url, data=json.dumps(kwargs))
-        return Agent(**agent)
+        agent = self._api._put(url, data=self._api._dumps(kwargs))
+        return self._api._model(Agent, agent)
 
     def delete_agent(self, agent_id):
         """Delete the agent for the given agent ID"""
@@ -565,7 +586,17 @@ class AgentAPI(object):
     def currently_authenticated_agent(self):
         """Fetches currently logged in agent"""
         url = "agents/me"
-        return Agent(**self._api._get(url))
+        return self._api._model(Agent, self._api._get(url))
+
+
+class JobAPI(object):
+    def __init__(self, api):
+        self._api = api
+
+    def get_job(self, job_id):
+        """Fetches the status of a background job, such as a bulk ticket update"""
+        url = "jobs/%s" % job_id
+        return self._api._get(url)
 
 
 class SolutionCategoryAPI(object):
@@ -575,27 +606,27 @@ class SolutionCategoryAPI(object):
     def list_categories(self):
         url = "solutions/categories"
         categories = self._api._get(url)
-        return [SolutionCategory(**r) for r in categories]
+        return [self._api._model(SolutionCategory, r) for r in categories]
 
     def get_category(self, category_id):
         url = "solutions/categories/%d" % category_id
-        return SolutionCategory(**self._api._get(url))
+        return self._api._model(SolutionCategory, self._api._get(url))
 
     def create_category(self, *args, **kwargs):
         url = "solutions/categories"
-        return SolutionCategory(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionCategory, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def create_category_translation(self, category_id, lang_code, *args, **kwargs):
         url = "solutions/categories/%d/%s" %(category_id, lang_code)
-        return SolutionCategory(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionCategory, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def update_category(self, category_id, *args, **kwargs):
         url = "solutions/categories/%d" % category_id
-        return SolutionCategory(**self._api._put(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionCategory, self._api._put(url, data=self._api._dumps(kwargs)))
 
     def update_category_translation(self, category_id, lang_code, *args, **kwargs):
         url = "solutions/categories/%d/%s" %(category_id, lang_code)
-        return SolutionCategory(**self._api._put(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionCategory, self._api._put(url, data=self._api._dumps(kwargs)))
 
     def delete_category(self, category_id):
         url = 'solutions/categories/%s' % category_id
@@ -603,7 +634,7 @@ class SolutionCategoryAPI(object):
 
     def get_category_translated(self, category_id, lang_code):
         url = "solutions/categories/%d/%s" % (category_id,lang_code)
-        return SolutionCategory(**self._api._get(url))
+        return self._api._model(SolutionCategory, self._api._get(url))
 
 
 class SolutionFolderAPI(object):
@@ -613,41 +644,41 @@ class SolutionFolderAPI(object):
     def list_from_category(self, category_id):
         url = "solutions/categories/%d/folders" % category_id
         folders = self._api._get(url)
-        return [SolutionFolder(**r) for r in folders]
+        return [self._api._model(SolutionFolder, r) for r in folders]
 
     def list_from_category_translated(self, category_id, lang_code):
         url = "solutions/categories/%d/folders/%s" % (category_id, lang_code)
         folders = self._api._get(url)
-        return [SolutionFolder(**r) for r in folders]
+        return [self._api._model(SolutionFolder, r) for r in folders]
 
     def get_folder(self, folder_id):
         url = "solutions/folders/%d" % folder_id
-        return SolutionFolder(**self._api._get(url))
+        return self._api._model(SolutionFolder, self._api._get(url))
 
     def get_folder_translated(self, folder_id, lang_code):
         url = "solutions/folders/%d/%s" % (folder_id, lang_code)
-        return SolutionFolder(**self._api._get(url))
+        return self._api._model(SolutionFolder, self._api._get(url))
 
     def create_folder(self, category_id, *args, **kwargs):
         url = "solutions/categories/%s/folders" % category_id
-        return SolutionFolder(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionFolder, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def create_folder_translation(self, folder_id, lang_code, *args, **kwargs):
         url = "solutions/folders/%s/%s" % ( folder_id, lang_code)
-        return SolutionFolder(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionFolder, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def update_folder(self, folder_id, *args, **kwargs):
         url = "solutions/folders/%s" % (folder_id)
         data = {}
         data.update(kwargs)
-        return SolutionFolder(**self._api._put(url, data=json.dumps(data)))
+        return self._api._model(SolutionFolder, self._api._put(url, data=self._api._dumps(data)))
 
     def update_folder_translation(self, folder_id, lang_code, *args, **kwargs):
         url = "solutions/folders/%s/%s" % (folder_id, lang_code)
         print(url)
         data = {}
         data.update(kwargs)
-        return SolutionFolder(**self._api._put(url, data=json.dumps(data)))
+        return self._api._model(SolutionFolder, self._api._put(url, data=self._api._dumps(data)))
 
     def delete_folder(self, folder_id):
         url = "solutions/folders/%s" % (folder_id)
@@ -660,37 +691,37 @@ class SolutionArticleAPI(object):
 
     def get_article(self, article_id):
         url = "solutions/articles/%d" % article_id
-        return SolutionArticle(**self._api._get(url))
+        return self._api._model(SolutionArticle, self._api._get(url))
 
     def get_article_translated(self, article_id, language_code):
         url = "solutions/articles/%d/%s" % (article_id,language_code)
-        return SolutionArticle(**self._api._get(url))
+        return self._api._model(SolutionArticle, self._api._get(url))
 
     def list_from_folder(self, id):
         url = "solutions/folders/%d/articles" % id
         articles = self._api._get(url)
-        return [SolutionArticle(**a) for a in articles]
+        return [self._api._model(SolutionArticle, a) for a in articles]
 
     def list_from_folder_translated(self, id, language_code):
         url = "solutions/folders/%d/articles/%s" % (id, language_code)
         articles = self._api._get(url)
-        return [SolutionArticle(**a) for a in articles]
+        return [self._api._model(SolutionArticle, a) for a in articles]
 
     def create_article(self, folder_id, *args, **kwargs):
         url = 'solutions/folders/%s/articles' % folder_id
-        return SolutionArticle(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionArticle, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def create_article_translation(self, article_id, lang, *args, **kwargs):
         url = 'solutions/articles/%s/%s' %( article_id, lang )
-        return SolutionArticle(**self._api._post(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionArticle, self._api._post(url, data=self._api._dumps(kwargs)))
 
     def update_article(self, article_id, *args, **kwargs):
         url = 'solutions/articles/%s' % article_id
-        return SolutionArticle(**self._api._put(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionArticle, self._api._put(url, data=self._api._dumps(kwargs)))
 
     def update_article_translation(self, article_id, lang, *args, **kwargs):
         url = 'solutions/articles/%s/%s' % ( article_id, lang )
-        return SolutionArticle(**self._api._put(url, data=json.dumps(kwargs)))
+        return self._api._model(SolutionArticle, self._api._put(url, data=self._api._dumps(kwargs)))
 
     def delete_article(self, article_id):
         url = 'solutions/articles/%s' % article_id
@@ -700,7 +731,7 @@ class SolutionArticleAPI(object):
         url = 'search/solutions?term=%s' % keyword
         articles = []
         for r in self._api._get(url):
-            articles.append(SolutionArticle(**r))
+            articles.append(self._api._model(SolutionArticle, r))
         return articles
 
 class SolutionAPI(object):
@@ -711,12 +742,50 @@ class SolutionAPI(object):
         self.articles = SolutionArticleAPI(api)
 
 class API(object):
-    def __init__(self, domain, api_key, verify=True, proxies=None):
+    def __init__(
+        self,
+        domain,
+        api_key,
+        verify=True,
+        proxies=None,
+        rate_limiter=None,
+        retry=None,
+        page_concurrency=1,
+        pool_connections=10,
+        pool_maxsize=10,
+        timeout=None,
+        tcp_keepalive=None,
+        cache=None,
+        conditional_get=False,
+        model_mode="eager",
+        json_codec=None,
+        identity_map=None,
+    ):
         """Creates a wrapper to perform API actions.
 
         Arguments:
-          domain:    the Freshdesk domain (not custom). e.g. company.freshdesk.com
-          api_key:   the API key
+          domain:            the Freshdesk domain (not custom). e.g. company.freshdesk.com
+          api_key:           the API key
+          rate_limiter:      an optional `freshdesk.v2.ratelimit.RateLimiter` used to pace requests
+          retry:             an optional `freshdesk.v2.retry.Retry` policy for failed requests
+          page_concurrency:  the number of pages of a `list_*` call to fetch in parallel
+          pool_connections:  the number of connection pools to cache
+          pool_maxsize:      the maximum number of connections kept open per host; set this to at
+                             least the number of threads sharing the instance
+          timeout:           seconds to wait for the server, or a (connect, read) tuple
+          tcp_keepalive:     seconds of idle time before TCP keep-alive probes are sent on pooled
+                             connections, or None to leave keep-alive off
+          cache:             an optional `freshdesk.v2.cache.ResponseCache` for reference data
+          conditional_get:   remember the ETag/Last-Modified of GET responses and revalidate them,
+                             serving a 304 Not Modified from the remembered response
+          model_mode:        how models are built from responses: "eager" sets every attribute up
+                             front, "lazy" wraps the response and converts attributes on first access,
+                             "compact" builds __slots__ records to hold large result sets in less memory
+          json_codec:        the JSON codec for requests and responses: None for the standard library,
+                             "orjson", "ujson", "fast" for the fastest one installed, or a custom
+                             object with dumps() and loads() (see `freshdesk.v2.codec`)
+          identity_map:      an optional `freshdesk.v2.identity.IdentityMap` sharing one model
+                             instance per entity across calls; see also identity_scope()
 
         Instances:
           .tickets:  the Ticket API
@@ -728,6 +797,24 @@ class API(object):
         self._session.verify = verify
         self._session.proxies = proxies
         self._session.headers = {"Content-Type": "application/json"}
+        self._session.mount(
+            "https://",
+            FreshdeskAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, tcp_keepalive=tcp_keepalive),
+        )
+        self.timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self.page_concurrency = page_concurrency
+        self.cache = cache
+        self._validators = LRUCache(maxsize=1024) if conditional_get else None
+        if model_mode not in _MODEL_MODES:
+            raise AttributeError("model_mode must be one of: {}".format(", ".join(_MODEL_MODES)))
+        self.model_mode = model_mode
+        self._codec = get_codec(json_codec)
+        self.identity_map = identity_map
+        # identity_scope() is per thread, so it doesn't affect other threads sharing the instance
+        self._local = threading.local()
+        self._hooks = []
 
         self.tickets = TicketAPI(self)
         self.comments = CommentAPI(self)
@@ -740,14 +827,75 @@ class API(object):
         self.ticket_fields = TicketFieldAPI(self)
         self.time_entries = TimeEntryAPI(self)
         self.solutions = SolutionAPI(self)
+        self.jobs = JobAPI(self)
 
         if domain.find("freshdesk.com") < 0:
             raise AttributeError("Freshdesk v2 API works only via Freshdesk" "domains and not via custom CNAMEs")
         self.domain = domain
 
+    @contextmanager
+    def identity_scope(self, identity_map=None):
+        """Context manager resolving every entity fetched inside it to one shared model instance:
+
+            with api.identity_scope():
+                contact = api.contacts.get_contact(1)
+                assert api.contacts.get_contact(1) is contact
+
+        The scope only applies to the calling thread; other threads using the same instance
+        keep their own. Pass `identity_map` to share an existing map, e.g. with worker threads.
+        """
+        previous = getattr(self._local, "identity_map", None)
+        self._local.identity_map = IdentityMap() if identity_map is None else identity_map
+        try:
+            yield self._local.identity_map
+        finally:
+            self._local.identity_map = previous
+
+    def _identity_map(self):
+        """The identity map of the calling thread's scope, or else the instance's, or None."""
+        identity_map = getattr(self._local, "identity_map", None)
+        return self.identity_map if identity_map is None else identity_map
+
+    def related(self, obj, key):
+        """Returns the model of the record embedded in `obj` under `key`, e.g. the Contact of
+        `ticket.requester` when the ticket was fetched with "requester" included, or None if
+        there is none. Inside an identity scope this is the shared instance of that entity:
+
+            with api.identity_scope():
+                ticket = api.tickets.get_ticket(1, "requester")
+                assert api.related(ticket, "requester") is api.contacts.get_contact(ticket.requester_id)
+        """
+        for model, nested in NESTED.items():
+            if isinstance(obj, model) and key in nested:
+                break
+        else:
+            raise AttributeError("{!r} has no embedded {!r} record".format(obj, key))
+        data = getattr(obj, key, None)
+        if data is None:
+            return None
+        return self._model(nested[key], data)
+
+    def _model(self, cls, data):
+        """Builds an instance of the model class `cls` from a decoded response."""
+        identity_map = self._identity_map()
+        if identity_map is not None:
+            return identity_map.resolve(cls, data, self._build_model)
+        return self._build_model(cls, data)
+
+    def _build_model(self, cls, data):
+        if self.model_mode == "lazy":
+            return cls.lazy(data)
+        if self.model_mode == "compact":
+            return cls.compact(data)
+        return cls(**data)
+
+    def _dumps(self, obj):
+        """Encodes a request body with the configured JSON codec."""
+        return self._codec.dumps(obj)
+
     def _action(self, req):
         try:
-            j = req.json()
+            j = self._codec.loads(req.content) if req.content else {}
         except ValueError:
             j = {}
 
@@ -758,46 +906,254 @@ class API(object):
             error_message = j["message"]
 
         if req.status_code == 400:
-            raise FreshdeskBadRequest(error_message)
+            raise FreshdeskBadRequest(error_message, response=req)
         elif req.status_code == 401:
-            raise FreshdeskUnauthorized(error_message)
+            raise FreshdeskUnauthorized(error_message, response=req)
         elif req.status_code == 403:
-            raise FreshdeskAccessDenied(error_message)
+            raise FreshdeskAccessDenied(error_message, response=req)
         elif req.status_code == 404:
-            raise FreshdeskNotFound(error_message)
+            raise FreshdeskNotFound(error_message, response=req)
         elif req.status_code == 429:
             raise FreshdeskRateLimited(
                 "429 Rate Limit Exceeded: API rate-limit has been reached until {} seconds. See "
-                "http://freshdesk.com/api#ratelimit".format(req.headers.get("Retry-After"))
+                "http://freshdesk.com/api#ratelimit".format(req.headers.get("Retry-After")),
+                response=req,
             )
-        elif 500 < req.status_code < 600:
-            raise FreshdeskServerError("{}: Server Error".format(req.status_code))
+        elif 500 <= req.status_code < 600:
+            raise FreshdeskServerError("{}: Server Error".format(req.status_code), response=req)
 
         # Catch any other errors
         try:
             req.raise_for_status()
         except HTTPError as e:
-            raise FreshdeskError("{}: {}".format(e, j))
+            raise FreshdeskError("{}: {}".format(e, j), response=req)
 
         return j
 
+    def _get_pages(self, url, params):
+        """Yields each page of a paginated listing, in order, until the first short page.
+
+        If 'page' is given in `params`, only that page is fetched. Otherwise, when
+        `page_concurrency` is greater than one, pages are fetched in windows of that
+        many pages in parallel; pages after the first short one are discarded.
+        """
+        page = params.get("page", 1)
+        per_page = params.get("per_page", 100)
+
+        def get_page(page):
+            return self._get(url + "page=%d&per_page=%d" % (page, per_page), params)
+
+        if "page" in params:
+            yield get_page(page)
+            return
+
+        if self.page_concurrency <= 1:
+            while True:
+                this_page = get_page(page)
+                yield this_page
+                if len(this_page) < per_page:
+                    return
+                page += 1
+
+        pool = ThreadPool(self.page_concurrency)
+        try:
+            while True:
+                window = pool.map(get_page, range(page, page + self.page_concurrency))
+                for this_page in window:
+                    yield this_page
+                    if len(this_page) < per_page:
+                        return
+                page += self.page_concurrency
+        finally:
+            pool.terminate()
+
+    def _search(self, url, query, params, exhaustive=False):
+        """Returns the records matching a filter query, fetching up to the 10 pages the API allows.
+
+        If 'page' is given in `params`, only that page is fetched. With `exhaustive`, a query
+        matching more than `_SEARCH_CAP` records is split into date ranges (see `_split_search`)
+        until each range matches no more than that, and the records of every range are merged.
+        """
+        page = params.get("page", 1)
+
+        def get_page(query, page):
+            return self._get(url + 'page={}&query="{}"'.format(page, query), params)
+
+        if not exhaustive or "page" in params:
+            records = []
+            while True:
+                this_page = get_page(query, page)
+                if page == 1 and "page" not in params and this_page.get("total", 0) > _SEARCH_CAP:
+                    warnings.warn(
+                        "Query matched {} records, but only the first {} can be fetched; "
+                        "pass exhaustive=True to fetch them all".format(this_page["total"], _SEARCH_CAP)
+                    )
+                this_page = this_page["results"]
+                records += this_page
+                if len(this_page) < _SEARCH_PAGE_SIZE or page == _SEARCH_MAX_PAGES or "page" in params:
+                    break
+                page += 1
+            return records
+
+        records = []
+        seen = set()
+
+        def add(results):
+            for record in results:
+                if record.get("id") not in seen:
+                    seen.add(record.get("id"))
+                    records.append(record)
+
+        pool = ThreadPool(max(self.page_concurrency, 1))
+        try:
+            partitions = [()]
+            pages = []
+            while partitions:
+                queries = [_partition_query(query, conditions) for conditions in partitions]
+                first_pages = pool.map(lambda q: get_page(q, 1), queries)
+                split = []
+                for conditions, q, first_page in zip(partitions, queries, first_pages):
+                    total = first_page.get("total", len(first_page["results"]))
+                    if total > _SEARCH_CAP:
+                        halves = _split_search(conditions)
+                        if halves:
+                            split += halves
+                            continue
+                        warnings.warn(
+                            "{} records matched a single day ({}), but only the first {} can be fetched".format(
+                                total, q, _SEARCH_CAP
+                            )
+                        )
+                    add(first_page["results"])
+                    last_page = min(-(-total // _SEARCH_PAGE_SIZE), _SEARCH_MAX_PAGES)
+                    pages += [(q, p) for p in range(2, last_page + 1)]
+                partitions = split
+            for this_page in pool.map(lambda args: get_page(*args), pages):
+                add(this_page["results"])
+        finally:
+            pool.terminate()
+        return records
+
+    def _request(self, method, url, **kwargs):
+        """Sends a request to the given URL (relative to the API prefix), retrying it according to
+        the retry policy. Returns a JSON response."""
+        cache = self.cache
+        if cache is not None:
+            if method == "GET":
+                j = cache.get(url, kwargs.get("params"), _MISSING)
+                if j is not _MISSING:
+                    return j
+                generation = cache.generation
+            else:
+                cache.invalidate_write(url)
+
+        attempt = 0
+        try:
+            while True:
+                try:
+                    j = self._send(method, url, attempt, **kwargs)
+                    break
+                except (FreshdeskError, requests.ConnectionError) as e:
+                    if self._retry is None or not self._retry.is_retryable(method, e, attempt):
+                        raise
+                    self._retry.sleep(self._retry.backoff(e, attempt))
+                    attempt += 1
+        finally:
+            if cache is not None and method != "GET":
+                # Again, in case a GET sent while the write was in flight cached the old state.
+                # A failed write may still have been applied.
+                cache.invalidate_write(url)
+
+        if cache is not None and method == "GET":
+            cache.set(url, kwargs.get("params"), j, generation)
+        return j
+
+    def _send(self, method, url, attempt=0, **kwargs):
+        key = validators = None
+        if method == "GET" and self._validators is not None:
+            key = cache_key(url, kwargs.get("params"))
+            validators = self._validators.get(key)
+            if validators is not None:
+                etag, last_modified, _ = validators
+                headers = dict(kwargs.get("headers") or {})
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+                kwargs["headers"] = headers
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+
+        hooks = self._hooks
+        if hooks:
+            start = _monotonic()
+        req = None
+        try:
+            req = self._session.request(method, self._api_prefix + url, timeout=self.timeout, **kwargs)
+            if self._rate_limiter is not None:
+                self._rate_limiter.update(req)
+            if validators is not None and req.status_code == 304:
+                j = validators[2]
+            else:
+                j = self._action(req)
+        except (FreshdeskError, requests.RequestException) as e:
+            if hooks:
+                self._emit(hooks, RequestEvent(method, url, req, _monotonic() - start, attempt, e))
+            raise
+        if hooks:
+            self._emit(hooks, RequestEvent(method, url, req, _monotonic() - start, attempt))
+
+        if validators is not None and req.status_code == 304:
+            return j
+        if key is not None:
+            etag = req.headers.get("ETag")
+            last_modified = req.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators.set(key, (etag, last_modified, j))
+        return j
+
+    def register_hook(self, hook):
+        """Registers a callable to be called with a `freshdesk.v2.hooks.RequestEvent` after every
+        HTTP request the client sends, including each retry. Hooks run in the thread that sent the
+        request, and anything they raise propagates to the caller."""
+        self._hooks = self._hooks + [hook]
+
+    def unregister_hook(self, hook):
+        """Removes a hook registered with register_hook()."""
+        hooks = list(self._hooks)
+        hooks.remove(hook)
+        self._hooks = hooks
+
+    def _emit(self, hooks, event):
+        for hook in hooks:
+            hook(event)
+
     def _get(self, url, params={}):
         """Wrapper around request.get() to use the API prefix. Returns a JSON response."""
-        req = self._session.get(self._api_prefix + url, params=params)
-        return self._action(req)
+        return self._request("GET", url, params=params)
 
     def _post(self, url, data={}, **kwargs):
         """Wrapper around request.post() to use the API prefix. Returns a JSON response."""
-        req = self._session.post(self._api_prefix + url, data=data, **kwargs)
-        return self._action(req)
+        return self._request("POST", url, data=data, **kwargs)
+
+    def _post_multipart(self, url, data):
+        """Posts `data` as multipart/form-data, streaming the files in `data["attachments"]`
+        rather than loading them into memory. Raises AttributeError, before anything is sent,
+        if the attachments are larger than Freshdesk accepts."""
+        data = dict(data)
+        attachments = data.pop("attachments")
+        encoder = MultipartEncoder(form_fields(data), [("attachments[]", attachment) for attachment in attachments])
+        try:
+            # The encoder knows its length, so `requests` sends a Content-Length rather than chunking
+            return self._post(url, data=encoder, headers={"Content-Type": encoder.content_type})
+        finally:
+            encoder.close()
 
     def _put(self, url, data={}):
         """Wrapper around request.put() to use the API prefix. Returns a JSON response."""
-        req = self._session.put(self._api_prefix + url, data=data)
-        return self._action(req)
+        return self._request("PUT", url, data=data)
 
     def _delete(self, url):
         """Wrapper around request.delete() to use the API prefix. Returns a JSON response."""
-        req = self._session.delete(self._api_prefix + url)
-        print(req)
-        return self._action(req)
+        return self._request("DELETE", url)
@@ -0,0 +1,128 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from freshdesk.v2.api import API
+
+# The number of items an `iter_*` generator is advanced by per call into the executor
+ITER_BATCH_SIZE = 100
+
+
+def _take(iterator, n):
+    return list(itertools.islice(iterator, n))
+
+
+class _AsyncResource(object):
+    """Wraps one of the synchronous sub-clients (e.g. `API.tickets`) so that
+    every method returns an awaitable instead of blocking the caller."""
+
+    def __init__(self, resource, executor):
+        self._resource = resource
+        self._executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            # Nested sub-clients such as `solutions.categories`
+            wrapped = _AsyncResource(attr, self._executor)
+            setattr(self, name, wrapped)
+            return wrapped
+
+        executor = self._executor
+
+        if name.startswith("iter_"):
+            # Generators fetch pages as they're advanced, so advance them in the executor
+            # too, a batch at a time, and expose them as async iterators
+            @functools.wraps(attr)
+            async def iterate(*args, **kwargs):
+                loop = asyncio.get_running_loop()
+                iterator = attr(*args, **kwargs)
+                try:
+                    while True:
+                        batch = await loop.run_in_executor(executor, _take, iterator, ITER_BATCH_SIZE)
+                        if not batch:
+                            return
+                        for item in batch:
+                            yield item
+                finally:
+                    iterator.close()
+
+            setattr(self, name, iterate)
+            return iterate
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(attr, *args, **kwargs))
+
+        setattr(self, name, method)
+        return method
+
+    def __repr__(self):
+        return "<Async {!r}>".format(self._resource)
+
+
+class AsyncAPI(object):
+    _api_class = API
+
+    _resources = (
+        "tickets",
+        "comments",
+        "contacts",
+        "companies",
+        "groups",
+        "customers",
+        "agents",
+        "roles",
+        "ticket_fields",
+        "time_entries",
+        "solutions",
+        "jobs",
+    )
+
+    def __init__(self, domain, api_key, max_concurrency=100, **kwargs):
+        """Creates an asyncio wrapper to perform API actions.
+
+        It exposes the same sub-clients as `freshdesk.v2.api.API`, but every
+        method returns an awaitable resolving to the same model classes:
+
+            async with AsyncAPI("company.freshdesk.com", "api_key") as a:
+                tickets = await asyncio.gather(*(a.tickets.get_ticket(i) for i in ids))
+
+        `iter_*` methods return async iterators instead, whose pages are fetched in the
+        worker threads too:
+
+            async for ticket in a.tickets.iter_tickets(filter_name=None):
+                ...
+
+        Arguments:
+          domain:           the Freshdesk domain (not custom). e.g. company.freshdesk.com
+          api_key:          the API key
+          max_concurrency:  the maximum number of requests in flight at once
+
+        Any other keyword arguments are passed through to `API`.
+        """
+
+        # Size the connection pool to match, so concurrent requests don't discard connections
+        kwargs.setdefault("pool_maxsize", max_concurrency)
+        self._api = self._api_class(domain, api_key, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.max_concurrency = max_concurrency
+
+        for name in self._resources:
+            setattr(self, name, _AsyncResource(getattr(self._api, name), self._executor))
+
+        self.domain = self._api.domain
+
+    def close(self):
+        """Waits for in-flight requests to finish and releases the worker threads and connections."""
+        self._executor.shutdown(wait=True)
+        self._api._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # close() waits for in-flight requests, so keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
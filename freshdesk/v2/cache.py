@@ -0,0 +1,168 @@
+import re
+import threading
+from collections import OrderedDict
+
+from freshdesk.v2.ratelimit import _monotonic
+
+_MISSING = object()
+
+# Writes to these endpoints change other resources too, e.g. converting a contact creates an agent
+RELATED_RESOURCES = (
+    (re.compile(r"^contacts/\d+/make_agent$"), ("agents",)),
+    (re.compile(r"^agents/\d+$"), ("contacts",)),
+)
+
+
+def cache_key(url, params=None):
+    """Returns a hashable key for a GET of `url` with the given query parameters."""
+    return url, tuple(sorted((k, repr(v)) for k, v in (params or {}).items()))
+
+
+class LRUCache(object):
+    """A size-bounded, thread-safe mapping which evicts the least recently used
+    entry when full. Entries may optionally expire after a number of seconds."""
+
+    def __init__(self, maxsize=1024, clock=_monotonic):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count=True):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    # Mark as most recently used
+                    del self._entries[key]
+                    self._entries[key] = entry
+                    if count:
+                        self.hits += 1
+                    return value
+                del self._entries[key]
+            if count:
+                self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache(object):
+    """Caches GET responses of reference data that rarely changes, such as agents,
+    groups and ticket fields, so repeated lookups don't cost a request each.
+
+    Only resources listed in `ttls` (a mapping of URL prefix to seconds) are cached;
+    the longest matching prefix wins, e.g. 'solutions/categories' before 'solutions'.
+    Any POST, PUT or DELETE to a cached resource invalidates it, along with resources the
+    endpoint is known to change (see `RELATED_RESOURCES`).
+
+    Cached responses are shared between callers and must not be modified.
+    """
+
+    DEFAULT_TTLS = {
+        "agents": 300,
+        "companies": 300,
+        "groups": 300,
+        "roles": 3600,
+        "solutions": 300,
+        "ticket_fields": 3600,
+    }
+
+    def __init__(self, ttls=None, maxsize=1024, clock=_monotonic):
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self._entries = LRUCache(maxsize, clock)
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so responses fetched before one aren't cached after it
+        self.generation = 0
+
+    @property
+    def hits(self):
+        return self._entries.hits
+
+    @property
+    def misses(self):
+        return self._entries.misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def resource(self, url):
+        """Returns the configured resource prefix for a URL, or None if it isn't cached."""
+        path = url.split("?", 1)[0].split("/")
+        for i in range(len(path), 0, -1):
+            prefix = "/".join(path[:i])
+            if self.ttls.get(prefix) is not None:
+                return prefix
+        return None
+
+    def get(self, url, params=None, default=None):
+        if self.resource(url) is None:
+            return default
+        return self._entries.get(cache_key(url, params), default)
+
+    def set(self, url, params, value, generation=None):
+        """Caches a response. If `generation` (the value of `.generation` when the request was
+        sent) is given and something was invalidated since, the response may be stale and is
+        not cached."""
+        resource = self.resource(url)
+        if resource is None:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries.set(cache_key(url, params), value, self.ttls[resource])
+
+    def invalidate_write(self, url):
+        """Drops cached responses a POST, PUT or DELETE to `url` may have made stale."""
+        path = url.split("?", 1)[0]
+        self.invalidate(path.split("/", 1)[0])
+        for pattern, resources in RELATED_RESOURCES:
+            if pattern.match(path):
+                for resource in resources:
+                    self.invalidate(resource)
+
+    def invalidate(self, resource=None):
+        """Drops cached responses for URLs starting with `resource`, or everything if not given."""
+        with self._lock:
+            self.generation += 1
+        if resource is None:
+            self._entries.clear()
+            return
+        resource = resource.rstrip("/")
+        for key in self._entries.keys():
+            url = key[0]
+            if url == resource or url.startswith(resource + "/") or url.startswith(resource + "?"):
+                self._entries.pop(key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
@@ -0,0 +1,226 @@
+import csv
+import datetime
+import json
+from array import array
+
+from freshdesk.v2.models import _TIMESTAMP_KEYS, _UTC, _convert
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=_UTC)
+_NAN = float("nan")
+
+# Fields holding the integer code of an enumeration, e.g. a ticket's status
+ENUM_FIELDS = frozenset(["priority", "source", "status"])
+
+
+def column_kind(name):
+    """Returns the kind of column used for a field: 'int', 'enum', 'timestamp' or 'object'."""
+    if name == "id" or name.endswith("_id"):
+        return "int"
+    if name in ENUM_FIELDS:
+        return "enum"
+    if name.endswith("_at") or name in _TIMESTAMP_KEYS:
+        return "timestamp"
+    return "object"
+
+
+class Column(object):
+    """The values of one field across all records.
+
+    Integer ids and enum codes are stored in an array of machine integers, and
+    timestamps as float seconds since the epoch (NaN when missing). Null ids and
+    codes are stored as 0 and marked in `valid`, an array('b') of 1s and 0s that
+    is only created once a column has a null. A column that receives a value not
+    fitting its type falls back to a list, in which timestamps are still parsed.
+    """
+
+    _typecodes = {"int": "q", "enum": "h", "timestamp": "d"}
+
+    def __init__(self, name, kind=None):
+        self.name = name
+        self.kind = kind or column_kind(name)
+        typecode = self._typecodes.get(self.kind)
+        self.values = array(typecode) if typecode else []
+        self.valid = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def _to_list(self):
+        if isinstance(self.values, array):
+            values = self.values.tolist()
+            if self.kind == "timestamp":
+                values = [None if v != v else v for v in values]
+            elif self.valid is not None:
+                values = [v if ok else None for v, ok in zip(values, self.valid)]
+            self.values = values
+            self.valid = None
+
+    def append(self, value):
+        if self.kind == "timestamp":
+            # Parsed as on models, also once the column has fallen back to a list
+            value = _convert(self.name, value)
+            if isinstance(self.values, array):
+                if value is None:
+                    self.values.append(_NAN)
+                    return
+                if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+                    self.values.append((value - _EPOCH).total_seconds())
+                    return
+        elif isinstance(self.values, array):
+            if value is None:
+                if self.valid is None:
+                    self.valid = array("b", [1]) * len(self.values)
+                self.values.append(0)
+                self.valid.append(0)
+                return
+            try:
+                if isinstance(value, bool):
+                    raise TypeError(value)
+                self.values.append(value)
+                if self.valid is not None:
+                    self.valid.append(1)
+                return
+            except (TypeError, OverflowError):
+                pass
+        self._to_list()
+        self.values.append(value)
+
+    def pop(self):
+        """Removes the last value."""
+        if self.valid is not None:
+            self.valid.pop()
+        return self.values.pop()
+
+    def pad(self, n):
+        """Appends missing values until the column holds `n` values."""
+        while len(self.values) < n:
+            self.append(None)
+
+    def to_list(self):
+        """Returns the values as a list, with nulls as None and timestamps as timezone-aware datetimes."""
+        if self.kind != "timestamp":
+            if self.valid is not None:
+                return [v if ok else None for v, ok in zip(self.values, self.valid)]
+            return list(self.values)
+        if isinstance(self.values, array):
+            return [None if v != v else _EPOCH + datetime.timedelta(seconds=v) for v in self.values]
+        return [
+            _EPOCH + datetime.timedelta(seconds=v) if isinstance(v, float) else v for v in self.values
+        ]
+
+
+class ColumnarResult(object):
+    """Records of a listing held as one typed `Column` per field rather than
+    one object per record, for building analytics tables:
+
+        result = api.tickets.list_tickets_columnar(filter_name=None)
+        result["status"]                        # array('h', [2, 4, ...])
+        result.valid("company_id")              # array('b', [1, 0, ...]), or None without nulls
+        pyarrow.table(result.to_dict())         # or pandas.DataFrame(result.to_dict())
+        result.to_csv(open("tickets.csv", "w"))
+
+    Custom fields are flattened into columns of their own, as on models. If
+    `fields` is given, only those fields are kept. If `model` is given, the
+    codes of its enumerated fields can be decoded with `labels()`.
+    """
+
+    def __init__(self, fields=None, model=None):
+        self.fields = None if fields is None else frozenset(fields)
+        self.model = model
+        self.columns = {}
+        self._order = []
+        self._length = 0
+        if fields is not None:
+            for name in fields:
+                self._column(name)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, name):
+        return self.columns[name].values
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def valid(self, name):
+        """Returns the validity mask of a column (1 for a value, 0 for a null), or None when
+        the column has no nulls or isn't a typed array."""
+        return self.columns[name].valid
+
+    @property
+    def names(self):
+        return list(self._order)
+
+    def _column(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = Column(name)
+            column.pad(self._length)
+            self._order.append(name)
+        return column
+
+    def append(self, record):
+        """Adds a decoded record from the API."""
+        custom_fields = record.get("custom_fields") or record.get("custom_field") or {}
+        seen = set()
+        for items in (record.items(), custom_fields.items()):
+            for name, value in items:
+                if name in ("custom_fields", "custom_field") and custom_fields:
+                    continue
+                if self.fields is not None and name not in self.fields:
+                    continue
+                column = self._column(name)
+                if name in seen:
+                    # A custom field named like a built-in one replaces it, as on models
+                    column.pop()
+                column.append(value)
+                seen.add(name)
+        self._length += 1
+        for name in self._order:
+            if name not in seen:
+                self.columns[name].append(None)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def labels(self, name):
+        """Returns the values of an enumerated column decoded to their names, e.g.
+        ['open', 'closed', ...] for a ticket status. Unknown codes are kept as is."""
+        decoders = self.model._schema.labels if self.model is not None else {}
+        if name not in decoders:
+            raise KeyError("{!r} is not an enumerated field".format(name))
+        labels = decoders[name]
+        return [labels.get(code, code) for code in self.columns[name].to_list()]
+
+    @classmethod
+    def from_pages(cls, pages, fields=None, model=None):
+        """Builds a result from an iterable of pages of decoded records."""
+        result = cls(fields, model)
+        for page in pages:
+            result.extend(page)
+        return result
+
+    def to_dict(self):
+        """Returns a mapping of field name to a list of values, ready for pandas or pyarrow."""
+        return dict((name, self.columns[name].to_list()) for name in self._order)
+
+    def to_csv(self, fileobj, fields=None):
+        """Writes the records as CSV. Timestamps are written in ISO 8601, lists and dicts as JSON."""
+        fields = fields or self._order
+        columns = [self.columns[name].to_list() for name in fields]
+        writer = csv.writer(fileobj)
+        writer.writerow(fields)
+        for row in zip(*columns):
+            writer.writerow([_csv_value(v) for v in row])
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
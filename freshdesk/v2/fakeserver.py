@@ -0,0 +1,812 @@
+"""A local stand-in for the Freshdesk v2 API, for load and resilience testing without a live account.
+
+    with FakeFreshdesk(latency=0.05, error_rate=0.01) as server:
+        server.populate(tickets=5000, contacts=500, companies=50)
+        api = server.client(retry=Retry())
+        tickets = api.tickets.list_tickets(filter_name=None)
+
+It serves the endpoints the client covers from memory, paginating and rate
+limiting like Freshdesk: `X-RateLimit-*` headers on every response, a `Link`
+header to the next page of a listing, search results in pages of 30 up to
+page 10, and 429 Too Many Requests with `Retry-After` once the per-minute
+budget is spent.
+"""
+import datetime
+import email.parser
+import json
+import random
+import re
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+from freshdesk.v2.models import _string_types
+from freshdesk.v2.ratelimit import _monotonic
+
+try:
+    _parse_message = email.parser.BytesParser().parsebytes
+except AttributeError:
+    # Python 2 parses messages from byte strings with the plain parser
+    _parse_message = email.parser.Parser().parsestr
+
+PREFIX = "/api/v2/"
+
+# The collections of records the server keeps; solution categories, folders and articles are named without the prefix
+RESOURCES = (
+    "tickets",
+    "conversations",
+    "contacts",
+    "companies",
+    "agents",
+    "groups",
+    "roles",
+    "time_entries",
+    "ticket_fields",
+    "categories",
+    "folders",
+    "articles",
+    "jobs",
+)
+
+SEARCH_PAGE_SIZE = 30
+SEARCH_MAX_PAGES = 10
+
+# A multipart/form-data field of a dict argument, e.g. custom_fields[cf_team]
+_FORM_KEY = re.compile(r"^(\w+)\[([^\]]+)\]$")
+
+
+class HTTPError(Exception):
+    """Raised by route handlers to respond with an error status."""
+
+    def __init__(self, status, body=None, headers=None):
+        super(HTTPError, self).__init__(status)
+        self.status = status
+        self.body = body if body is not None else {"message": "Request failed with status {}".format(status)}
+        self.headers = headers or {}
+
+
+def _now():
+    return datetime.datetime.utcnow().replace(microsecond=0)
+
+
+def _timestamp(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _not_found():
+    return HTTPError(404, {"message": "Resource not found"})
+
+
+def _parse_multipart(body, content_type):
+    """Parses a multipart/form-data request body into an `email.message.Message` with one part per field."""
+    return _parse_message(b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+
+
+def _validation_error(field, message, code="missing_field"):
+    return HTTPError(
+        400, {"description": "Validation failed", "errors": [{"field": field, "message": message, "code": code}]}
+    )
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, content = self.fake.handle(
+            self.command, self.path, body, self.headers.get("Content-Type", ""), self.headers.get("Authorization")
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class FakeFreshdesk(object):
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        rate_limit=5000,
+        latency=0,
+        error_rate=0,
+        error_status=503,
+        seed=None,
+        clock=_monotonic,
+    ):
+        """Creates a fake Freshdesk server. Call start() (or use it as a context manager) to serve.
+
+        Arguments:
+          host, port:    the address to listen on; port 0 picks a free one
+          rate_limit:    requests allowed per minute, as the account's API limit, or None for no limit
+          latency:       seconds to wait before responding, or a callable returning them
+          error_rate:    the probability of failing a request with `error_status` instead of serving it
+          error_status:  the status code of injected errors
+          seed:          seeds the random choices of error injection and populate()
+          clock:         a monotonic clock in seconds, for the rate limit window
+        """
+        self.host = host
+        self.port = port
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+        self._failures = []
+        self._window_start = None
+        self._window_used = 0
+        self.requests = []
+        self.reset()
+        self._routes = self._build_routes()
+
+    # Lifecycle
+
+    def start(self):
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = _Server((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FakeFreshdesk")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def url(self):
+        return "http://{}:{}/".format(self.host, self.port)
+
+    def client(self, **kwargs):
+        """Returns a `freshdesk.v2.api.API` sending its requests to this server."""
+        from freshdesk.v2.api import API
+
+        api = API("fake.freshdesk.com", "fake_api_key", **kwargs)
+        api._api_prefix = self.url + PREFIX.lstrip("/")
+        # The server speaks plain HTTP; use the adapter configured for Freshdesk (pool size,
+        # keep-alive) rather than the session's default one
+        api._session.mount("http://", api._session.get_adapter("https://"))
+        return api
+
+    # Data
+
+    def reset(self):
+        """Removes every record and resets the rate limit."""
+        with self._lock:
+            self.store = dict((resource, {}) for resource in RESOURCES)
+            self.translations = {}
+            self._ids = dict((resource, 0) for resource in RESOURCES)
+            self._window_start = None
+            self._window_used = 0
+            del self.requests[:]
+
+    def add(self, resource, record=None, **fields):
+        """Adds a record to a resource (e.g. 'tickets'), assigning an id and timestamps if missing. Returns it."""
+        record = dict(record or {}, **fields)
+        with self._lock:
+            if "id" not in record:
+                self._ids[resource] += 1
+                record["id"] = self._ids[resource]
+            elif isinstance(record["id"], int):
+                self._ids[resource] = max(self._ids[resource], record["id"])
+            now = _timestamp(_now())
+            record.setdefault("created_at", now)
+            record.setdefault("updated_at", record["created_at"])
+            self.store[resource][record["id"]] = record
+        return record
+
+    def get(self, resource, id):
+        try:
+            return self.store[resource][id]
+        except KeyError:
+            raise _not_found()
+
+    def populate(self, tickets=0, contacts=0, companies=0, agents=0, groups=0, conversations=0, days=365):
+        """Fills the store with generated records, created over the last `days` days.
+        `conversations` is the number of conversations per ticket."""
+        now = _now()
+        rand = self.random
+
+        def when():
+            created = now - datetime.timedelta(seconds=rand.randint(0, days * 86400))
+            updated = created + datetime.timedelta(seconds=rand.randint(0, int((now - created).total_seconds())))
+            return _timestamp(created), _timestamp(updated)
+
+        for i in range(groups):
+            self.add("groups", name="Group {}".format(i + 1), description="", agent_ids=[])
+        for i in range(agents):
+            self.add(
+                "agents",
+                available=True,
+                occasional=False,
+                ticket_scope=1,
+                contact={"name": "Agent {}".format(i + 1), "email": "agent{}@example.com".format(i + 1)},
+            )
+        company_ids = []
+        for i in range(companies):
+            created, updated = when()
+            company = self.add(
+                "companies",
+                name="Company {}".format(i + 1),
+                domains=["company{}.example.com".format(i + 1)],
+                custom_fields={},
+                created_at=created,
+                updated_at=updated,
+            )
+            company_ids.append(company["id"])
+        contact_ids = []
+        for i in range(contacts):
+            created, updated = when()
+            contact = self.add(
+                "contacts",
+                name="Contact {}".format(i + 1),
+                email="contact{}@example.com".format(i + 1),
+                company_id=rand.choice(company_ids) if company_ids else None,
+                active=True,
+                time_zone="Brisbane",
+                custom_fields={},
+                created_at=created,
+                updated_at=updated,
+            )
+            contact_ids.append(contact["id"])
+        for i in range(tickets):
+            created, updated = when()
+            ticket = self.add(
+                "tickets",
+                subject="Ticket {}".format(i + 1),
+                description="<div>Description of ticket {}</div>".format(i + 1),
+                description_text="Description of ticket {}".format(i + 1),
+                status=rand.choice((2, 3, 4, 5)),
+                priority=rand.choice((1, 2, 3, 4)),
+                source=rand.choice((1, 2, 3, 7)),
+                requester_id=rand.choice(contact_ids) if contact_ids else None,
+                company_id=rand.choice(company_ids) if company_ids else None,
+                tags=[],
+                spam=False,
+                deleted=False,
+                custom_fields={},
+                created_at=created,
+                updated_at=updated,
+                due_by=_timestamp(now + datetime.timedelta(days=3)),
+                fr_due_by=_timestamp(now + datetime.timedelta(days=1)),
+            )
+            for j in range(conversations):
+                self.add(
+                    "conversations",
+                    ticket_id=ticket["id"],
+                    body="<div>Reply {}</div>".format(j + 1),
+                    body_text="Reply {}".format(j + 1),
+                    incoming=j % 2 == 0,
+                    private=False,
+                    source=0,
+                    created_at=updated,
+                    updated_at=updated,
+                )
+
+    # Fault injection
+
+    def fail_next(self, status=503, count=1, body=None, headers=None):
+        """Makes the next `count` requests fail with `status`, e.g. fail_next(429, headers={"Retry-After": "1"})."""
+        with self._lock:
+            self._failures.extend([HTTPError(status, body, headers)] * count)
+
+    # Request handling
+
+    def handle(self, method, path, body, content_type="", authorization=None):
+        """Returns the (status, headers, body) of a response to a request."""
+        url = urlparse(path)
+        with self._lock:
+            self.requests.append((method, path))
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        try:
+            if authorization is None:
+                raise HTTPError(401, {"code": "invalid_credentials", "message": "You have to be logged in to perform this action."})
+            headers.update(self._spend_rate_limit())
+            with self._lock:
+                failure = self._failures.pop(0) if self._failures else None
+            if failure is None and self.error_rate and self.random.random() < self.error_rate:
+                failure = HTTPError(self.error_status, {"message": "Injected error"})
+            if failure is not None:
+                raise failure
+            if not url.path.startswith(PREFIX):
+                raise _not_found()
+
+            params = dict((k, v[-1]) for k, v in parse_qs(url.query).items())
+            data = self._decode(body, content_type)
+            route = url.path[len(PREFIX):]
+            for route_method, pattern, handler in self._routes:
+                if route_method != method:
+                    continue
+                match = pattern.match(route)
+                if match:
+                    with self._lock:
+                        result = handler(params, data, *match.groups())
+                    break
+            else:
+                raise _not_found()
+            status, result = result if isinstance(result, tuple) else (200, result)
+            if isinstance(result, _Page):
+                if result.next_page:
+                    query = dict(params, page=str(result.next_page))
+                    headers["Link"] = '<{}?{}>; rel="next"'.format(
+                        url.path, "&".join("{}={}".format(k, v) for k, v in sorted(query.items()))
+                    )
+                result = result.records
+        except HTTPError as e:
+            headers.update(e.headers)
+            return e.status, headers, json.dumps(e.body).encode("utf-8")
+        if result is None:
+            return status, headers, b""
+        return status, headers, json.dumps(result).encode("utf-8")
+
+    def _spend_rate_limit(self):
+        if self.rate_limit is None:
+            return {}
+        with self._lock:
+            now = self._clock()
+            if self._window_start is None or now - self._window_start >= 60:
+                self._window_start = now
+                self._window_used = 0
+            remaining = self.rate_limit - self._window_used
+            headers = {
+                "X-RateLimit-Total": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(max(remaining - 1, 0)),
+                "X-RateLimit-Used-CurrentRequest": "1",
+            }
+            if remaining <= 0:
+                retry_after = max(int(60 - (now - self._window_start)), 1)
+                headers["X-RateLimit-Remaining"] = "0"
+                headers["Retry-After"] = str(retry_after)
+                raise HTTPError(
+                    429, {"message": "You have exceeded the limit of requests per minute"}, headers
+                )
+            self._window_used += 1
+            return headers
+
+    @staticmethod
+    def _decode(body, content_type):
+        if not body:
+            return {}
+        if content_type.startswith("multipart/form-data"):
+            message = _parse_multipart(body, content_type)
+            data = {}
+            attachments = []
+            for part in message.get_payload():
+                name = part.get_param("name", header="content-disposition")
+                filename = part.get_filename()
+                payload = part.get_payload(decode=True)
+                if filename is not None:
+                    attachments.append({"name": filename, "size": len(payload)})
+                elif name.endswith("[]"):
+                    data.setdefault(name[:-2], []).append(payload.decode("utf-8"))
+                elif _FORM_KEY.match(name):
+                    # e.g. custom_fields[cf_team]
+                    key, field = _FORM_KEY.match(name).groups()
+                    data.setdefault(key, {})[field] = payload.decode("utf-8")
+                else:
+                    data[name] = payload.decode("utf-8")
+            data["attachments"] = attachments
+            return data
+        try:
+            return json.loads(body.decode("utf-8"))
+        except ValueError:
+            raise HTTPError(400, {"description": "Validation failed", "errors": [{"message": "Invalid JSON"}]})
+
+    # Routes
+
+    def _build_routes(self):
+        routes = [
+            ("GET", r"tickets", self._list_tickets),
+            ("POST", r"tickets", self._create_ticket),
+            ("POST", r"tickets/outbound_email", self._create_ticket),
+            ("POST", r"tickets/(bulk_update|bulk_delete)", self._bulk_tickets),
+            ("GET", r"tickets/(\d+)", self._get("tickets")),
+            ("PUT", r"tickets/(\d+)", self._update("tickets")),
+            ("DELETE", r"tickets/(\d+)", self._soft_delete("tickets")),
+            ("GET", r"tickets/(\d+)/conversations", self._list_conversations),
+            ("POST", r"tickets/(\d+)/(notes|reply)", self._create_conversation),
+            ("GET", r"tickets/(\d+)/time_entries", self._list_ticket_time_entries),
+            ("GET", r"time_entries", self._list("time_entries")),
+            ("GET", r"contacts", self._list("contacts", lambda r: not r.get("deleted"))),
+            ("POST", r"contacts", self._create("contacts", "email")),
+            ("GET", r"contacts/(\d+)", self._get("contacts")),
+            ("PUT", r"contacts/(\d+)", self._update("contacts")),
+            ("DELETE", r"contacts/(\d+)", self._soft_delete("contacts")),
+            ("PUT", r"contacts/(\d+)/restore", self._restore_contact),
+            ("DELETE", r"contacts/(\d+)/hard_delete", self._delete("contacts")),
+            ("PUT", r"contacts/(\d+)/make_agent", self._make_agent),
+            ("GET", r"companies", self._list("companies")),
+            ("POST", r"companies", self._create("companies", "name")),
+            ("GET", r"(?:companies|customers)/(\d+)", self._get("companies")),
+            ("PUT", r"companies/(\d+)", self._update("companies")),
+            ("DELETE", r"companies/(\d+)", self._delete("companies")),
+            ("GET", r"agents", self._list("agents")),
+            ("GET", r"agents/me", self._current_agent),
+            ("GET", r"agents/(\d+)", self._get("agents")),
+            ("PUT", r"agents/(\d+)", self._update("agents")),
+            ("DELETE", r"agents/(\d+)", self._delete("agents")),
+            ("GET", r"groups", self._list("groups")),
+            ("GET", r"groups/(\d+)", self._get("groups")),
+            ("GET", r"roles", self._all("roles")),
+            ("GET", r"roles/(\d+)", self._get("roles")),
+            ("GET", r"ticket_fields", self._ticket_fields),
+            ("GET", r"jobs/(\w+)", self._get_job),
+            ("GET", r"search/(tickets|contacts|companies)", self._search),
+            ("GET", r"search/solutions", self._search_solutions),
+            ("GET", r"solutions/categories", self._all("categories")),
+            ("POST", r"solutions/categories", self._create("categories", "name")),
+            ("GET", r"solutions/categories/(\d+)", self._get("categories")),
+            ("PUT", r"solutions/categories/(\d+)", self._update("categories")),
+            ("DELETE", r"solutions/categories/(\d+)", self._delete("categories")),
+            ("GET", r"solutions/categories/(\d+)/folders", self._children("folders", "category_id")),
+            ("POST", r"solutions/categories/(\d+)/folders", self._create_child("folders", "category_id", "name")),
+            ("GET", r"solutions/categories/(\d+)/folders/(\w+)", self._translated_children("folders", "category_id")),
+            ("GET", r"solutions/folders/(\d+)", self._get("folders")),
+            ("PUT", r"solutions/folders/(\d+)", self._update("folders")),
+            ("DELETE", r"solutions/folders/(\d+)", self._delete("folders")),
+            ("GET", r"solutions/folders/(\d+)/articles", self._children("articles", "folder_id")),
+            ("POST", r"solutions/folders/(\d+)/articles", self._create_child("articles", "folder_id", "title")),
+            ("GET", r"solutions/folders/(\d+)/articles/(\w+)", self._translated_children("articles", "folder_id")),
+            ("GET", r"solutions/articles/(\d+)", self._get("articles")),
+            ("PUT", r"solutions/articles/(\d+)", self._update("articles")),
+            ("DELETE", r"solutions/articles/(\d+)", self._delete("articles")),
+        ]
+        for resource in ("categories", "folders", "articles"):
+            routes += [
+                ("GET", r"solutions/{}/(\d+)/(\w+)".format(resource), self._get_translation(resource)),
+                ("POST", r"solutions/{}/(\d+)/(\w+)".format(resource), self._set_translation(resource)),
+                ("PUT", r"solutions/{}/(\d+)/(\w+)".format(resource), self._set_translation(resource)),
+            ]
+        return [(method, re.compile("^{}$".format(pattern)), handler) for method, pattern, handler in routes]
+
+    def _paginate(self, params, records):
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", 30))
+        if per_page > 100:
+            raise _validation_error("per_page", "Has to be less than or equal to 100", "invalid_value")
+        records = records[(page - 1) * per_page:page * per_page + 1]
+        return _Page(records[:per_page], page + 1 if len(records) > per_page else None)
+
+    def _filtered(self, resource, params, keep=None):
+        records = [r for r in self.store[resource].values() if keep is None or keep(r)]
+        for key, value in params.items():
+            if key in ("page", "per_page", "order_by", "order_type", "include", "filter", "updated_since", "type"):
+                continue
+            records = [r for r in records if str(r.get(key)) == value]
+        if "updated_since" in params:
+            records = [r for r in records if r["updated_at"] >= params["updated_since"]]
+        return records
+
+    def _list(self, resource, keep=None):
+        def handler(params, data):
+            return self._paginate(params, sorted(self._filtered(resource, params, keep), key=lambda r: r["id"]))
+
+        return handler
+
+    def _all(self, resource):
+        def handler(params, data):
+            return sorted(self.store[resource].values(), key=lambda r: r["id"])
+
+        return handler
+
+    def _get(self, resource):
+        def handler(params, data, id):
+            return self.get(resource, int(id))
+
+        return handler
+
+    def _create(self, resource, required):
+        def handler(params, data):
+            if not data.get(required):
+                raise _validation_error(required, "It should be a/an String")
+            return 201, self.add(resource, data)
+
+        return handler
+
+    def _update(self, resource):
+        def handler(params, data, id):
+            record = self.get(resource, int(id))
+            record.update(data)
+            record["updated_at"] = _timestamp(_now())
+            return record
+
+        return handler
+
+    def _delete(self, resource):
+        def handler(params, data, id):
+            self.get(resource, int(id))
+            del self.store[resource][int(id)]
+            return 204, None
+
+        return handler
+
+    def _soft_delete(self, resource):
+        def handler(params, data, id):
+            self.get(resource, int(id))["deleted"] = True
+            return 204, None
+
+        return handler
+
+    def _children(self, resource, parent_key):
+        def handler(params, data, parent_id):
+            return sorted((r for r in self.store[resource].values() if r.get(parent_key) == int(parent_id)), key=lambda r: r["id"])
+
+        return handler
+
+    def _translated_children(self, resource, parent_key):
+        def handler(params, data, parent_id, lang):
+            children = self._children(resource, parent_key)(params, data, parent_id)
+            return [self.translations.get((resource, r["id"], lang), r) for r in children]
+
+        return handler
+
+    def _create_child(self, resource, parent_key, required):
+        def handler(params, data, parent_id):
+            if not data.get(required):
+                raise _validation_error(required, "It should be a/an String")
+            return 201, self.add(resource, dict(data, **{parent_key: int(parent_id)}))
+
+        return handler
+
+    def _get_translation(self, resource):
+        def handler(params, data, id, lang):
+            try:
+                return self.translations[(resource, int(id), lang)]
+            except KeyError:
+                raise _not_found()
+
+        return handler
+
+    def _set_translation(self, resource):
+        def handler(params, data, id, lang):
+            record = dict(self.get(resource, int(id)), **data)
+            record["language"] = lang
+            self.translations[(resource, int(id), lang)] = record
+            return record
+
+        return handler
+
+    def _list_tickets(self, params, data):
+        name = params.get("filter")
+        if name == "deleted":
+            keep = lambda r: r.get("deleted")  # noqa: E731
+        elif name == "spam":
+            keep = lambda r: r.get("spam") and not r.get("deleted")  # noqa: E731
+        else:
+            keep = lambda r: not r.get("deleted") and not r.get("spam")  # noqa: E731
+        records = self._filtered("tickets", params, keep)
+        order_by = params.get("order_by", "created_at")
+        records.sort(key=lambda r: (r.get(order_by), r["id"]), reverse=params.get("order_type", "desc") == "desc")
+        return self._paginate(params, records)
+
+    def _create_ticket(self, params, data):
+        if not data.get("subject"):
+            raise _validation_error("subject", "It should be a/an String")
+        if not any(data.get(k) for k in ("email", "requester_id", "phone", "twitter_id", "unique_external_id")):
+            raise _validation_error("requester_id", "Please fill at least 1 of email, mobile, phone, twitter_id, requester_id fields")
+        data = dict(data)
+        for key in ("status", "priority", "source"):
+            if key in data:
+                data[key] = int(data[key])
+        data.setdefault("status", 2)
+        data.setdefault("priority", 1)
+        data.setdefault("source", 2)
+        data.setdefault("deleted", False)
+        data.setdefault("spam", False)
+        return 201, self.add("tickets", data)
+
+    def _bulk_tickets(self, params, data, action):
+        ids = data.get("bulk_action", {}).get("ids", [])
+        properties = data.get("bulk_action", {}).get("properties", {})
+        for id in ids:
+            ticket = self.store["tickets"].get(id)
+            if ticket is not None:
+                if action == "bulk_delete":
+                    ticket["deleted"] = True
+                else:
+                    ticket.update(properties)
+                    ticket["updated_at"] = _timestamp(_now())
+        job = self.add("jobs", id="{:08x}".format(self.random.getrandbits(32)), status="SUCCESS", progress=100, action=action)
+        return 202, {"job_id": job["id"], "href": "{}jobs/{}".format(PREFIX, job["id"])}
+
+    def _get_job(self, params, data, id):
+        return self.get("jobs", id)
+
+    def _list_conversations(self, params, data, ticket_id):
+        self.get("tickets", int(ticket_id))
+        records = sorted(
+            (r for r in self.store["conversations"].values() if r["ticket_id"] == int(ticket_id)), key=lambda r: r["id"]
+        )
+        return self._paginate(params, records)
+
+    def _create_conversation(self, params, data, ticket_id, kind):
+        self.get("tickets", int(ticket_id))
+        if not data.get("body"):
+            raise _validation_error("body", "It should be a/an String")
+        record = dict(data, ticket_id=int(ticket_id), source=2 if kind == "notes" else 0, incoming=False)
+        record.setdefault("private", kind == "notes")
+        return 201, self.add("conversations", record)
+
+    def _list_ticket_time_entries(self, params, data, ticket_id):
+        records = sorted(
+            (r for r in self.store["time_entries"].values() if r.get("ticket_id") == int(ticket_id)), key=lambda r: r["id"]
+        )
+        return self._paginate(params, records)
+
+    def _restore_contact(self, params, data, id):
+        self.get("contacts", int(id))["deleted"] = False
+        return 204, None
+
+    def _make_agent(self, params, data, id):
+        contact = self.get("contacts", int(id))
+        agent = self.add("agents", dict(data, id=contact["id"], contact=contact))
+        return agent
+
+    def _current_agent(self, params, data):
+        agents = sorted(self.store["agents"].values(), key=lambda r: r["id"])
+        if not agents:
+            raise _not_found()
+        return agents[0]
+
+    def _ticket_fields(self, params, data):
+        fields = sorted(self.store["ticket_fields"].values(), key=lambda r: r["id"])
+        if "type" in params:
+            fields = [f for f in fields if f.get("type") == params["type"]]
+        return fields
+
+    def _search(self, params, data, resource):
+        query = params.get("query", "").strip('"')
+        try:
+            matches = SearchQuery(query)
+        except ValueError as e:
+            raise _validation_error("query", str(e), "invalid_value")
+        page = int(params.get("page", 1))
+        if page > SEARCH_MAX_PAGES:
+            raise _validation_error("page", "Has to be less than or equal to {}".format(SEARCH_MAX_PAGES), "invalid_value")
+        records = sorted(
+            (r for r in self.store[resource].values() if not r.get("deleted") and matches(r)), key=lambda r: r["id"]
+        )
+        start = (page - 1) * SEARCH_PAGE_SIZE
+        return {"results": records[start:start + SEARCH_PAGE_SIZE], "total": len(records)}
+
+    def _search_solutions(self, params, data):
+        term = params.get("term", "").lower()
+        return [r for r in self.store["articles"].values() if term in r.get("title", "").lower()]
+
+
+class _Page(object):
+    def __init__(self, records, next_page):
+        self.records = records
+        self.next_page = next_page
+
+
+_TOKEN = re.compile(r"\s*(?:(\()|(\))|(AND|OR)\b|(\w+):([<>]?)('(?:[^']*)'|[^\s()]+))")
+
+
+class SearchQuery(object):
+    """A filter query in Freshdesk's search language, e.g. "(status:2 OR status:3) AND created_at:>'2020-01-01'",
+    callable on a record to tell whether it matches. Date bounds are inclusive, as in Freshdesk."""
+
+    def __init__(self, query):
+        self.query = query
+        self._tokens = []
+        pos = 0
+        query = query.strip()
+        while pos < len(query):
+            match = _TOKEN.match(query, pos)
+            if not match:
+                raise ValueError("Invalid query at: {}".format(query[pos:]))
+            self._tokens.append(match.groups())
+            pos = match.end()
+            while pos < len(query) and query[pos].isspace():
+                pos += 1
+        self._pos = 0
+        self._tree = self._parse_or() if self._tokens else ("all",)
+        if self._pos != len(self._tokens):
+            raise ValueError("Unexpected token in query")
+
+    def _peek(self):
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else (None,) * 6
+
+    def _parse_or(self):
+        node = self._parse_and()
+        while self._peek()[2] == "OR":
+            self._pos += 1
+            node = ("or", node, self._parse_and())
+        return node
+
+    def _parse_and(self):
+        node = self._parse_term()
+        while self._peek()[2] == "AND":
+            self._pos += 1
+            node = ("and", node, self._parse_term())
+        return node
+
+    def _parse_term(self):
+        token = self._peek()
+        self._pos += 1
+        if token[0]:
+            node = self._parse_or()
+            if self._peek()[1] is None:
+                raise ValueError("Missing closing parenthesis")
+            self._pos += 1
+            return node
+        if token[3]:
+            value = token[5]
+            if value.startswith("'"):
+                value = value[1:-1]
+            elif value in ("true", "false"):
+                value = value == "true"
+            elif value == "null":
+                value = None
+            else:
+                try:
+                    value = int(value)
+                except ValueError:
+                    pass
+            return ("field", token[3], token[4], value)
+        raise ValueError("Expected a condition")
+
+    def __call__(self, record):
+        return self._match(self._tree, record)
+
+    def _match(self, node, record):
+        kind = node[0]
+        if kind == "all":
+            return True
+        if kind == "and":
+            return self._match(node[1], record) and self._match(node[2], record)
+        if kind == "or":
+            return self._match(node[1], record) or self._match(node[2], record)
+        _, field, op, value = node
+        if field == "tag":
+            return value in (record.get("tags") or [])
+        actual = record.get(field, (record.get("custom_fields") or {}).get(field))
+        if op:
+            if actual is None:
+                return False
+            if isinstance(actual, _string_types) and isinstance(value, _string_types):
+                # Dates are compared by day
+                actual = actual[:len(value)]
+            return actual >= value if op == ">" else actual <= value
+        return actual == value
@@ -0,0 +1,99 @@
+import re
+
+_ID_SEGMENT = re.compile(r"^\d+$")
+# Path segments following these are ids even when they aren't numeric
+_ID_AFTER = frozenset(["jobs"])
+
+
+def endpoint_template(url):
+    """Returns the endpoint a URL (relative to the API prefix) belongs to, with ids
+    replaced by '{id}' and the query string dropped, e.g. 'tickets/{id}/conversations'."""
+    segments = url.split("?", 1)[0].split("/")
+    for i, segment in enumerate(segments):
+        if _ID_SEGMENT.match(segment) or (i and segments[i - 1] in _ID_AFTER):
+            segments[i] = "{id}"
+    return "/".join(segments)
+
+
+def _header_int(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _body_size(request):
+    body = getattr(request, "body", None)
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    try:
+        return int(request.headers.get("Content-Length", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class RequestEvent(object):
+    """Describes one HTTP request sent by the client, passed to the hooks registered with
+    `API.register_hook()`.
+
+    Attributes:
+      method:                the HTTP method
+      url:                   the URL relative to the API prefix, e.g. 'tickets/1?include=stats'
+      endpoint:              the URL with ids replaced and the query string dropped, e.g. 'tickets/{id}'
+      status:                the HTTP status code, or None if no response was received
+      latency:               seconds from sending the request to handling its response
+      bytes_sent:            the size of the request body
+      bytes_received:        the size of the response body
+      retries:               the number of times this request was retried before this attempt
+      rate_limit_total:      the X-RateLimit-Total header, if any
+      rate_limit_remaining:  the X-RateLimit-Remaining header, if any
+      rate_limit_used:       the X-RateLimit-Used-CurrentRequest header, if any
+      retry_after:           the Retry-After header of a rate limited response, if any
+      error:                 the exception the request raised, or None if it succeeded
+      response:              the `requests.Response`, or None
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "status",
+        "latency",
+        "bytes_sent",
+        "bytes_received",
+        "retries",
+        "rate_limit_total",
+        "rate_limit_remaining",
+        "rate_limit_used",
+        "retry_after",
+        "error",
+        "response",
+    )
+
+    def __init__(self, method, url, response, latency, retries=0, error=None):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.latency = latency
+        self.retries = retries
+        self.error = error
+        self.response = response
+        if response is None:
+            self.status = None
+            self.bytes_sent = self.bytes_received = 0
+            self.rate_limit_total = self.rate_limit_remaining = self.rate_limit_used = self.retry_after = None
+            return
+        headers = response.headers
+        self.status = response.status_code
+        self.bytes_sent = _body_size(getattr(response, "request", None))
+        self.bytes_received = len(response.content or b"")
+        self.rate_limit_total = _header_int(headers, "X-RateLimit-Total")
+        self.rate_limit_remaining = _header_int(headers, "X-RateLimit-Remaining")
+        self.rate_limit_used = _header_int(headers, "X-RateLimit-Used-CurrentRequest")
+        self.retry_after = _header_int(headers, "Retry-After")
+
+    def __repr__(self):
+        return "<RequestEvent {} {} {} {:.3f}s>".format(self.method, self.endpoint, self.status, self.latency)
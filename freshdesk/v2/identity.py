@@ -0,0 +1,75 @@
+import threading
+import weakref
+
+from freshdesk.v2.models import Company, Contact, Ticket, parse_timestamp
+
+# Model classes of the records embedded in others (e.g. by `get_ticket(id, "requester", "company")`),
+# which `API.related()` resolves through the map
+NESTED = {
+    Ticket: {"requester": Contact, "company": Company},
+}
+
+
+class IdentityMap(object):
+    """Resolves each (model class, id) to a single shared model instance.
+
+    A record for an entity already in the map returns the existing instance,
+    which is refreshed in place when the record's `updated_at` is newer. Entities
+    embedded in tickets (`requester`, `company`) stay plain dicts on the ticket;
+    `API.related(ticket, "requester")` resolves them to the shared instance.
+
+    Instances are held weakly: an entity is forgotten once nothing else refers to it.
+    """
+
+    def __init__(self):
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, key):
+        return key in self._objects
+
+    def get(self, cls, id):
+        """Returns the shared instance of the given model class and id, or None."""
+        return self._objects.get((cls, id))
+
+    def clear(self):
+        self._objects.clear()
+
+    def resolve(self, cls, data, build):
+        """Returns the shared instance for a decoded record, calling `build(cls, data)`
+        to create it when the entity is new or its record has changed."""
+        id = data.get("id")
+        if id is None:
+            return build(cls, data)
+
+        key = (cls, id)
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is None:
+                obj = build(cls, data)
+                self._objects[key] = obj
+            elif _is_newer(data, obj):
+                fresh = build(cls, data)
+                if hasattr(obj, "__dict__") and hasattr(fresh, "__dict__"):
+                    obj.__dict__.clear()
+                    obj.__dict__.update(fresh.__dict__)
+                else:
+                    # Compact records can't be updated in place
+                    obj = self._objects[key] = fresh
+            return obj
+
+
+def _is_newer(data, obj):
+    updated_at = data.get("updated_at")
+    if not updated_at:
+        return False
+    current = getattr(obj, "updated_at", None)
+    if current is None:
+        # e.g. the partial record embedded in a ticket (see `API.related()`) is replaced by a full one
+        return True
+    if not hasattr(updated_at, "tzinfo"):
+        updated_at = parse_timestamp(updated_at)
+    return updated_at > current
@@ -0,0 +1,138 @@
+import threading
+from multiprocessing.pool import ThreadPool
+
+# Resource name -> method of that sub-client fetching one record by id
+FETCHERS = {
+    "tickets": "get_ticket",
+    "contacts": "get_contact",
+    "companies": "get_company",
+    "agents": "get_agent",
+    "groups": "get_group",
+    "roles": "get_role",
+}
+
+
+class Ref(object):
+    """A reference to a record requested from a `Loader`, fetched with the rest of its batch.
+
+    `result()` returns the model (dispatching the batch if that hasn't happened yet)
+    or raises the error fetching it did. Attributes are looked up on the model, so a
+    `Ref` can mostly be used in its place.
+    """
+
+    def __init__(self, loader, resource, id):
+        self._loader = loader
+        self.resource = resource
+        self.id = id
+
+    def done(self):
+        return (self.resource, self.id) in self._loader._results
+
+    def result(self):
+        key = (self.resource, self.id)
+        if key not in self._loader._results:
+            self._loader.dispatch()
+        value, error = self._loader._results[key]
+        if error is not None:
+            raise error
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.result(), name)
+
+    def __repr__(self):
+        return "<Ref {} #{}{}>".format(self.resource, self.id, "" if self.done() else " (pending)")
+
+
+class Loader(object):
+    def __init__(self, api, concurrency=10):
+        """Collects requests for records by id and fetches them in batches, avoiding
+        the N+1 pattern of fetching each ticket's requester and company one at a time:
+
+            with Loader(api) as loader:
+                requesters = [loader.load("contacts", t.requester_id) for t in tickets]
+                companies = [loader.load("companies", t.company_id) for t in tickets if t.company_id]
+            # leaving the block fetched every distinct contact and company, `concurrency` at a time
+            print(requesters[0].name)
+
+        Ids requested more than once are only fetched once, and records already
+        fetched by the loader are served from memory for its lifetime. Outside a
+        `with` block, `dispatch()` (or the first `Ref.result()`) fetches the batch.
+
+        Arguments:
+          api:          the `freshdesk.v2.api.API` to fetch with
+          concurrency:  the maximum number of requests in flight at once
+        """
+        self._api = api
+        self.concurrency = concurrency
+        self._results = {}
+        self._pending = []
+        self._pending_keys = set()
+        self._lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+
+    def load(self, resource, id):
+        """Returns a `Ref` to the record of the given resource (e.g. 'contacts') and id."""
+        if resource not in FETCHERS:
+            raise AttributeError("Unknown resource {!r}, expected one of: {}".format(resource, ", ".join(sorted(FETCHERS))))
+        key = (resource, id)
+        with self._lock:
+            if key not in self._results and key not in self._pending_keys:
+                self._pending.append(key)
+                self._pending_keys.add(key)
+        return Ref(self, resource, id)
+
+    def load_many(self, resource, ids):
+        return [self.load(resource, id) for id in ids]
+
+    @property
+    def pending(self):
+        """The number of distinct records waiting to be fetched."""
+        return len(self._pending)
+
+    def dispatch(self):
+        """Fetches every record requested since the last dispatch."""
+        with self._dispatch_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._pending_keys = set()
+            if not pending:
+                return
+            if self.concurrency <= 1 or len(pending) == 1:
+                for key in pending:
+                    self._fetch(key)
+                return
+            # Workers resolve records through the identity scope of the thread dispatching, if any
+            identity_map = self._api._identity_map()
+            pool = ThreadPool(min(self.concurrency, len(pending)))
+            try:
+                pool.map(lambda key: self._fetch(key, identity_map), pending)
+            finally:
+                pool.terminate()
+
+    def _fetch(self, key, identity_map=None):
+        resource, id = key
+        fetch = getattr(getattr(self._api, resource), FETCHERS[resource])
+        try:
+            if identity_map is None:
+                value = fetch(id)
+            else:
+                with self._api.identity_scope(identity_map):
+                    value = fetch(id)
+            self._results[key] = (value, None)
+        except Exception as e:
+            # Raised from Ref.result(), so one missing record doesn't fail the batch
+            self._results[key] = (None, e)
+
+    def clear(self):
+        """Forgets the records fetched so far."""
+        self._results.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.dispatch()
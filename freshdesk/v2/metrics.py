@@ -0,0 +1,174 @@
+import threading
+from bisect import bisect_left
+
+# The Content-Type to serve `Metrics.render()` with
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = ['{}="{}"'.format(n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        pairs.append('{}="{}"'.format(*extra))
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+class _Histogram(object):
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Metrics(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace="freshdesk"):
+        """Collects request metrics from one or more `API` instances, and renders them in the
+        Prometheus text exposition format:
+
+            metrics = Metrics()
+            metrics.instrument(api)
+            ...
+            print(metrics.render())
+
+        Arguments:
+          buckets:    the upper bounds in seconds of the request latency histogram buckets
+          namespace:  the prefix of every metric name
+
+        Metrics:
+          <namespace>_requests_total                 requests sent, by method, endpoint and status
+          <namespace>_request_errors_total           requests that raised, by method, endpoint and exception class
+          <namespace>_request_retries_total          requests that were retries of an earlier attempt
+          <namespace>_request_duration_seconds       a histogram of request latency by method and endpoint
+          <namespace>_request_bytes_total            request body bytes sent, by method and endpoint
+          <namespace>_response_bytes_total           response body bytes received, by method and endpoint
+          <namespace>_rate_limit_remaining           the last X-RateLimit-Remaining seen, by domain
+          <namespace>_rate_limit_total               the last X-RateLimit-Total seen, by domain
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._hooks = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}
+            self.errors = {}
+            self.retries = {}
+            self.latency = {}
+            self.bytes_sent = {}
+            self.bytes_received = {}
+            self.rate_limit_remaining = {}
+            self.rate_limit_total = {}
+
+    def instrument(self, api):
+        """Registers a hook on `api` recording its requests. Returns `api`."""
+        domain = api.domain
+
+        def hook(event):
+            self.observe(event, domain)
+
+        self._hooks[id(api)] = hook
+        api.register_hook(hook)
+        return api
+
+    def uninstrument(self, api):
+        """Stops recording the requests of an instrumented `api`."""
+        api.unregister_hook(self._hooks.pop(id(api)))
+
+    def observe(self, event, domain=""):
+        """Records a `freshdesk.v2.hooks.RequestEvent`."""
+        endpoint = (event.method, event.endpoint)
+        with self._lock:
+            key = endpoint + ("" if event.status is None else str(event.status),)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if event.error is not None:
+                key = endpoint + (type(event.error).__name__,)
+                self.errors[key] = self.errors.get(key, 0) + 1
+            if event.retries:
+                self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = _Histogram(self.buckets)
+            i = bisect_left(self.buckets, event.latency)
+            if i < len(self.buckets):
+                histogram.counts[i] += 1
+            histogram.sum += event.latency
+            histogram.count += 1
+
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + event.bytes_sent
+            self.bytes_received[endpoint] = self.bytes_received.get(endpoint, 0) + event.bytes_received
+            if event.rate_limit_remaining is not None:
+                self.rate_limit_remaining[(domain,)] = event.rate_limit_remaining
+            if event.rate_limit_total is not None:
+                self.rate_limit_total[(domain,)] = event.rate_limit_total
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        ns = self.namespace
+
+        def family(name, kind, help, label_names, values):
+            if not values:
+                return
+            lines.append("# HELP {}_{} {}".format(ns, name, help))
+            lines.append("# TYPE {}_{} {}".format(ns, name, kind))
+            for labels, value in sorted(values.items()):
+                lines.append("{}_{}{} {}".format(ns, name, _labels(label_names, labels), _number(value)))
+
+        with self._lock:
+            family("requests_total", "counter", "HTTP requests sent.", ("method", "endpoint", "status"), self.requests)
+            family(
+                "request_errors_total",
+                "counter",
+                "HTTP requests which raised an exception.",
+                ("method", "endpoint", "error"),
+                self.errors,
+            )
+            family(
+                "request_retries_total", "counter", "HTTP requests retrying an earlier attempt.", ("method", "endpoint"), self.retries
+            )
+
+            if self.latency:
+                name = "{}_request_duration_seconds".format(ns)
+                lines.append("# HELP {} HTTP request latency.".format(name))
+                lines.append("# TYPE {} histogram".format(name))
+                for endpoint, histogram in sorted(self.latency.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float("inf"),), histogram.counts + [None]):
+                        cumulative = histogram.count if count is None else cumulative + count
+                        labels = _labels(("method", "endpoint"), endpoint, ("le", _number(float(bound))))
+                        lines.append("{}_bucket{} {}".format(name, labels, cumulative))
+                    labels = _labels(("method", "endpoint"), endpoint)
+                    lines.append("{}_sum{} {}".format(name, labels, _number(histogram.sum)))
+                    lines.append("{}_count{} {}".format(name, labels, histogram.count))
+
+            family("request_bytes_total", "counter", "Request body bytes sent.", ("method", "endpoint"), self.bytes_sent)
+            family(
+                "response_bytes_total", "counter", "Response body bytes received.", ("method", "endpoint"), self.bytes_received
+            )
+            family(
+                "rate_limit_remaining",
+                "gauge",
+                "The last X-RateLimit-Remaining seen.",
+                ("domain",),
+                self.rate_limit_remaining,
+            )
+            family("rate_limit_total", "gauge", "The last X-RateLimit-Total seen.", ("domain",), self.rate_limit_total)
+        return "\n".join(lines) + "\n" if lines else ""
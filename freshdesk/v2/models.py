@@ -1,8 +1,206 @@
+import datetime
+import re
+import threading
+from enum import IntEnum
+
 import dateutil.parser
+from dateutil.tz import tzoffset, tzutc
+
+try:
+    _string_types = (str, unicode)
+except NameError:
+    _string_types = (str,)
+
+_UTC = tzutc()
+_OFFSETS = {0: _UTC}
+
+# Timestamp attributes which don't end in '_at'
+_TIMESTAMP_KEYS = frozenset(["due_by", "fr_due_by"])
+
+# Freshdesk's own timestamp attributes, which are parsed in any format dateutil understands.
+# Other keys ending in '_at', e.g. custom fields, are only converted if they're in the
+# fixed format: a free text field holding "5" mustn't turn into the 5th of this month.
+_BUILTIN_TIMESTAMP_KEYS = _TIMESTAMP_KEYS | frozenset(["created_at", "updated_at"])
+
+
+def _parse_fixed_format(s):
+    """Parses Freshdesk's own 'YYYY-MM-DDTHH:MM:SSZ' and 'YYYY-MM-DDTHH:MM:SS+HH:MM' formats
+    by slicing them, returning None for anything else."""
+    n = len(s)
+    if (n == 20 or n == 25) and s[4] == "-" and s[7] == "-" and s[10] == "T" and s[13] == ":" and s[16] == ":":
+        try:
+            if n == 20 and s[19] == "Z":
+                tz = _UTC
+            elif n == 25 and s[19] in "+-" and s[22] == ":":
+                offset = int(s[20:22]) * 3600 + int(s[23:25]) * 60
+                if s[19] == "-":
+                    offset = -offset
+                tz = _OFFSETS.get(offset)
+                if tz is None:
+                    tz = _OFFSETS.setdefault(offset, tzoffset(None, offset))
+            else:
+                tz = None
+            if tz is not None:
+                return datetime.datetime(
+                    int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=tz
+                )
+        except ValueError:
+            pass
+    return None
+
+
+def parse_timestamp(timestamp_str):
+    """Converts a timestamp string as returned by the API to a native datetime object.
+
+    Freshdesk's own 'YYYY-MM-DDTHH:MM:SSZ' and 'YYYY-MM-DDTHH:MM:SS+HH:MM' formats
+    are sliced directly; anything else falls back to dateutil's parser.
+    """
+    parsed = _parse_fixed_format(timestamp_str)
+    if parsed is None:
+        parsed = dateutil.parser.parse(timestamp_str)
+    return parsed
+
+
+def _convert(key, value):
+    """Converts a value as returned by the API to a native Python object where appropriate."""
+    if value and isinstance(value, _string_types):
+        if key in _BUILTIN_TIMESTAMP_KEYS:
+            try:
+                return parse_timestamp(value)
+            except (ValueError, OverflowError):
+                pass
+        elif key.endswith("_at"):
+            parsed = _parse_fixed_format(value)
+            if parsed is not None:
+                return parsed
+    return value
+
+
+class ModelEnum(IntEnum):
+    """An enumeration of the integer codes the API uses for a field, e.g. a ticket's status."""
+
+    @property
+    def label(self):
+        """The name the model's property returns for this value, e.g. 'open'."""
+        return self.name.lower().replace("_", "-")
+
+
+class TicketPriority(ModelEnum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    URGENT = 4
+
+
+class TicketStatus(ModelEnum):
+    OPEN = 2
+    PENDING = 3
+    RESOLVED = 4
+    CLOSED = 5
+
+
+class TicketSource(ModelEnum):
+    EMAIL = 1
+    PORTAL = 2
+    PHONE = 3
+    FORUM = 4
+    TWITTER = 5
+    FACEBOOK = 6
+    CHAT = 7
+
+
+class CommentSource(ModelEnum):
+    REPLY = 0
+    NOTE = 2
+    TWITTER = 5
+    SURVEY = 6
+    FACEBOOK = 7
+    EMAIL = 8
+    PHONE = 9
+    MOBIHELP = 10
+    E_COMMERCE = 11
+
+
+class ArticleStatus(ModelEnum):
+    DRAFT = 1
+    PUBLISHED = 2
+
+
+_enum_labels = {}
+
+
+def enum_labels(enum):
+    """Returns a mapping of the codes of a `ModelEnum` to their names, built once per enum."""
+    try:
+        return _enum_labels[enum]
+    except KeyError:
+        return _enum_labels.setdefault(enum, dict((e.value, e.label) for e in enum))
+
 
+class Schema(object):
+    """What is known about a model class ahead of time, computed once per class:
+    the attribute each response key is stored under, and the decoders of its
+    enumerated fields, which its properties (e.g. `Ticket.status`) and columnar
+    results' `labels()` both use.
 
-class FreshdeskModel(object):
-    _keys = None
+    Keys clashing with an attribute of the model (or, as always, of `Ticket`)
+    are stored with a leading underscore, e.g. a ticket's status code is kept in
+    `_status` so that the `status` property can return its name.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.enums = {}
+        for klass in reversed(model.__mro__):
+            self.enums.update(vars(klass).get("_enums", {}))
+        self.labels = dict((field, enum_labels(enum)) for field, enum in self.enums.items())
+        self._attributes = {}
+
+    def __repr__(self):
+        return "<Schema for {}>".format(self.model.__name__)
+
+    def attribute(self, key):
+        """Returns the name of the attribute holding the response key `key`."""
+        try:
+            return self._attributes[key]
+        except KeyError:
+            name = "_" + key if hasattr(Ticket, key) or hasattr(self.model, key) else key
+            return self._attributes.setdefault(key, name)
+
+    def is_renamed(self, key):
+        return self.attribute(key) != key
+
+    def decode(self, field, code):
+        """Returns the name of the enumerated value `code` of `field`, e.g. 'open' for a ticket status of 2."""
+        return self.labels[field][code]
+
+
+class _ModelType(type):
+    # Gives every model class its own schema as a plain class attribute, so that the enum
+    # properties reach it in a single lookup
+    def __init__(cls, name, bases, namespace):
+        super(_ModelType, cls).__init__(name, bases, namespace)
+        cls._schema = Schema(cls)
+
+    # Compact records (see `FreshdeskModel.compact()`) don't subclass their model, so that they
+    # have no instance __dict__, but count as instances of it for isinstance() and issubclass()
+    def __instancecheck__(cls, obj):
+        return cls.__subclasscheck__(type(obj)) or type.__instancecheck__(cls, obj)
+
+    def __subclasscheck__(cls, subclass):
+        if type.__subclasscheck__(cls, subclass):
+            return True
+        model = getattr(subclass, "_model", None)
+        return isinstance(model, type) and type.__subclasscheck__(cls, model)
+
+
+# Declared this way so that the metaclass works on both Python 2 and 3
+_ModelBase = _ModelType("_ModelBase", (object,), {})
+
+
+class FreshdeskModel(_ModelBase):
+    _data = None
+    _enums = {}
 
     def __init__(self, **kwargs):
         self._keys = set()
@@ -10,18 +208,149 @@ class FreshdeskModel(object):
         if "custom_field" in kwargs.keys() and len(kwargs["custom_field"]) > 0:
             custom_fields = kwargs.pop("custom_field")
             kwargs.update(custom_fields)
+        attribute = self._schema.attribute
         for k, v in kwargs.items():
-            if hasattr(Ticket, k):
-                k = "_" + k
-            setattr(self, k, v)
+            k = attribute(k)
+            setattr(self, k, _convert(k, v))
             self._keys.add(k)
-        self.created_at = self._to_timestamp(self.created_at)
-        self.updated_at = self._to_timestamp(self.updated_at)
+
+    @classmethod
+    def lazy(cls, data):
+        """Returns a model wrapping the decoded `data` dict as is. Attributes are
+        looked up, renamed and converted the first time they are accessed, so
+        building a model costs next to nothing when only a few are used."""
+        obj = cls.__new__(cls)
+        obj._data = data
+        return obj
+
+    def __getattr__(self, name):
+        # Only called for attributes not set yet, i.e. those of a lazy model not accessed before
+        data = self.__dict__.get("_data")
+        if data is None or name.startswith("__"):
+            raise AttributeError(name)
+
+        schema = self._schema
+        custom_fields = data.get("custom_field") or {}
+        if name == "_keys":
+            keys = [k for k in data if not (k == "custom_field" and custom_fields)] + list(custom_fields)
+            value = set(schema.attribute(k) for k in keys)
+        else:
+            if name.startswith("_") and schema.is_renamed(name[1:]):
+                key = name[1:]
+            elif schema.is_renamed(name):
+                raise AttributeError(name)
+            else:
+                key = name
+
+            if key in custom_fields:
+                value = custom_fields[key]
+            elif key in data and not (key == "custom_field" and custom_fields):
+                value = data[key]
+            else:
+                raise AttributeError(name)
+            value = _convert(name, value)
+
+        self.__dict__[name] = value
+        return value
+
+    @classmethod
+    def compact(cls, data):
+        """Returns a compact record holding the attributes of `data` in __slots__ rather than
+        an instance __dict__. Records of the same model share one slot layout, grown as new
+        keys are seen, and keep the model's methods and properties (e.g. `.status`)."""
+        values = {}
+        attribute = cls._schema.attribute
+        custom_fields = data.get("custom_field")
+        for k, v in data.items():
+            if k == "custom_field" and custom_fields:
+                continue
+            k = attribute(k)
+            values[k] = _convert(k, v)
+        if custom_fields:
+            for k, v in custom_fields.items():
+                k = attribute(k)
+                values[k] = _convert(k, v)
+
+        compact_cls = _compact_classes.get(cls)
+        if compact_cls is None or not compact_cls._slot_set.issuperset(values):
+            if not all(_IDENTIFIER.match(k) for k in values):
+                # Keys which can't be slots (rare custom field names) get a normal model
+                return cls(**data)
+            compact_cls = _compact_class(cls, values)
+
+        obj = compact_cls.__new__(compact_cls)
+        for k, v in values.items():
+            setattr(obj, k, v)
+        return obj
 
     def _to_timestamp(self, timestamp_str):
         """Converts a timestamp string as returned by the API to
         a native datetime object and return it."""
-        return dateutil.parser.parse(timestamp_str)
+        return parse_timestamp(timestamp_str)
+
+
+class CompactModel(object):
+    """Base class of the __slots__ record classes built by `FreshdeskModel.compact()`."""
+
+    __slots__ = ("__weakref__",)
+    _model = None
+    _slot_set = frozenset()
+    _schema = None
+
+    @property
+    def _keys(self):
+        return set(k for k in self.__slots__ if k != "__weakref__" and hasattr(self, k))
+
+    def __getstate__(self):
+        return dict((k, getattr(self, k)) for k in self._keys)
+
+    def __reduce__(self):
+        return (_restore_compact, (self._model, self.__getstate__()))
+
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_compact_classes = {}
+_compact_lock = threading.Lock()
+
+
+def _compact_class(cls, keys):
+    """Returns the compact class for `cls` with slots for at least `keys`, creating one if needed."""
+    with _compact_lock:
+        current = _compact_classes.get(cls)
+        if current is not None and current._slot_set.issuperset(keys):
+            return current
+        slots = set(keys)
+        if current is not None:
+            slots |= current._slot_set
+
+        namespace = {}
+        # Copy the methods and properties of the model, except the FreshdeskModel machinery
+        for klass in reversed(cls.__mro__):
+            if klass in (object, _ModelBase, FreshdeskModel):
+                continue
+            for k, v in vars(klass).items():
+                if k not in ("__dict__", "__weakref__", "__module__", "__doc__", "__qualname__"):
+                    namespace[k] = v
+        namespace.update(
+            __slots__=tuple(sorted(slots - set(namespace))),
+            __module__=cls.__module__,
+            __doc__="Compact record of a {}".format(cls.__name__),
+            _model=cls,
+            _schema=cls._schema,
+            _slot_set=frozenset(slots),
+        )
+        compact_cls = type("Compact" + cls.__name__, (CompactModel,), namespace)
+        _compact_classes[cls] = compact_cls
+        return compact_cls
+
+
+def _restore_compact(cls, state):
+    # The slot layout may not exist yet in this process, so build it from the pickled keys
+    compact_cls = _compact_class(cls, state)
+    obj = compact_cls.__new__(compact_cls)
+    for k, v in state.items():
+        setattr(obj, k, v)
+    return obj
 
 
 class TicketField(FreshdeskModel):
@@ -39,23 +368,25 @@ class Ticket(FreshdeskModel):
     def __repr__(self):
         return "<Ticket '{}' #{}>".format(self.subject, self.id)
 
+    Priority = TicketPriority
+    Status = TicketStatus
+    Source = TicketSource
+    _enums = {"priority": TicketPriority, "status": TicketStatus, "source": TicketSource}
+
     @property
     def priority(self):
-        _p = {1: "low", 2: "medium", 3: "high", 4: "urgent"}
-        return _p[self._priority]
+        return self._schema.labels["priority"][self._priority]
 
     @property
     def status(self):
-        _s = {2: "open", 3: "pending", 4: "resolved", 5: "closed"}
         try:
-            return _s[self._status]
+            return self._schema.labels["status"][self._status]
         except KeyError:
             return "status_{}".format(self._status)
 
     @property
     def source(self):
-        _s = {1: "email", 2: "portal", 3: "phone", 4: "forum", 5: "twitter", 6: "facebook", 7: "chat"}
-        return _s[self._source]
+        return self._schema.labels["source"][self._source]
 
 
 class Group(FreshdeskModel):
@@ -73,20 +404,12 @@ class Comment(FreshdeskModel):
     def __repr__(self):
         return "<Comment for Ticket #{}>".format(self.ticket_id)
 
+    Source = CommentSource
+    _enums = {"source": CommentSource}
+
     @property
     def source(self):
-        _s = {
-            0: "reply",
-            2: "note",
-            5: "twitter",
-            6: "survey",
-            7: "facebook",
-            8: "email",
-            9: "phone",
-            10: "mobihelp",
-            11: "e-commerce",
-        }
-        return _s[self._source]
+        return self._schema.labels["source"][self._source]
 
 
 class Contact(FreshdeskModel):
@@ -160,9 +483,11 @@ class SolutionArticle(FreshdeskModel):
     def __repr__(self):
         return "<SolutionArticle '{}' #{}>".format(self.title, self.id)
 
+    Status = ArticleStatus
+    _enums = {"status": ArticleStatus}
+
     @property
     def status(self):
-        _p = {1: "draft", 2: "published"}
-        return _p[self._status]
+        return self._schema.labels["status"][self._status]
 
 
@@ -0,0 +1,214 @@
+import mimetypes
+import os
+import uuid
+
+from freshdesk.v2.models import _string_types
+
+# Freshdesk rejects requests whose attachments add up to more than 20MB
+MAX_ATTACHMENTS_SIZE = 20 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+def form_fields(data):
+    """Flattens request data into (name, value) pairs for the multipart/form-data encoding.
+
+    List arguments are sent as arrays (`cc_emails[]`), otherwise they're not deserialized
+    correctly, and dicts are unrolled into indexed arrays (`custom_fields[power]`)."""
+    fields = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            for field, item in value.items():
+                fields.append(("{}[{}]".format(key, field), item))
+        elif isinstance(value, (list, tuple)):
+            name = key if key.endswith("[]") else key + "[]"
+            fields.extend((name, item) for item in value)
+        elif value is not None:
+            fields.append((key, value))
+    return fields
+
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, bool):
+        # Booleans are spelled the way they are in JSON
+        value = "true" if value else "false"
+    if not isinstance(value, _string_types):
+        value = str(value)
+    return value.encode("utf-8")
+
+
+def _quote(value):
+    return _encode(value).replace(b'"', b"%22").replace(b"\r", b"%0D").replace(b"\n", b"%0A")
+
+
+class Attachment(object):
+    """A file to upload, read lazily in chunks while the request body is sent.
+
+    Arguments:
+      source:        a path, a file-like object opened in binary mode, or bytes
+      filename:      the name Freshdesk shows for the attachment. Defaults to the base name
+                     of the path (or of the file object's `name`)
+      content_type:  defaults to a guess from the file name
+    """
+
+    def __init__(self, source, filename=None, content_type=None):
+        self._path = self._data = self._file = None
+
+        if isinstance(source, (bytes, bytearray)) and not isinstance(source, str):
+            self._data = bytes(source)
+            self.size = len(source)
+            default_name = "attachment"
+        elif isinstance(source, _string_types):
+            # On Python 2 `bytes` is `str`, so plain strings are always paths there
+            self._path = source
+            self.size = os.path.getsize(source)
+            default_name = os.path.basename(source)
+        elif hasattr(source, "read"):
+            name = getattr(source, "name", None)
+            default_name = os.path.basename(name) if isinstance(name, _string_types) else "attachment"
+            try:
+                self._start = source.tell()
+                source.seek(0, os.SEEK_END)
+                self.size = source.tell() - self._start
+                source.seek(self._start)
+                self._file = source
+            except (AttributeError, IOError, OSError):
+                # Not seekable (e.g. a pipe), so it can only be read once: buffer it. Reading at
+                # most one byte past the limit keeps this bounded.
+                self._data = source.read(MAX_ATTACHMENTS_SIZE + 1)
+                self.size = len(self._data)
+        else:
+            raise AttributeError("Attachments must be paths, file-like objects or bytes, not {!r}".format(source))
+
+        self.filename = filename or default_name
+        self.content_type = content_type or mimetypes.guess_type(self.filename)[0] or "application/octet-stream"
+
+    @classmethod
+    def coerce(cls, attachment):
+        """Accepts an `Attachment`, a path, a file-like object, bytes, or a (filename, source)
+        or (filename, source, content_type) tuple."""
+        if isinstance(attachment, cls):
+            return attachment
+        if isinstance(attachment, tuple):
+            filename, source = attachment[:2]
+            content_type = attachment[2] if len(attachment) > 2 else None
+            return cls(source, filename, content_type)
+        return cls(attachment)
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """Yields the content `chunk_size` bytes at a time. Files opened from a path are
+        closed once read, or when the generator is closed; file objects passed in are
+        rewound but left open."""
+        if self._data is not None:
+            yield self._data
+            return
+
+        if self._path is not None:
+            handle = open(self._path, "rb")
+        else:
+            handle = self._file
+            handle.seek(self._start)
+        try:
+            remaining = self.size
+            while remaining:
+                chunk = handle.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise IOError("{} changed size while it was being uploaded".format(self.filename))
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            if self._path is not None:
+                handle.close()
+
+    def __repr__(self):
+        return "<Attachment {!r} ({} bytes)>".format(self.filename, self.size)
+
+
+class MultipartEncoder(object):
+    """A multipart/form-data request body that is generated while it's sent, so attachments
+    are never held in memory in full.
+
+    Its length is known up front, so `requests` sends a Content-Length header instead of
+    using chunked encoding, and it can be iterated more than once for retried requests.
+
+    Arguments:
+      fields:      (name, value) pairs of form fields, see `form_fields()`
+      files:       (name, attachment) pairs. Attachments are anything `Attachment.coerce()` accepts
+      max_size:    the maximum total size of the attachments. Exceeding it raises an
+                   AttributeError before anything is uploaded
+      chunk_size:  the number of bytes read from an attachment at a time
+    """
+
+    def __init__(self, fields, files, max_size=MAX_ATTACHMENTS_SIZE, chunk_size=CHUNK_SIZE, boundary=None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.fields = [(name, _encode(value)) for name, value in fields]
+        self.files = [(name, Attachment.coerce(attachment)) for name, attachment in files]
+        self._reading = None
+
+        total = sum(attachment.size for _, attachment in self.files)
+        if max_size is not None and total > max_size:
+            raise AttributeError(
+                "Attachments add up to {} bytes, more than the {} bytes Freshdesk accepts".format(total, max_size)
+            )
+
+        self._length = sum(len(self._header(name)) + len(value) + 2 for name, value in self.fields)
+        self._length += sum(len(self._header(name, attachment)) + attachment.size + 2 for name, attachment in self.files)
+        self._length += len(self._footer())
+
+    @property
+    def content_type(self):
+        return "multipart/form-data; boundary={}".format(self.boundary)
+
+    def __len__(self):
+        return self._length
+
+    def _header(self, name, attachment=None):
+        disposition = b'Content-Disposition: form-data; name="' + _quote(name) + b'"'
+        lines = [b"--" + self.boundary.encode("ascii")]
+        if attachment is None:
+            lines.append(disposition)
+        else:
+            lines.append(disposition + b'; filename="' + _quote(attachment.filename) + b'"')
+            lines.append(b"Content-Type: " + _encode(attachment.content_type))
+        return b"\r\n".join(lines) + b"\r\n\r\n"
+
+    def _footer(self):
+        return b"--" + self.boundary.encode("ascii") + b"--\r\n"
+
+    def __iter__(self):
+        for name, value in self.fields:
+            yield self._header(name) + value + b"\r\n"
+
+        for name, attachment in self.files:
+            yield self._header(name, attachment)
+            self._reading = reading = attachment.chunks(self.chunk_size)
+            try:
+                for chunk in reading:
+                    yield chunk
+            finally:
+                reading.close()
+                self._reading = None
+            yield b"\r\n"
+
+        yield self._footer()
+
+    def read_all(self):
+        """Returns the whole body as bytes. Only meant for small payloads and tests."""
+        return b"".join(self)
+
+    def close(self):
+        """Closes the attachment file currently being read, if the upload was interrupted."""
+        if self._reading is not None:
+            self._reading.close()
+            self._reading = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return "<MultipartEncoder {} fields, {} files, {} bytes>".format(len(self.fields), len(self.files), len(self))
@@ -0,0 +1,84 @@
+import threading
+import time
+
+_monotonic = getattr(time, "monotonic", time.time)
+
+
+class RateLimiter(object):
+    """Paces outgoing requests so the per-minute rate-limit budget is used
+    smoothly instead of being exhausted and then waiting on a 429.
+
+    The budget is read from the `X-RateLimit-Total` and `X-RateLimit-Remaining`
+    headers that Freshdesk sends with every response. The remaining budget is
+    spread evenly over what is left of the current window, and a 429 response
+    blocks all callers until its `Retry-After` has passed.
+
+    Arguments:
+      window:   length of the rate-limit window in seconds (Freshdesk uses one minute)
+      reserve:  number of calls to leave unused in each window, e.g. for other clients
+                sharing the same account
+    """
+
+    def __init__(self, window=60, reserve=0, clock=_monotonic, sleep=time.sleep):
+        self.window = window
+        self.reserve = reserve
+        self.total = None
+        self.remaining = None
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._window_start = None
+        self._next_at = 0
+        self._blocked_until = 0
+
+    def _interval(self, now):
+        """Returns the spacing to keep between requests given the last known budget."""
+        if self.remaining is None:
+            return 0
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            # The window has rolled over since we last heard from the server
+            return 0
+        left = self.window - elapsed
+        budget = self.remaining - self.reserve
+        if budget <= 0:
+            return left
+        return left / float(budget)
+
+    def wait(self):
+        """Blocks until the next request may be sent. Returns the number of seconds slept."""
+        with self._lock:
+            now = self._clock()
+            at = max(now, self._next_at, self._blocked_until)
+            self._next_at = at + self._interval(at)
+        delay = at - now
+        if delay > 0:
+            self._sleep(delay)
+        return max(delay, 0)
+
+    def update(self, response):
+        """Records the rate-limit headers (and any 429 back-off) from a response."""
+        headers = response.headers
+        now = self._clock()
+        with self._lock:
+            if response.status_code == 429:
+                try:
+                    retry_after = float(headers.get("Retry-After"))
+                except (TypeError, ValueError):
+                    retry_after = self.window
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            try:
+                total = int(headers["X-RateLimit-Total"])
+                remaining = int(headers["X-RateLimit-Remaining"])
+            except (KeyError, TypeError, ValueError):
+                return
+
+            refilled = self.remaining is None or remaining > self.remaining
+            if self._window_start is None or refilled or now - self._window_start >= self.window:
+                # First response, or the budget has been refilled: a new window has started
+                self._window_start = now
+            self.total = total
+            self.remaining = remaining
+            # Re-space the request already scheduled with the updated budget
+            self._next_at = min(self._next_at, now + self._interval(now))
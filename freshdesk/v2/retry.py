@@ -0,0 +1,54 @@
+import random
+import time
+
+import requests
+
+from freshdesk.v2.errors import FreshdeskRateLimited, FreshdeskServerError
+
+
+class Retry(object):
+    """Retry policy for `freshdesk.v2.api.API`.
+
+    Requests failing with `FreshdeskRateLimited`, `FreshdeskServerError` or a
+    connection error are retried up to `total` times. Rate-limited requests
+    wait for the `Retry-After` given by Freshdesk; everything else backs off
+    exponentially with full jitter, capped at `max_backoff` seconds.
+
+    Only idempotent methods (`methods`, GET and PUT by default) are retried by
+    themselves, as retrying a POST may create a second ticket or note. Pass
+    `retry_post=True` to opt in to retrying POSTs as well.
+    """
+
+    def __init__(
+        self,
+        total=3,
+        backoff_factor=0.5,
+        max_backoff=60,
+        methods=("GET", "PUT"),
+        retry_post=False,
+        sleep=time.sleep,
+        random=random.random,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.methods = frozenset(m.upper() for m in methods)
+        if retry_post:
+            self.methods |= {"POST"}
+        self.sleep = sleep
+        self._random = random
+
+    def is_retryable(self, method, error, attempt):
+        """Returns True if a request that failed with `error` on its `attempt`-th retry should be sent again."""
+        if attempt >= self.total or method.upper() not in self.methods:
+            return False
+        return isinstance(error, (FreshdeskRateLimited, FreshdeskServerError, requests.ConnectionError))
+
+    def backoff(self, error, attempt):
+        """Returns the number of seconds to wait before the next attempt."""
+        if isinstance(error, FreshdeskRateLimited) and error.response is not None:
+            try:
+                return float(error.response.headers["Retry-After"])
+            except (KeyError, TypeError, ValueError):
+                pass
+        return self._random() * min(self.max_backoff, self.backoff_factor * (2 ** attempt))
@@ -0,0 +1,57 @@
+import pickle
+import socket
+
+from mock import patch
+
+from freshdesk.v2.adapters import FreshdeskAdapter, keepalive_socket_options
+from freshdesk.v2.api import API
+from freshdesk.v2.tests.conftest import DOMAIN
+
+
+def test_default_adapter():
+    api = API(DOMAIN, "test_key")
+    adapter = api._session.get_adapter("https://{}/api/v2/tickets".format(DOMAIN))
+    assert isinstance(adapter, FreshdeskAdapter)
+    assert adapter._pool_maxsize == 10
+    assert "socket_options" not in adapter.poolmanager.connection_pool_kw
+
+
+def test_pool_sizes():
+    api = API(DOMAIN, "test_key", pool_connections=4, pool_maxsize=32)
+    adapter = api._session.get_adapter("https://{}/".format(DOMAIN))
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+
+
+def test_tcp_keepalive():
+    api = API(DOMAIN, "test_key", tcp_keepalive=30)
+    adapter = api._session.get_adapter("https://{}/".format(DOMAIN))
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    # Nagle stays disabled as in urllib3's defaults
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+
+
+def test_keepalive_socket_options():
+    options = keepalive_socket_options(45, interval=5, count=3)
+    assert options[0] == (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        assert (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 45) in options
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        assert (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5) in options
+
+
+def test_adapter_pickles():
+    adapter = pickle.loads(pickle.dumps(FreshdeskAdapter(tcp_keepalive=30, pool_maxsize=5)))
+    assert adapter.tcp_keepalive == 30
+    assert "socket_options" in adapter.poolmanager.connection_pool_kw
+
+
+def test_timeout_passed_to_requests():
+    api = API(DOMAIN, "test_key", timeout=(3.05, 27))
+    with patch.object(api._session, "request") as request:
+        request.return_value.status_code = 200
+        request.return_value.content = b"[]"
+        api.roles.list_roles()
+    assert request.call_args[1]["timeout"] == (3.05, 27)
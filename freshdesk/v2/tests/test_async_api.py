@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import pytest
+
+from freshdesk.v2.async_api import AsyncAPI
+from freshdesk.v2.models import Comment, SolutionCategory, Ticket
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN, MockedAPI, PagedAPI
+
+
+class MockedAsyncAPI(AsyncAPI):
+    _api_class = MockedAPI
+
+
+@pytest.fixture
+def async_api():
+    a = MockedAsyncAPI(DOMAIN, API_KEY, max_concurrency=4)
+    yield a
+    a.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_get_ticket(async_api):
+    ticket = run(async_api.tickets.get_ticket(1))
+    assert isinstance(ticket, Ticket)
+    assert ticket.id == 1
+
+
+def test_gather(async_api):
+    async def fetch():
+        return await asyncio.gather(
+            async_api.tickets.get_ticket(1),
+            async_api.comments.list_comments(1),
+            async_api.solutions.categories.get_category(2),
+        )
+
+    ticket, comments, category = run(fetch())
+    assert isinstance(ticket, Ticket)
+    assert all(isinstance(c, Comment) for c in comments)
+    assert isinstance(category, SolutionCategory)
+
+
+def test_errors_propagate(async_api):
+    from requests.exceptions import HTTPError
+
+    with pytest.raises(HTTPError):
+        run(async_api.tickets.get_ticket(2))
+
+
+def test_context_manager():
+    async def use():
+        async with MockedAsyncAPI(DOMAIN, API_KEY) as a:
+            return await a.tickets.get_ticket(1)
+
+    assert run(use()).id == 1
+
+
+def test_domain(async_api):
+    assert async_api.domain == DOMAIN
+
+
+def test_async_api_sizes_pool():
+    a = AsyncAPI(DOMAIN, "test_key", max_concurrency=64)
+    try:
+        adapter = a._api._session.get_adapter("https://{}/".format(DOMAIN))
+        assert adapter._pool_maxsize == 64
+    finally:
+        a.close()
+
+
+class ThreadRecordingAPI(PagedAPI):
+    def __init__(self, *args, **kwargs):
+        super(ThreadRecordingAPI, self).__init__(250, *args, **kwargs)
+        self.threads = set()
+
+    def _get(self, url, params={}):
+        self.threads.add(threading.current_thread())
+        return super(ThreadRecordingAPI, self)._get(url, params)
+
+
+class PagedAsyncAPI(AsyncAPI):
+    _api_class = ThreadRecordingAPI
+
+
+def test_iter_methods_are_async_iterators():
+    async def collect():
+        async with PagedAsyncAPI(DOMAIN, API_KEY) as a:
+            tickets = [t async for t in a.tickets.iter_tickets(filter_name=None)]
+            return a, tickets, threading.current_thread()
+
+    a, tickets, loop_thread = run(collect())
+    assert [t.id for t in tickets] == list(range(1, 251))
+    assert all(isinstance(t, Ticket) for t in tickets)
+    # Every page was fetched off the event loop
+    assert a._api.requested == [1, 2, 3]
+    assert loop_thread not in a._api.threads
+
+
+def test_iter_methods_stop_early():
+    async def first():
+        async with PagedAsyncAPI(DOMAIN, API_KEY) as a:
+            async for ticket in a.tickets.iter_tickets(filter_name=None):
+                return a, ticket
+
+    a, ticket = run(first())
+    assert ticket.id == 1
+    assert a._api.requested == [1]
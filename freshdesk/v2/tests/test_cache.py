@@ -0,0 +1,189 @@
+import json
+
+import pytest
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.cache import LRUCache, ResponseCache
+from freshdesk.v2.models import Agent
+from freshdesk.v2.tests.conftest import DOMAIN
+
+PREFIX = "https://{}/api/v2/".format(DOMAIN)
+TIMESTAMP = "2020-01-01T00:00:00Z"
+
+
+class FakeClock(object):
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def agent(id):
+    return {"id": id, "contact": {"name": "Agent %d" % id}, "created_at": TIMESTAMP, "updated_at": TIMESTAMP}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResponseCache(ttls={"groups": None, "ticket_fields": 10}, clock=clock)
+
+
+@pytest.fixture
+def api(cache):
+    return API(DOMAIN, "test_key", cache=cache)
+
+
+def test_lru_eviction():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert "b" not in lru
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert (lru.hits, lru.misses) == (3, 0)
+
+
+def test_lru_expiry(clock):
+    lru = LRUCache(clock=clock)
+    lru.set("a", 1, ttl=5)
+    clock.now = 4.9
+    assert lru.get("a") == 1
+    clock.now = 5
+    assert lru.get("a") is None
+    assert len(lru) == 0
+    assert lru.misses == 1
+
+
+def test_resource_prefixes(cache):
+    assert cache.resource("agents/1") == "agents"
+    assert cache.resource("agents?page=1&per_page=100") == "agents"
+    assert cache.resource("solutions/categories/2/folders") == "solutions"
+    assert cache.resource("ticket_fields?type=default_requester") == "ticket_fields"
+    assert cache.resource("tickets/1") is None
+    # Disabled by the ttls override
+    assert cache.resource("groups/1") is None
+
+
+@responses.activate
+def test_get_agent_cached(api, cache):
+    responses.add(responses.GET, PREFIX + "agents/1", json=agent(1))
+
+    first = api.agents.get_agent(1)
+    second = api.agents.get_agent(1)
+    assert isinstance(second, Agent)
+    assert first.id == second.id == 1
+    assert len(responses.calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@responses.activate
+def test_ttl_expiry(api, clock):
+    responses.add(responses.GET, PREFIX + "ticket_fields", json=[])
+
+    api.ticket_fields.list_ticket_fields()
+    clock.now = 9
+    api.ticket_fields.list_ticket_fields()
+    assert len(responses.calls) == 1
+    clock.now = 10
+    api.ticket_fields.list_ticket_fields()
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_uncached_resources(api, cache):
+    responses.add(responses.GET, PREFIX + "tickets/1", json={"id": 1, "created_at": TIMESTAMP, "updated_at": TIMESTAMP})
+
+    api.tickets.get_ticket(1)
+    api.tickets.get_ticket(1)
+    assert len(responses.calls) == 2
+    assert len(cache) == 0
+
+
+@responses.activate
+def test_write_invalidates(api):
+    responses.add(responses.GET, PREFIX + "agents/1", json=agent(1))
+    responses.add(responses.PUT, PREFIX + "agents/1", json=agent(1))
+
+    api.agents.get_agent(1)
+    api.agents.update_agent(1, occasional=True)
+    api.agents.get_agent(1)
+    assert [c.request.method for c in responses.calls] == ["GET", "PUT", "GET"]
+
+
+@responses.activate
+def test_response_fetched_during_write_not_cached(api, cache):
+    def concurrent_write(request):
+        # A write to the resource completes while this GET is in flight
+        cache.invalidate_write("agents/1")
+        return 200, {}, json.dumps(agent(1))
+
+    responses.add_callback(responses.GET, PREFIX + "agents/1", callback=concurrent_write)
+
+    api.agents.get_agent(1)
+    api.agents.get_agent(1)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_invalidated_after_write(api, cache):
+    def cache_while_writing(request):
+        # A GET of the old state cached while the write is in flight
+        cache.set("agents/1", None, agent(1))
+        return 200, {}, json.dumps(agent(1))
+
+    responses.add(responses.GET, PREFIX + "agents/1", json=agent(1))
+    responses.add_callback(responses.PUT, PREFIX + "agents/1", callback=cache_while_writing)
+
+    api.agents.update_agent(1, occasional=True)
+    api.agents.get_agent(1)
+    assert [c.request.method for c in responses.calls] == ["PUT", "GET"]
+
+
+@responses.activate
+def test_make_agent_invalidates_agents(api):
+    responses.add(responses.GET, PREFIX + "agents", json=[])
+    responses.add(responses.GET, PREFIX + "agents/7", json=agent(7))
+    responses.add(responses.PUT, PREFIX + "contacts/1/make_agent", json={"id": 1, "agent": {"id": 7}})
+
+    api._get("agents", params={"state": "fulltime"})
+    api.contacts.make_agent(1)
+    api._get("agents", params={"state": "fulltime"})
+    assert [c.request.url.split("?")[0][len(PREFIX):] for c in responses.calls] == [
+        "agents",
+        "contacts/1/make_agent",
+        "agents/7",
+        "agents",
+    ]
+
+
+@responses.activate
+def test_explicit_invalidation(api, cache):
+    responses.add(responses.GET, PREFIX + "agents/1", json=agent(1))
+    responses.add(responses.GET, PREFIX + "roles", json=[])
+
+    api.agents.get_agent(1)
+    api.roles.list_roles()
+    cache.invalidate("agents")
+    api.agents.get_agent(1)
+    api.roles.list_roles()
+    assert len(responses.calls) == 3
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+@responses.activate
+def test_params_part_of_key(api):
+    responses.add(responses.GET, PREFIX + "agents", json=[])
+
+    api._get("agents", params={"state": "fulltime"})
+    api._get("agents", params={"state": "occasional"})
+    api._get("agents", params={"state": "fulltime"})
+    assert len(responses.calls) == 2
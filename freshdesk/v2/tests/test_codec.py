@@ -0,0 +1,110 @@
+import json
+
+import pytest
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.codec import JSONCodec, OrjsonCodec, UjsonCodec, get_codec
+from freshdesk.v2.errors import FreshdeskBadRequest
+from freshdesk.v2.tests.conftest import DOMAIN
+
+PREFIX = "https://{}/api/v2/".format(DOMAIN)
+TICKET = {
+    "id": 1,
+    "subject": "Café <b>ticket</b>",
+    "description": "<div>" + "x" * 1000 + "</div>",
+    "created_at": "2020-01-01T00:00:00Z",
+    "updated_at": "2020-01-01T00:00:00Z",
+}
+
+
+def available_codecs():
+    codecs = ["json"]
+    for name, module in (("orjson", "orjson"), ("ujson", "ujson")):
+        try:
+            __import__(module)
+            codecs.append(name)
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.fixture(params=available_codecs())
+def codec(request):
+    return request.param
+
+
+def test_get_codec():
+    assert isinstance(get_codec(), JSONCodec)
+    assert isinstance(get_codec("json"), JSONCodec)
+    assert get_codec("fast").name in ("orjson", "ujson", "json")
+
+    custom = JSONCodec()
+    assert get_codec(custom) is custom
+
+    with pytest.raises(AttributeError):
+        get_codec("simplejson")
+
+
+@pytest.mark.parametrize("codec_class", [OrjsonCodec, UjsonCodec])
+def test_optional_codecs(codec_class):
+    try:
+        codec = codec_class()
+    except ImportError:
+        pytest.skip("{} is not installed".format(codec_class.name))
+    assert codec.loads(codec.dumps(TICKET)) == TICKET
+
+
+def test_round_trip(codec):
+    c = get_codec(codec)
+    assert c.loads(c.dumps(TICKET)) == TICKET
+    assert c.loads(json.dumps(TICKET).encode("utf-8")) == TICKET
+
+
+@responses.activate
+def test_api_decodes_with_codec(codec):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET)
+    api = API(DOMAIN, "test_key", json_codec=codec)
+    ticket = api.tickets.get_ticket(1)
+    assert ticket.subject == TICKET["subject"]
+    assert ticket.description == TICKET["description"]
+
+
+@responses.activate
+def test_api_encodes_with_codec(codec):
+    responses.add(responses.PUT, PREFIX + "tickets/1", json=TICKET)
+    api = API(DOMAIN, "test_key", json_codec=codec)
+    api.tickets.update_ticket(1, subject=TICKET["subject"])
+    assert json.loads(responses.calls[0].request.body) == {"subject": TICKET["subject"]}
+
+
+@responses.activate
+def test_api_error_bodies(codec):
+    responses.add(
+        responses.GET,
+        PREFIX + "tickets/1",
+        status=400,
+        json={"description": "Validation failed", "errors": [{"field": "status"}]},
+    )
+    responses.add(responses.GET, PREFIX + "tickets/2", status=400, body="not json")
+    api = API(DOMAIN, "test_key", json_codec=codec)
+    with pytest.raises(FreshdeskBadRequest) as e:
+        api.tickets.get_ticket(1)
+    assert "Validation failed" in str(e.value)
+    with pytest.raises(FreshdeskBadRequest):
+        api.tickets.get_ticket(2)
+
+
+def test_custom_codec():
+    class Recording(JSONCodec):
+        def __init__(self):
+            self.encoded = []
+
+        def dumps(self, obj):
+            self.encoded.append(obj)
+            return super(Recording, self).dumps(obj)
+
+    codec = Recording()
+    api = API(DOMAIN, "test_key", json_codec=codec)
+    assert api._dumps({"a": 1}) == '{"a": 1}'
+    assert codec.encoded == [{"a": 1}]
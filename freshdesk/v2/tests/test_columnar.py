@@ -0,0 +1,180 @@
+import csv
+import datetime
+import io
+import math
+from array import array
+
+import pytest
+from dateutil.tz import tzutc
+
+from freshdesk.v2.columnar import Column, ColumnarResult, column_kind
+from freshdesk.v2.models import Ticket
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN, PagedAPI
+
+RECORDS = [
+    {
+        "id": 1,
+        "subject": "First",
+        "status": 2,
+        "priority": 1,
+        "requester_id": 10,
+        "tags": ["a", "b"],
+        "created_at": "2020-01-01T00:00:00Z",
+        "due_by": "2020-01-03T00:00:00Z",
+        "custom_fields": {"cf_power": 11},
+    },
+    {
+        "id": 2,
+        "subject": "Second",
+        "status": 4,
+        "priority": 3,
+        "requester_id": None,
+        "tags": [],
+        "created_at": "2020-01-02T00:00:00+10:00",
+        "due_by": None,
+        "custom_fields": {"cf_power": 3, "cf_team": "blue"},
+    },
+]
+
+
+@pytest.fixture
+def result():
+    return ColumnarResult.from_pages([RECORDS[:1], RECORDS[1:]])
+
+
+def test_column_kinds():
+    assert column_kind("id") == "int"
+    assert column_kind("requester_id") == "int"
+    assert column_kind("status") == "enum"
+    assert column_kind("updated_at") == "timestamp"
+    assert column_kind("fr_due_by") == "timestamp"
+    assert column_kind("subject") == "object"
+
+
+def test_typed_columns(result):
+    assert len(result) == 2
+    assert result["id"] == array("q", [1, 2])
+    assert result["status"] == array("h", [2, 4])
+    assert result["priority"] == array("h", [1, 3])
+    assert result["created_at"] == array("d", [1577836800.0, 1577887200.0])
+    assert result["subject"] == ["First", "Second"]
+
+
+def test_nulls(result):
+    # Null ids stay in the integer array, marked in the validity mask
+    assert result["requester_id"] == array("q", [10, 0])
+    assert result.valid("requester_id") == array("b", [1, 0])
+    assert result.to_dict()["requester_id"] == [10, None]
+    assert result.valid("id") is None
+    assert math.isnan(result["due_by"][1])
+
+
+def test_null_enum_codes():
+    result = ColumnarResult.from_pages([[{"id": 1, "status": None}, {"id": 2, "status": 5}]], model=Ticket)
+    assert result["status"] == array("h", [0, 5])
+    assert result.labels("status") == [None, "closed"]
+
+
+def test_column_nulls_then_fallback():
+    column = Column("group_id")
+    column.append(None)
+    column.append(4)
+    assert column.valid == array("b", [0, 1])
+    column.append("not an id")
+    assert column.values == [None, 4, "not an id"]
+    assert column.valid is None
+
+
+def test_custom_fields_flattened(result):
+    assert "custom_fields" not in result
+    assert result["cf_power"] == [11, 3]
+    # Columns first seen part way through are padded
+    assert result["cf_team"] == [None, "blue"]
+    assert result.names[-1] == "cf_team"
+
+
+def test_selected_fields():
+    result = ColumnarResult.from_pages([RECORDS], fields=["id", "status", "cf_team"])
+    assert result.names == ["id", "status", "cf_team"]
+    assert result["cf_team"] == [None, "blue"]
+
+
+def test_to_dict(result):
+    d = result.to_dict()
+    assert d["id"] == [1, 2]
+    assert d["created_at"] == [
+        datetime.datetime(2020, 1, 1, tzinfo=tzutc()),
+        datetime.datetime(2020, 1, 1, 14, tzinfo=tzutc()),
+    ]
+    assert d["due_by"][1] is None
+    assert d["tags"] == [["a", "b"], []]
+
+
+def test_to_csv(result):
+    out = io.StringIO()
+    result.to_csv(out, fields=["id", "status", "tags", "due_by", "requester_id"])
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows == [
+        ["id", "status", "tags", "due_by", "requester_id"],
+        ["1", "2", '["a", "b"]', "2020-01-03T00:00:00+00:00", "10"],
+        ["2", "4", "[]", "", ""],
+    ]
+
+
+def test_enum_labels():
+    result = ColumnarResult.from_pages([RECORDS + [dict(RECORDS[0], status=9)]], model=Ticket)
+    assert result.labels("status") == ["open", "resolved", 9]
+    assert result.labels("priority") == ["low", "high", "low"]
+    with pytest.raises(KeyError):
+        result.labels("subject")
+    with pytest.raises(KeyError):
+        ColumnarResult.from_pages([RECORDS]).labels("status")
+
+
+def test_padded_columns_use_the_mask():
+    result = ColumnarResult.from_pages([[{"id": 1}, {"id": 2, "company_id": 7}]])
+    assert result["company_id"] == array("q", [0, 7])
+    assert result.to_dict()["company_id"] == [None, 7]
+
+
+def test_column_falls_back_to_list():
+    column = Column("id")
+    column.append(1)
+    column.append("not an id")
+    assert column.values == [1, "not an id"]
+
+
+def test_timestamps_parsed_after_fallback():
+    column = Column("due_by")
+    for value in ["2020-01-01T00:00:00Z", "TBD", "2020-01-02T00:00:00Z", None]:
+        column.append(value)
+    assert column.to_list() == [
+        datetime.datetime(2020, 1, 1, tzinfo=tzutc()),
+        "TBD",
+        datetime.datetime(2020, 1, 2, tzinfo=tzutc()),
+        None,
+    ]
+
+
+def test_custom_timestamp_columns_parse_only_the_fixed_format():
+    column = Column("cf_seen_at")
+    column.append("2020-01-01T00:00:00Z")
+    column.append("5")
+    assert column.to_list() == [datetime.datetime(2020, 1, 1, tzinfo=tzutc()), "5"]
+
+
+def test_list_tickets_columnar():
+    api = PagedAPI(250, DOMAIN, API_KEY)
+    result = api.tickets.list_tickets_columnar(filter_name=None)
+    assert len(result) == 250
+    assert result["id"] == array("q", range(1, 251))
+    assert result["updated_at"][0] == 1577836800.0
+    assert result.model is Ticket
+
+
+def test_list_contacts_and_companies_columnar():
+    api = PagedAPI(120, DOMAIN, API_KEY)
+    contacts = api.contacts.list_contacts_columnar(fields=["id", "name"])
+    assert contacts.names == ["id", "name"]
+    assert contacts["name"][119] == "Record 120"
+    assert len(api.companies.list_companies_columnar()) == 120
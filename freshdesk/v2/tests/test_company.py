@@ -2,6 +2,7 @@ import datetime
 import pytest
 
 from freshdesk.v2.models import Company
+from freshdesk.v2.tests.conftest import attributes
 
 
 @pytest.fixture
@@ -37,7 +38,7 @@ def test_list_companies(api, company):
     assert isinstance(companies, list)
     assert isinstance(companies[0], Company)
     assert len(companies) == 2
-    assert companies[0].__dict__ == company.__dict__
+    assert attributes(companies[0]) == attributes(company)
 
 
 def test_filter_query(api):
@@ -0,0 +1,74 @@
+import pytest
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.models import SolutionArticle, Ticket
+from freshdesk.v2.tests.conftest import DOMAIN
+
+PREFIX = "https://{}/api/v2/".format(DOMAIN)
+TICKET = {"id": 1, "subject": "Cached", "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def api():
+    return API(DOMAIN, "test_key", conditional_get=True)
+
+
+@responses.activate
+def test_etag_revalidation(api):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET, headers={"ETag": 'W/"abc"'})
+    responses.add(responses.GET, PREFIX + "tickets/1", status=304)
+
+    assert api.tickets.get_ticket(1).subject == "Cached"
+    assert "If-None-Match" not in responses.calls[0].request.headers
+
+    ticket = api.tickets.get_ticket(1)
+    assert isinstance(ticket, Ticket)
+    assert ticket.subject == "Cached"
+    assert responses.calls[1].request.headers["If-None-Match"] == 'W/"abc"'
+
+
+@responses.activate
+def test_last_modified_revalidation(api):
+    last_modified = "Wed, 01 Jan 2020 00:00:00 GMT"
+    article = {"id": 4, "title": "Article", "status": 2, "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"}
+    responses.add(responses.GET, PREFIX + "solutions/articles/4", json=article, headers={"Last-Modified": last_modified})
+    responses.add(responses.GET, PREFIX + "solutions/articles/4", status=304)
+
+    api.solutions.articles.get_article(4)
+    article = api.solutions.articles.get_article(4)
+    assert isinstance(article, SolutionArticle)
+    assert article.status == "published"
+    assert responses.calls[1].request.headers["If-Modified-Since"] == last_modified
+
+
+@responses.activate
+def test_changed_response_replaces_validators(api):
+    updated = dict(TICKET, subject="Updated")
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET, headers={"ETag": '"v1"'})
+    responses.add(responses.GET, PREFIX + "tickets/1", json=updated, headers={"ETag": '"v2"'})
+    responses.add(responses.GET, PREFIX + "tickets/1", status=304)
+
+    api.tickets.get_ticket(1)
+    assert api.tickets.get_ticket(1).subject == "Updated"
+    assert api.tickets.get_ticket(1).subject == "Updated"
+    assert responses.calls[2].request.headers["If-None-Match"] == '"v2"'
+
+
+@responses.activate
+def test_no_validators_without_headers(api):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET)
+
+    api.tickets.get_ticket(1)
+    api.tickets.get_ticket(1)
+    assert "If-None-Match" not in responses.calls[1].request.headers
+
+
+@responses.activate
+def test_disabled_by_default():
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET, headers={"ETag": '"v1"'})
+
+    api = API(DOMAIN, "test_key")
+    api.tickets.get_ticket(1)
+    api.tickets.get_ticket(1)
+    assert "If-None-Match" not in responses.calls[1].request.headers
@@ -3,6 +3,7 @@ import datetime
 import pytest
 
 from freshdesk.v2.models import Contact, Agent
+from freshdesk.v2.tests.conftest import attributes
 
 
 @pytest.fixture
@@ -23,7 +24,7 @@ def test_list_contact(api, contact):
     assert isinstance(contacts, list)
     assert isinstance(contacts[0], Contact)
     assert len(contacts) == 2
-    assert contacts[0].__dict__ == contact.__dict__
+    assert attributes(contacts[0]) == attributes(contact)
 
 
 def test_create_contact(api):
@@ -0,0 +1,220 @@
+import time
+
+import pytest
+import requests
+
+from freshdesk.v2.errors import FreshdeskBadRequest, FreshdeskNotFound, FreshdeskRateLimited, FreshdeskServerError
+from freshdesk.v2.fakeserver import FakeFreshdesk, SearchQuery
+from freshdesk.v2.models import Company, Contact, Ticket
+from freshdesk.v2.retry import Retry
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def server(clock):
+    server = FakeFreshdesk(seed=42, clock=clock).start()
+    server.populate(tickets=250, contacts=40, companies=5, agents=2, groups=2, conversations=3)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def api(server):
+    return server.client()
+
+
+def get(server, path, **kwargs):
+    return requests.get(server.url + "api/v2/" + path, auth=("key", "X"), **kwargs)
+
+
+def test_listing_pages(server, api):
+    tickets = api.tickets.list_tickets(filter_name=None)
+    assert len(tickets) == 250
+    assert all(isinstance(t, Ticket) for t in tickets)
+    assert len(set(t.id for t in tickets)) == 250
+    assert ("GET", "/api/v2/tickets?page=3&per_page=100") in server.requests
+
+    response = get(server, "tickets?page=1&per_page=100")
+    assert response.headers["Link"] == '</api/v2/tickets?page=2&per_page=100>; rel="next"'
+    assert "Link" not in get(server, "tickets?page=3&per_page=100").headers
+
+
+def test_resources(api):
+    assert len(api.contacts.list_contacts()) == 40
+    assert isinstance(api.contacts.get_contact(1), Contact)
+    assert isinstance(api.companies.get_company(1), Company)
+    assert len(api.agents.list_agents()) == 2
+    assert len(api.groups.list_groups()) == 2
+    assert len(api.comments.list_comments(1)) == 3
+    with pytest.raises(FreshdeskNotFound):
+        api.tickets.get_ticket(1000)
+
+
+def test_create_update_delete(api):
+    ticket = api.tickets.create_ticket("Created", email="someone@example.com", priority=3)
+    assert ticket.priority == "high"
+    assert api.tickets.get_ticket(ticket.id).subject == "Created"
+    assert api.tickets.update_ticket(ticket.id, status=5).status == "closed"
+
+    api.tickets.delete_ticket(ticket.id)
+    assert ticket.id in [t.id for t in api.tickets.list_tickets(filter_name="deleted")]
+
+    with pytest.raises(FreshdeskBadRequest):
+        api.tickets.create_ticket("No requester")
+
+    note = api.comments.create_note(ticket.id, "Noted")
+    assert note.private is True
+    assert note.ticket_id == ticket.id
+
+
+def test_create_with_attachments_and_custom_fields(api):
+    ticket = api.tickets.create_ticket(
+        "Attached",
+        email="someone@example.com",
+        custom_fields={"cf_team": "billing"},
+        attachments=[("report.txt", b"x" * 10)],
+    )
+    assert ticket.custom_fields == {"cf_team": "billing"}
+    assert ticket.attachments == [{"name": "report.txt", "size": 10}]
+
+
+def test_client_uses_freshdesk_adapter(server):
+    from freshdesk.v2.adapters import FreshdeskAdapter
+
+    api = server.client(pool_maxsize=50, tcp_keepalive=30)
+    adapter = api._session.get_adapter(server.url)
+    assert isinstance(adapter, FreshdeskAdapter)
+    assert adapter._pool_maxsize == 50
+    assert adapter.tcp_keepalive == 30
+
+
+def test_create_with_attachments(api, tmp_path):
+    attachment = tmp_path / "report.txt"
+    attachment.write_bytes(b"x" * 1000)
+    ticket = api.tickets.create_ticket("Attached", email="someone@example.com", attachments=[str(attachment)])
+    assert ticket.attachments == [{"name": "report.txt", "size": 1000}]
+
+
+def test_search(api):
+    open_tickets = api.tickets.filter_tickets("status:2")
+    assert open_tickets
+    assert all(t._status == 2 for t in open_tickets)
+    assert len(api.contacts.filter_contacts("time_zone:'Brisbane'")) == 40
+
+
+def test_search_pagination_cap(server, api):
+    server.populate(tickets=400)
+    response = get(server, 'search/tickets?page=11&query="status:2"')
+    assert response.status_code == 400
+    response = get(server, 'search/tickets?page=1&query="priority:>2"')
+    assert response.json()["total"] > 300
+    assert len(response.json()["results"]) == 30
+
+    # Bounds are inclusive, as in Freshdesk
+    tickets = api.tickets.filter_tickets("priority:>2", exhaustive=True)
+    assert len(tickets) == len([t for t in server.store["tickets"].values() if t["priority"] >= 2])
+
+
+def test_rate_limit(clock):
+    with FakeFreshdesk(rate_limit=3, clock=clock) as server:
+        server.add("groups", name="Support")
+        api = server.client()
+        events = []
+        api.register_hook(events.append)
+        for _ in range(3):
+            api.groups.get_group(1)
+        assert [e.rate_limit_remaining for e in events] == [2, 1, 0]
+        assert events[0].rate_limit_total == 3
+
+        with pytest.raises(FreshdeskRateLimited):
+            api.groups.get_group(1)
+        assert events[-1].retry_after == 60
+
+        clock.now = 61
+        assert api.groups.get_group(1).name == "Support"
+
+
+def test_rate_limit_retried(clock):
+    slept = []
+    with FakeFreshdesk(rate_limit=1, clock=clock) as server:
+        server.add("groups", name="Support")
+
+        def sleep(seconds):
+            slept.append(seconds)
+            clock.now += seconds
+
+        api = server.client(retry=Retry(sleep=sleep))
+        api.groups.get_group(1)
+        api.groups.get_group(1)
+        assert slept == [60]
+
+
+def test_error_injection(server, api):
+    server.fail_next(502)
+    with pytest.raises(FreshdeskServerError):
+        api.groups.get_group(1)
+    assert api.groups.get_group(1).id == 1
+
+    server.error_rate = 1
+    with pytest.raises(FreshdeskServerError):
+        api.groups.get_group(1)
+
+
+def test_latency(server, api):
+    server.latency = 0.05
+    start = time.time()
+    api.groups.get_group(1)
+    assert time.time() - start >= 0.05
+
+
+def test_requires_credentials(server):
+    assert requests.get(server.url + "api/v2/tickets").status_code == 401
+
+
+def test_solutions(api):
+    category = api.solutions.categories.create_category(name="Guides")
+    folder = api.solutions.folders.create_folder(category.id, name="Setup", visibility=1)
+    article = api.solutions.articles.create_article(folder.id, title="Getting started", description="...", status=2)
+    assert api.solutions.folders.list_from_category(category.id)[0].name == "Setup"
+    assert api.solutions.articles.list_from_folder(folder.id)[0].status == "published"
+    assert api.solutions.articles.search("started")[0].id == article.id
+
+    api.solutions.articles.create_article_translation(article.id, "fr", title="Commencer", description="...", status=2)
+    assert api.solutions.articles.get_article_translated(article.id, "fr").title == "Commencer"
+
+
+@pytest.mark.parametrize(
+    "query,record,expected",
+    [
+        ("status:2", {"status": 2}, True),
+        ("status:2 OR status:3", {"status": 3}, True),
+        ("(status:2 OR status:3) AND priority:4", {"status": 3, "priority": 1}, False),
+        ("created_at:>'2020-01-01' AND created_at:<'2020-01-31'", {"created_at": "2020-01-31T23:00:00Z"}, True),
+        ("created_at:>'2020-01-01'", {"created_at": "2019-12-31T23:00:00Z"}, False),
+        ("tag:'vip'", {"tags": ["vip"]}, True),
+        ("cf_team:'blue'", {"custom_fields": {"cf_team": "blue"}}, True),
+        ("spam:false", {"spam": False}, True),
+        ("", {}, True),
+    ],
+)
+def test_search_query(query, record, expected):
+    assert SearchQuery(query)(record) is expected
+
+
+def test_invalid_search_query():
+    with pytest.raises(ValueError):
+        SearchQuery("(status:2")
+    with pytest.raises(ValueError):
+        SearchQuery("status")
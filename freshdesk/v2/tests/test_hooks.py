@@ -0,0 +1,131 @@
+import json
+
+import mock
+import pytest
+import requests
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskNotFound, FreshdeskServerError
+from freshdesk.v2.hooks import RequestEvent, endpoint_template
+from freshdesk.v2.retry import Retry
+from freshdesk.v2.tests.conftest import DOMAIN
+
+PREFIX = "https://{}/api/v2/".format(DOMAIN)
+TICKET = {"id": 1, "subject": "Hooked", "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"}
+RATE_LIMIT = {"X-RateLimit-Total": "200", "X-RateLimit-Remaining": "150", "X-RateLimit-Used-CurrentRequest": "1"}
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def api(events):
+    api = API(DOMAIN, "test_key", retry=Retry(total=2, sleep=lambda s: None))
+    api.register_hook(events.append)
+    return api
+
+
+@pytest.mark.parametrize(
+    "url,endpoint",
+    [
+        ("tickets/1", "tickets/{id}"),
+        ("tickets/1?include=stats,requester", "tickets/{id}"),
+        ("tickets/12/conversations?page=2&per_page=100", "tickets/{id}/conversations"),
+        ("tickets?filter=new_and_my_open&page=1&per_page=100", "tickets"),
+        ('search/tickets?page=1&query="status:2"', "search/tickets"),
+        ("solutions/categories/2/folders/fr", "solutions/categories/{id}/folders/fr"),
+        ("jobs/e5f7b2a1", "jobs/{id}"),
+    ],
+)
+def test_endpoint_template(url, endpoint):
+    assert endpoint_template(url) == endpoint
+
+
+@responses.activate
+def test_event_per_request(api, events):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET, headers=RATE_LIMIT)
+    api.tickets.get_ticket(1)
+
+    event, = events
+    assert isinstance(event, RequestEvent)
+    assert (event.method, event.url, event.endpoint, event.status) == ("GET", "tickets/1", "tickets/{id}", 200)
+    assert event.latency >= 0
+    assert event.bytes_sent == 0
+    assert event.bytes_received == len(json.dumps(TICKET))
+    assert event.retries == 0
+    assert (event.rate_limit_total, event.rate_limit_remaining, event.rate_limit_used) == (200, 150, 1)
+    assert event.retry_after is None
+    assert event.error is None
+    assert event.response.status_code == 200
+
+
+@responses.activate
+def test_bytes_sent(api, events):
+    responses.add(responses.PUT, PREFIX + "tickets/1", json=TICKET)
+    api.tickets.update_ticket(1, subject="Hooked")
+    assert events[0].method == "PUT"
+    assert events[0].bytes_sent == len(api._dumps({"subject": "Hooked"}))
+
+
+@responses.activate
+def test_event_per_retry(api, events):
+    responses.add(responses.GET, PREFIX + "tickets/1", status=503)
+    responses.add(responses.GET, PREFIX + "tickets/1", status=503)
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET)
+    api.tickets.get_ticket(1)
+
+    assert [e.retries for e in events] == [0, 1, 2]
+    assert [e.status for e in events] == [503, 503, 200]
+    assert isinstance(events[0].error, FreshdeskServerError)
+    assert events[2].error is None
+
+
+@responses.activate
+def test_errors(api, events):
+    responses.add(responses.GET, PREFIX + "tickets/2", status=404, json={"message": "Not found"})
+    responses.add(responses.GET, PREFIX + "tickets/3", body=requests.ConnectionError("refused"))
+    with pytest.raises(FreshdeskNotFound):
+        api.tickets.get_ticket(2)
+    with pytest.raises(requests.ConnectionError):
+        api.tickets.get_ticket(3)
+
+    assert events[0].status == 404
+    assert isinstance(events[0].error, FreshdeskNotFound)
+    # No response for a connection error, and it is retried
+    assert [e.status for e in events[1:]] == [None, None, None]
+    assert isinstance(events[-1].error, requests.ConnectionError)
+
+
+@responses.activate
+def test_rate_limited_event(api, events):
+    api._retry = None
+    responses.add(responses.GET, PREFIX + "tickets/1", status=429, headers=dict(RATE_LIMIT, **{"Retry-After": "30"}))
+    with pytest.raises(Exception):
+        api.tickets.get_ticket(1)
+    assert events[0].retry_after == 30
+
+
+@responses.activate
+def test_unregister_hook(api, events):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET)
+    other = mock.Mock()
+    api.register_hook(other)
+    api.unregister_hook(events.append)
+    api.tickets.get_ticket(1)
+    assert events == []
+    assert other.call_count == 1
+    with pytest.raises(ValueError):
+        api.unregister_hook(events.append)
+
+
+def test_no_timing_without_hooks():
+    api = API(DOMAIN, "test_key")
+    response = mock.Mock(status_code=200, content=b"{}", headers={})
+    with mock.patch.object(api._session, "request", return_value=response), mock.patch(
+        "freshdesk.v2.api._monotonic"
+    ) as clock:
+        api._get("tickets/1")
+    assert not clock.called
@@ -0,0 +1,153 @@
+import gc
+import threading
+
+import pytest
+
+from freshdesk.v2.identity import IdentityMap
+from freshdesk.v2.models import Company, Contact, Ticket
+
+
+def build(cls, data):
+    return cls(**data)
+
+
+def test_same_entity_resolves_to_one_instance():
+    identity_map = IdentityMap()
+    first = identity_map.resolve(Contact, {"id": 1, "name": "Rachel", "updated_at": "2020-07-24T15:35:21Z"}, build)
+    second = identity_map.resolve(Contact, {"id": 1, "name": "Rachel", "updated_at": "2020-07-24T15:35:21Z"}, build)
+    assert first is second
+    assert identity_map.get(Contact, 1) is first
+    assert len(identity_map) == 1
+
+
+def test_different_types_are_separate():
+    identity_map = IdentityMap()
+    contact = identity_map.resolve(Contact, {"id": 1, "name": "Rachel"}, build)
+    company = identity_map.resolve(Company, {"id": 1, "name": "ACME"}, build)
+    assert contact is not company
+    assert len(identity_map) == 2
+
+
+def test_refreshed_when_newer():
+    identity_map = IdentityMap()
+    contact = identity_map.resolve(Contact, {"id": 1, "name": "Rachel", "updated_at": "2020-07-24T15:35:21Z"}, build)
+    newer = identity_map.resolve(Contact, {"id": 1, "name": "Ross", "updated_at": "2020-07-25T15:35:21Z"}, build)
+    assert newer is contact
+    assert contact.name == "Ross"
+
+
+def test_not_refreshed_when_older():
+    identity_map = IdentityMap()
+    contact = identity_map.resolve(Contact, {"id": 1, "name": "Rachel", "updated_at": "2020-07-24T15:35:21Z"}, build)
+    identity_map.resolve(Contact, {"id": 1, "name": "Ross", "updated_at": "2020-07-23T15:35:21Z"}, build)
+    identity_map.resolve(Contact, {"id": 1, "name": "Monica"}, build)
+    assert contact.name == "Rachel"
+
+
+def test_records_without_id_are_not_mapped():
+    identity_map = IdentityMap()
+    first = identity_map.resolve(Contact, {"name": "Rachel"}, build)
+    second = identity_map.resolve(Contact, {"name": "Rachel"}, build)
+    assert first is not second
+    assert len(identity_map) == 0
+
+
+def test_nested_records_stay_dicts():
+    identity_map = IdentityMap()
+    requester = {"id": 1, "name": "Rachel"}
+    ticket = identity_map.resolve(Ticket, {"id": 1, "requester": requester}, build)
+    assert ticket.requester == requester
+    assert ticket.requester["name"] == "Rachel"
+    assert identity_map.get(Contact, 1) is None
+
+
+def test_entities_are_held_weakly():
+    identity_map = IdentityMap()
+    identity_map.resolve(Contact, {"id": 1, "name": "Rachel"}, build)
+    gc.collect()
+    assert identity_map.get(Contact, 1) is None
+
+
+@pytest.mark.parametrize("mode", ["eager", "lazy", "compact"])
+def test_refresh_in_every_model_mode(api, mode):
+    api.model_mode = mode
+    api.identity_map = IdentityMap()
+    contact = api._model(Contact, {"id": 1, "name": "Rachel", "updated_at": "2020-07-24T15:35:21Z"})
+    refreshed = api._model(Contact, {"id": 1, "name": "Ross", "updated_at": "2020-07-25T15:35:21Z"})
+    assert refreshed.name == "Ross"
+    assert api.identity_map.get(Contact, 1) is refreshed
+    if mode != "compact":
+        # Compact records can't be updated in place, so only the map holds the fresh one
+        assert refreshed is contact
+
+
+def test_identity_scope(api):
+    assert api.identity_map is None
+    with api.identity_scope() as identity_map:
+        contact = api.contacts.get_contact(1)
+        assert api.contacts.get_contact(1) is contact
+        ticket = api._model(Ticket, {"id": 1, "requester": {"id": 1, "name": contact.name}})
+        assert ticket.requester == {"id": 1, "name": contact.name}
+        assert api.related(ticket, "requester") is contact
+        assert identity_map.get(Contact, 1) is contact
+    assert api.identity_map is None
+    assert api.contacts.get_contact(1) is not contact
+
+
+def test_disabled_by_default(api):
+    assert api.contacts.get_contact(1) is not api.contacts.get_contact(1)
+
+
+def test_related(api):
+    ticket = api._model(
+        Ticket, {"id": 1, "requester": {"id": 1, "name": "Rachel"}, "company": {"id": 5, "name": "ACME"}}
+    )
+    requester = api.related(ticket, "requester")
+    assert isinstance(requester, Contact)
+    assert requester.name == "Rachel"
+    assert api.related(ticket, "company").name == "ACME"
+    # Not shared without an identity map
+    assert api.related(ticket, "requester") is not requester
+    assert api.related(api._model(Ticket, {"id": 2}), "requester") is None
+    with pytest.raises(AttributeError):
+        api.related(requester, "company")
+
+
+def test_related_shared_in_scope(api):
+    with api.identity_scope():
+        tickets = [
+            api._model(Ticket, {"id": i, "requester": {"id": 1, "name": "Rachel"}, "company": {"id": 5, "name": "ACME"}})
+            for i in (1, 2)
+        ]
+        requester = api.related(tickets[0], "requester")
+        assert api.related(tickets[1], "requester") is requester
+
+        # The partial requester embedded in the ticket is replaced by the full record
+        contact = api._model(
+            Contact, {"id": 1, "name": "Rachel", "email": "rachel@example.com", "updated_at": "2020-07-24T15:35:21Z"}
+        )
+        assert api.related(tickets[0], "requester") is contact
+        assert contact.email == "rachel@example.com"
+
+
+def test_identity_scope_is_per_thread(api):
+    seen = []
+
+    def other_thread():
+        seen.append(api.contacts.get_contact(1) is api.contacts.get_contact(1))
+
+    with api.identity_scope():
+        assert api.contacts.get_contact(1) is api.contacts.get_contact(1)
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+    assert seen == [False]
+
+
+def test_identity_scope_with_existing_map(api):
+    identity_map = IdentityMap()
+    with api.identity_scope(identity_map) as scoped:
+        assert scoped is identity_map
+        contact = api.contacts.get_contact(1)
+    with api.identity_scope(identity_map):
+        assert api.contacts.get_contact(1) is contact
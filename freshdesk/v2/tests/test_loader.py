@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskNotFound
+from freshdesk.v2.loader import Loader, Ref
+from freshdesk.v2.models import Company, Contact
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN
+
+
+class RecordAPI(API):
+    """Serves a record for any id but 404, counting requests and how many ran at once."""
+
+    def __init__(self, *args, **kwargs):
+        super(RecordAPI, self).__init__(*args, **kwargs)
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._counter_lock = threading.Lock()
+
+    def _get(self, url, params=None):
+        with self._counter_lock:
+            self.requested.append(url)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            resource, id = url.split("/")
+            if id == "404":
+                raise FreshdeskNotFound("Not found")
+            return {"id": int(id), "name": "{} {}".format(resource, id)}
+        finally:
+            with self._counter_lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def api():
+    return RecordAPI(DOMAIN, API_KEY)
+
+
+def test_load_deduplicates(api):
+    with Loader(api) as loader:
+        refs = [loader.load("contacts", i) for i in (1, 2, 1, 3, 2)]
+        refs.append(loader.load("companies", 1))
+        assert loader.pending == 4
+        assert not refs[0].done()
+    assert sorted(api.requested) == ["companies/1", "contacts/1", "contacts/2", "contacts/3"]
+    assert all(ref.done() for ref in refs)
+    assert isinstance(refs[0].result(), Contact)
+    assert refs[0].result() is refs[2].result()
+    assert isinstance(refs[-1].result(), Company)
+    assert refs[-1].name == "companies 1"
+
+
+def test_batch_fetched_concurrently(api):
+    loader = Loader(api, concurrency=4)
+    refs = loader.load_many("contacts", range(1, 13))
+    assert refs[5].name == "contacts 6"
+    assert len(api.requested) == 12
+    assert 1 < api.max_in_flight <= 4
+    assert all(ref.done() for ref in refs)
+
+
+def test_fetched_records_are_remembered(api):
+    loader = Loader(api)
+    assert loader.load("contacts", 1).result().id == 1
+    loader.load("contacts", 1).result()
+    assert api.requested == ["contacts/1"]
+
+    loader.clear()
+    loader.load("contacts", 1).result()
+    assert api.requested == ["contacts/1", "contacts/1"]
+
+
+def test_errors_raised_from_result(api):
+    with Loader(api) as loader:
+        missing = loader.load("contacts", 404)
+        found = loader.load("contacts", 1)
+    assert found.name == "contacts 1"
+    with pytest.raises(FreshdeskNotFound):
+        missing.result()
+
+
+def test_unknown_resource(api):
+    with pytest.raises(AttributeError):
+        Loader(api).load("widgets", 1)
+
+
+def test_ref_repr(api):
+    loader = Loader(api)
+    ref = loader.load("groups", 2)
+    assert isinstance(ref, Ref)
+    assert repr(ref) == "<Ref groups #2 (pending)>"
+    ref.result()
+    assert repr(ref) == "<Ref groups #2>"
+
+
+def test_not_dispatched_on_error(api):
+    with pytest.raises(ValueError):
+        with Loader(api) as loader:
+            loader.load("contacts", 1)
+            raise ValueError()
+    assert api.requested == []
+
+
+def test_dispatch_uses_the_callers_identity_scope(api):
+    with api.identity_scope() as identity_map:
+        contact = api.contacts.get_contact(1)
+        with Loader(api, concurrency=4) as loader:
+            refs = loader.load_many("contacts", [1, 2, 3])
+        assert refs[0].result() is contact
+        assert identity_map.get(Contact, 2) is refs[1].result()
@@ -0,0 +1,96 @@
+import pytest
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskNotFound, FreshdeskRateLimited
+from freshdesk.v2.hooks import RequestEvent
+from freshdesk.v2.metrics import CONTENT_TYPE, Metrics
+from freshdesk.v2.tests.conftest import DOMAIN
+
+PREFIX = "https://{}/api/v2/".format(DOMAIN)
+TICKET = {"id": 1, "subject": "Measured", "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def metrics():
+    return Metrics(buckets=(0.1, 1.0))
+
+
+@pytest.fixture
+def api(metrics):
+    return metrics.instrument(API(DOMAIN, "test_key"))
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+@responses.activate
+def test_counts_requests_and_errors(api, metrics):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET, headers={"X-RateLimit-Remaining": "150", "X-RateLimit-Total": "200"})
+    responses.add(responses.GET, PREFIX + "tickets/2", status=404, json={"message": "Not found"})
+    responses.add(responses.GET, PREFIX + "tickets/3", status=429, headers={"X-RateLimit-Remaining": "0", "Retry-After": "10"})
+
+    api.tickets.get_ticket(1)
+    api.tickets.get_ticket(1)
+    with pytest.raises(FreshdeskNotFound):
+        api.tickets.get_ticket(2)
+    with pytest.raises(FreshdeskRateLimited):
+        api.tickets.get_ticket(3)
+
+    values = samples(metrics.render())
+    assert values['freshdesk_requests_total{method="GET",endpoint="tickets/{id}",status="200"}'] == "2"
+    assert values['freshdesk_requests_total{method="GET",endpoint="tickets/{id}",status="404"}'] == "1"
+    assert values['freshdesk_request_errors_total{method="GET",endpoint="tickets/{id}",error="FreshdeskNotFound"}'] == "1"
+    assert values['freshdesk_request_errors_total{method="GET",endpoint="tickets/{id}",error="FreshdeskRateLimited"}'] == "1"
+    # The last value seen
+    assert values['freshdesk_rate_limit_remaining{domain="%s"}' % DOMAIN] == "0"
+    assert values['freshdesk_rate_limit_total{domain="%s"}' % DOMAIN] == "200"
+    assert values['freshdesk_request_duration_seconds_count{method="GET",endpoint="tickets/{id}"}'] == "4"
+    assert values['freshdesk_request_duration_seconds_bucket{method="GET",endpoint="tickets/{id}",le="+Inf"}'] == "4"
+
+
+def test_histogram_buckets(metrics):
+    for latency in (0.05, 0.1, 0.5, 2.0):
+        metrics.observe(RequestEvent("GET", "contacts?page=1", None, latency))
+    values = samples(metrics.render())
+    bucket = 'freshdesk_request_duration_seconds_bucket{method="GET",endpoint="contacts",le="%s"}'
+    assert values[bucket % "0.1"] == "2"
+    assert values[bucket % "1.0"] == "3"
+    assert values[bucket % "+Inf"] == "4"
+    assert float(values['freshdesk_request_duration_seconds_sum{method="GET",endpoint="contacts"}']) == pytest.approx(2.65)
+    # No response: no status
+    assert values['freshdesk_requests_total{method="GET",endpoint="contacts",status=""}'] == "4"
+
+
+def test_render_format(metrics):
+    assert metrics.render() == ""
+    metrics.observe(RequestEvent("GET", 'search/tickets?query="a"', None, 0.2))
+    text = metrics.render()
+    assert text.endswith("\n")
+    assert "# TYPE freshdesk_requests_total counter" in text
+    assert "# TYPE freshdesk_request_duration_seconds histogram" in text
+    assert "# TYPE freshdesk_rate_limit_remaining gauge" not in text
+    assert CONTENT_TYPE.startswith("text/plain")
+
+
+def test_label_escaping(metrics):
+    metrics.observe(RequestEvent("GET", 'odd"path\\', None, 0.2))
+    assert 'endpoint="odd\\"path\\\\"' in metrics.render()
+
+
+@responses.activate
+def test_uninstrument_and_reset(api, metrics):
+    responses.add(responses.GET, PREFIX + "tickets/1", json=TICKET)
+    api.tickets.get_ticket(1)
+    metrics.uninstrument(api)
+    api.tickets.get_ticket(1)
+    assert samples(metrics.render())['freshdesk_requests_total{method="GET",endpoint="tickets/{id}",status="200"}'] == "1"
+    metrics.reset()
+    assert metrics.render() == ""
+
+
+def test_namespace():
+    metrics = Metrics(namespace="helpdesk")
+    metrics.observe(RequestEvent("GET", "groups", None, 0.2))
+    assert "helpdesk_requests_total" in metrics.render()
@@ -0,0 +1,234 @@
+import datetime
+
+import dateutil.parser
+import pytest
+from dateutil.tz import tzoffset, tzutc
+
+from freshdesk.v2.models import Comment, Contact, FreshdeskModel, SolutionArticle, Ticket, parse_timestamp
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2020-07-24T15:35:21Z",
+        "2014-12-31T12:27:09+10:00",
+        "2014-12-31T12:27:09-05:30",
+        "2014-12-31T12:27:09+00:00",
+        # Fallback formats
+        "2020-07-24T15:35:21.123Z",
+        "2020-07-24",
+        "2020-07-24 15:35:21",
+    ],
+)
+def test_parse_timestamp_matches_dateutil(timestamp):
+    expected = dateutil.parser.parse(timestamp)
+    parsed = parse_timestamp(timestamp)
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+def test_parse_timestamp_timezones():
+    assert parse_timestamp("2020-07-24T15:35:21Z").tzinfo == tzutc()
+    assert parse_timestamp("2014-12-31T12:27:09+10:00").tzinfo == tzoffset(None, 36000)
+    assert parse_timestamp("2014-12-31T12:27:09-05:30").utcoffset() == datetime.timedelta(hours=-5, minutes=-30)
+
+
+def test_parse_timestamp_invalid():
+    with pytest.raises(ValueError):
+        parse_timestamp("2020-13-24T15:35:21Z")
+
+
+def test_timestamp_fields_converted():
+    ticket = Ticket(
+        id=1,
+        created_at="2020-07-24T15:35:21Z",
+        updated_at="2020-07-24T15:35:21Z",
+        due_by="2020-07-27T15:35:21Z",
+        fr_due_by="2020-07-25T15:35:21Z",
+        last_login_at=None,
+        custom_field={"cf_seen_at": "never"},
+    )
+    assert ticket.due_by == datetime.datetime(2020, 7, 27, 15, 35, 21, tzinfo=tzutc())
+    assert ticket.fr_due_by == datetime.datetime(2020, 7, 25, 15, 35, 21, tzinfo=tzutc())
+    assert ticket.last_login_at is None
+    # Not a timestamp, so left as is
+    assert ticket.cf_seen_at == "never"
+
+
+def test_only_fixed_format_timestamps_converted_for_other_fields():
+    data = {
+        "id": 1,
+        "created_at": "2020-07-24 15:35",
+        "first_responded_at": "2020-07-25T15:35:21Z",
+        "custom_field": {"cf_seen_at": "5", "cf_checked_at": "2020-07-26T15:35:21+10:00"},
+    }
+    for ticket in (Ticket(**data), Ticket.lazy(data), Ticket.compact(data)):
+        assert ticket.created_at == datetime.datetime(2020, 7, 24, 15, 35)
+        assert ticket.first_responded_at == datetime.datetime(2020, 7, 25, 15, 35, 21, tzinfo=tzutc())
+        assert ticket.cf_seen_at == "5"
+        assert ticket.cf_checked_at == datetime.datetime(2020, 7, 26, 15, 35, 21, tzinfo=tzoffset(None, 36000))
+
+
+def test_missing_timestamps():
+    contact = Contact(id=1, name="Rachel")
+    assert contact.name == "Rachel"
+
+
+@pytest.fixture
+def ticket_data():
+    return {
+        "id": 1,
+        "subject": "Lazy",
+        "status": 2,
+        "priority": 4,
+        "source": 3,
+        "created_at": "2020-07-24T15:35:21Z",
+        "updated_at": "2020-07-24T15:35:21Z",
+        "custom_field": {"cf_power": 11},
+    }
+
+
+def test_lazy_model(ticket_data):
+    ticket = Ticket.lazy(ticket_data)
+    assert ticket.__dict__ == {"_data": ticket_data}
+
+    assert ticket.subject == "Lazy"
+    assert (ticket.status, ticket.priority, ticket.source) == ("open", "urgent", "phone")
+    assert ticket.created_at == datetime.datetime(2020, 7, 24, 15, 35, 21, tzinfo=tzutc())
+    assert ticket.cf_power == 11
+    assert repr(ticket) == "<Ticket 'Lazy' #1>"
+    # Resolved attributes are kept on the instance
+    assert "_status" in ticket.__dict__
+
+
+def test_lazy_matches_eager(ticket_data):
+    eager = Ticket(**ticket_data)
+    lazy = Ticket.lazy(ticket_data)
+    assert lazy._keys == eager._keys
+    for key in eager._keys:
+        assert getattr(lazy, key) == getattr(eager, key)
+
+
+def test_lazy_missing_attributes(ticket_data):
+    ticket = Ticket.lazy(ticket_data)
+    with pytest.raises(AttributeError):
+        ticket.description
+    with pytest.raises(AttributeError):
+        ticket.custom_field
+
+    contact = Contact.lazy({"id": 1, "name": "Rachel", "status": 2})
+    assert contact._status == 2
+    with pytest.raises(AttributeError):
+        # Renamed, as on eager models
+        contact.__getattr__("status")
+
+
+def test_compact_model(ticket_data):
+    ticket = Ticket.compact(ticket_data)
+    assert not hasattr(ticket, "__dict__")
+    assert ticket._model is Ticket
+    assert ticket.subject == "Lazy"
+    assert (ticket.status, ticket.priority, ticket.source) == ("open", "urgent", "phone")
+    assert ticket.created_at == datetime.datetime(2020, 7, 24, 15, 35, 21, tzinfo=tzutc())
+    assert ticket.cf_power == 11
+    assert str(ticket) == "Lazy"
+    assert repr(ticket) == "<Ticket 'Lazy' #1>"
+    assert ticket._keys == Ticket(**ticket_data)._keys
+
+
+def test_compact_layout_shared_and_grown(ticket_data):
+    first = Ticket.compact(ticket_data)
+    second = Ticket.compact(dict(ticket_data, id=2))
+    assert type(first) is type(second)
+
+    third = Ticket.compact(dict(ticket_data, id=3, spam=True))
+    assert third.spam is True
+    assert type(Ticket.compact(ticket_data)) is type(third)
+    # Keys missing from a record behave like missing attributes
+    with pytest.raises(AttributeError):
+        Ticket.compact(ticket_data).spam
+    assert "spam" not in Ticket.compact(ticket_data)._keys
+
+
+def test_compact_layouts_per_model():
+    contact = Contact.compact({"id": 1, "name": "Rachel"})
+    assert contact._model is Contact
+    assert repr(contact) == "<Contact 'Rachel'>"
+    assert not hasattr(contact, "priority")
+
+
+def test_compact_pickle(ticket_data):
+    import pickle
+
+    ticket = pickle.loads(pickle.dumps(Ticket.compact(ticket_data)))
+    assert ticket.status == "open"
+    assert ticket.created_at.year == 2020
+
+
+def test_compact_pickle_in_another_process(ticket_data, tmp_path):
+    import pickle
+    import subprocess
+    import sys
+
+    path = tmp_path / "ticket.pickle"
+    path.write_bytes(pickle.dumps(Ticket.compact(ticket_data), protocol=2))
+    # A fresh interpreter has no compact Ticket class yet
+    script = "import pickle, sys; t = pickle.load(open(sys.argv[1], 'rb')); print('%s %s %s' % (t.id, t.status, t.subject))"
+    output = subprocess.check_output([sys.executable, "-c", script, str(path)])
+    assert output.decode().split() == ["1", "open", "Lazy"]
+
+
+def test_compact_isinstance(ticket_data):
+    ticket = Ticket.compact(ticket_data)
+    assert isinstance(ticket, Ticket)
+    assert isinstance(ticket, FreshdeskModel)
+    assert not isinstance(ticket, Contact)
+    assert issubclass(type(ticket), Ticket)
+    assert isinstance(Ticket(**ticket_data), Ticket)
+
+
+def test_compact_invalid_slot_names(ticket_data):
+    ticket = Ticket.compact(dict(ticket_data, **{"cf_odd-name": 1}))
+    assert isinstance(ticket, Ticket)
+    assert getattr(ticket, "cf_odd-name") == 1
+
+
+def test_typed_enums():
+    assert Ticket.Status.OPEN == 2
+    assert Ticket.Status(5).label == "closed"
+    assert Ticket.Priority.URGENT.label == "urgent"
+    assert Ticket.Source(7) is Ticket.Source.CHAT
+    assert Comment.Source.E_COMMERCE.label == "e-commerce"
+    assert SolutionArticle.Status.PUBLISHED == 2
+
+    ticket = Ticket(id=1, subject="Typed", status=Ticket.Status.PENDING, priority=2, source=3)
+    assert ticket.status == "pending"
+    assert ticket._status == Ticket.Status.PENDING
+    assert Ticket.Status(ticket._priority) is Ticket.Status.OPEN
+
+
+def test_schema_decoders():
+    assert Ticket._schema.model is Ticket
+    assert Ticket._schema.labels["status"] == {2: "open", 3: "pending", 4: "resolved", 5: "closed"}
+    assert Comment._schema.decode("source", 0) == "reply"
+    assert SolutionArticle._schema.enums == {"status": SolutionArticle.Status}
+    assert Contact._schema.enums == {}
+    # Compact records share the schema of their model
+    assert Ticket.compact({"id": 1})._schema is Ticket._schema
+
+
+def test_schema_renamed_fields():
+    schema = Contact._schema
+    # Keys clashing with Ticket's attributes are renamed on every model, as they always were
+    assert schema.attribute("status") == "_status"
+    assert schema.attribute("priority") == "_priority"
+    assert schema.attribute("name") == "name"
+    assert SolutionArticle._schema.attribute("status") == "_status"
+    assert SolutionArticle(id=1, status=2).status == "published"
+    assert Comment(id=1, source=11).source == "e-commerce"
+
+
+def test_unknown_enum_codes():
+    assert Ticket(id=1, status=7).status == "status_7"
+    with pytest.raises(KeyError):
+        Ticket(id=1, priority=9).priority
@@ -0,0 +1,200 @@
+import io
+
+import pytest
+from mock import patch
+
+from freshdesk.v2.fakeserver import FakeFreshdesk, _parse_multipart
+from freshdesk.v2.models import Comment, Ticket
+from freshdesk.v2.multipart import MAX_ATTACHMENTS_SIZE, Attachment, MultipartEncoder, form_fields
+
+
+class Unseekable(object):
+    """A stream that can only be read once, like a pipe."""
+
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+@pytest.fixture
+def opened():
+    """Records every file the encoder opens."""
+    handles = []
+
+    def tracking_open(*args):
+        handle = io.open(*args)
+        handles.append(handle)
+        return handle
+
+    with patch("freshdesk.v2.multipart.open", tracking_open, create=True):
+        yield handles
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.csv"
+    path.write_bytes(b"id,subject\n" * 1000)
+    return str(path)
+
+
+def parse(encoder):
+    body = b"".join(encoder)
+    assert len(body) == len(encoder)
+    message = _parse_multipart(body, encoder.content_type)
+    return [
+        (part.get_param("name", header="content-disposition"), part.get_filename(), part.get_payload(decode=True))
+        for part in message.get_payload()
+    ]
+
+
+def test_form_fields():
+    fields = form_fields(
+        {"subject": "Hi", "cc_emails": ["a@example.com", "b@example.com"], "custom_fields": {"power": 11}, "tags[]": ["x"], "type": None}
+    )
+    assert sorted(fields) == [
+        ("cc_emails[]", "a@example.com"),
+        ("cc_emails[]", "b@example.com"),
+        ("custom_fields[power]", 11),
+        ("subject", "Hi"),
+        ("tags[]", "x"),
+    ]
+
+
+def test_encodes_fields_and_attachments(report):
+    stream = io.BytesIO(b"log line\n" * 10)
+    stream.name = "/var/log/app.log"
+    encoder = MultipartEncoder(
+        [("subject", u"Caf\xe9"), ("priority", 1)],
+        [("attachments[]", report), ("attachments[]", stream), ("attachments[]", ("notes.txt", b"some notes"))],
+    )
+
+    assert parse(encoder) == [
+        ("subject", None, u"Caf\xe9".encode("utf-8")),
+        ("priority", None, b"1"),
+        ("attachments[]", "report.csv", b"id,subject\n" * 1000),
+        ("attachments[]", "app.log", b"log line\n" * 10),
+        ("attachments[]", "notes.txt", b"some notes"),
+    ]
+    assert [attachment.content_type for _, attachment in encoder.files] == [
+        "text/csv",
+        "application/octet-stream",
+        "text/plain",
+    ]
+
+
+def test_reads_attachments_in_chunks(report):
+    encoder = MultipartEncoder([], [("attachments[]", report)], chunk_size=1024)
+    chunks = list(encoder)
+    # The part header, the file in chunks, the part's closing CRLF and the final boundary
+    assert [len(chunk) for chunk in chunks[1:-2]] == [1024] * 10 + [760]
+
+
+def test_closes_files_it_opens(opened, report):
+    encoder = MultipartEncoder([], [("attachments[]", report), ("attachments[]", report)])
+    assert opened == []
+
+    parse(encoder)
+    assert len(opened) == 2
+    assert all(handle.closed for handle in opened)
+
+
+def test_close_interrupted_upload(opened, report):
+    encoder = MultipartEncoder([], [("attachments[]", report)], chunk_size=1024)
+    chunks = iter(encoder)
+    next(chunks)
+    next(chunks)
+    assert not opened[0].closed
+
+    encoder.close()
+    assert opened[0].closed
+
+
+def test_leaves_file_objects_open_and_rewinds_them():
+    stream = io.BytesIO(b"header" + b"x" * 100)
+    stream.read(6)
+    encoder = MultipartEncoder([], [("attachments[]", stream)])
+
+    first = parse(encoder)
+    assert first == [("attachments[]", "attachment", b"x" * 100)]
+    # Bodies can be sent again, e.g. when a request is retried
+    assert parse(encoder) == first
+    assert not stream.closed
+
+
+def test_buffers_unseekable_streams():
+    encoder = MultipartEncoder([], [("attachments[]", ("data.bin", Unseekable(b"\x00\x01" * 50)))])
+    assert parse(encoder) == [("attachments[]", "data.bin", b"\x00\x01" * 50)]
+    assert parse(encoder) == [("attachments[]", "data.bin", b"\x00\x01" * 50)]
+
+
+def test_rejects_attachments_over_the_size_limit(opened, tmp_path):
+    large = tmp_path / "large.bin"
+    with large.open("wb") as f:
+        f.truncate(MAX_ATTACHMENTS_SIZE)
+
+    with pytest.raises(AttributeError):
+        MultipartEncoder([], [("attachments[]", str(large)), ("attachments[]", b"x")])
+    assert opened == []
+
+    MultipartEncoder([], [("attachments[]", str(large))])
+    with pytest.raises(AttributeError):
+        MultipartEncoder([], [("attachments[]", b"x" * 11)], max_size=10)
+
+
+def test_rejects_unknown_sources():
+    with pytest.raises(AttributeError):
+        Attachment(42)
+
+
+def test_detects_files_that_change_size(report):
+    encoder = MultipartEncoder([], [("attachments[]", report)])
+    with open(report, "wb") as f:
+        f.write(b"short")
+    with pytest.raises(IOError):
+        list(encoder)
+
+
+@pytest.fixture
+def server():
+    with FakeFreshdesk(seed=1) as server:
+        server.populate(tickets=1, contacts=1)
+        yield server
+
+
+def test_create_ticket_streams_attachments(server, report, opened):
+    api = server.client()
+    ticket = api.tickets.create_ticket(
+        "Attached",
+        email="someone@example.com",
+        tags=["a", "b"],
+        attachments=[report, ("inline.txt", b"inline"), io.BytesIO(b"12345")],
+    )
+
+    assert isinstance(ticket, Ticket)
+    assert ticket.tags == ["a", "b"]
+    assert ticket.attachments == [
+        {"name": "report.csv", "size": 11000},
+        {"name": "inline.txt", "size": 6},
+        {"name": "attachment", "size": 5},
+    ]
+    assert all(handle.closed for handle in opened)
+
+
+def test_create_reply_and_note_with_attachments(server, report):
+    api = server.client()
+    reply = api.comments.create_reply(1, "See attached", attachments=[report])
+    note = api.comments.create_note(1, "Internal", private=True, attachments=[("log.txt", b"trace")])
+
+    assert isinstance(reply, Comment)
+    assert reply.attachments == [{"name": "report.csv", "size": 11000}]
+    assert note.attachments == [{"name": "log.txt", "size": 5}]
+    assert note.private == "true"
+
+
+def test_size_limit_is_checked_before_uploading(server):
+    api = server.client()
+    with pytest.raises(AttributeError):
+        api.comments.create_note(1, "Too big", attachments=[b"x" * (MAX_ATTACHMENTS_SIZE + 1)])
+    assert server.requests == []
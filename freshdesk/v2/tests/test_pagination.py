@@ -0,0 +1,86 @@
+import pytest
+
+from freshdesk.v2.models import Agent, Comment, Company, Contact, Ticket, TimeEntry
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN, PagedAPI
+
+
+@pytest.mark.parametrize("page_concurrency", [1, 4])
+@pytest.mark.parametrize("total", [0, 10, 25, 30, 95])
+def test_all_pages_in_order(page_concurrency, total):
+    api = PagedAPI(total, DOMAIN, API_KEY, page_concurrency=page_concurrency)
+    contacts = api.contacts.list_contacts(per_page=10)
+    assert [c.id for c in contacts] == list(range(1, total + 1))
+
+
+def test_concurrent_windows():
+    api = PagedAPI(95, DOMAIN, API_KEY, page_concurrency=4)
+    api.contacts.list_contacts(per_page=10)
+    # Pages 1-12 are fetched in windows of four; 10 is the first short page
+    assert sorted(api.requested) == list(range(1, 13))
+
+
+def test_sequential_stops_at_short_page():
+    api = PagedAPI(95, DOMAIN, API_KEY)
+    api.contacts.list_contacts(per_page=10)
+    assert api.requested == list(range(1, 11))
+
+
+def test_single_page_not_concurrent():
+    api = PagedAPI(95, DOMAIN, API_KEY, page_concurrency=4)
+    contacts = api.contacts.list_contacts(page=3, per_page=10)
+    assert [c.id for c in contacts] == list(range(21, 31))
+    assert api.requested == [3]
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "model"),
+    [
+        ("tickets.list_tickets", (), Ticket),
+        ("comments.list_comments", (1,), Comment),
+        ("companies.list_companies", (), Company),
+        ("agents.list_agents", (), Agent),
+        ("time_entries.list_time_entries", (), TimeEntry),
+    ],
+)
+def test_list_methods(method, args, model):
+    api = PagedAPI(250, DOMAIN, API_KEY, page_concurrency=3)
+    resource, name = method.split(".")
+    records = getattr(getattr(api, resource), name)(*args)
+    assert len(records) == 250
+    assert all(isinstance(r, model) for r in records)
+    assert [r.id for r in records] == list(range(1, 251))
+
+
+def test_iter_is_lazy():
+    api = PagedAPI(95, DOMAIN, API_KEY)
+    contacts = api.contacts.iter_contacts(per_page=10)
+    assert api.requested == []
+
+    first = next(contacts)
+    assert isinstance(first, Contact)
+    assert first.id == 1
+    assert api.requested == [1]
+
+    assert [c.id for c in contacts] == list(range(2, 96))
+    assert api.requested == list(range(1, 11))
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "model"),
+    [
+        ("tickets.iter_tickets", (), Ticket),
+        ("comments.iter_comments", (1,), Comment),
+        ("contacts.iter_contacts", (), Contact),
+        ("companies.iter_companies", (), Company),
+        ("agents.iter_agents", (), Agent),
+        ("time_entries.iter_time_entries", (), TimeEntry),
+    ],
+)
+def test_iter_methods(method, args, model):
+    api = PagedAPI(150, DOMAIN, API_KEY)
+    resource, name = method.split(".")
+    records = getattr(getattr(api, resource), name)(*args)
+    assert not isinstance(records, list)
+    records = list(records)
+    assert [r.id for r in records] == list(range(1, 151))
+    assert all(isinstance(r, model) for r in records)
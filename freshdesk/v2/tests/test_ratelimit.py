@@ -0,0 +1,115 @@
+import pytest
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskRateLimited
+from freshdesk.v2.ratelimit import RateLimiter
+from freshdesk.v2.tests.conftest import DOMAIN
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse(object):
+    def __init__(self, status_code=200, **headers):
+        self.status_code = status_code
+        self.headers = dict((k.replace("_", "-"), str(v)) for k, v in headers.items())
+
+
+def ratelimit_response(total, remaining, status_code=200, **headers):
+    headers["X_RateLimit_Total"] = total
+    headers["X_RateLimit_Remaining"] = remaining
+    return FakeResponse(status_code, **headers)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(clock=clock, sleep=clock.sleep)
+
+
+def test_no_pacing_without_headers(limiter, clock):
+    for _ in range(5):
+        assert limiter.wait() == 0
+    assert clock.slept == []
+
+
+def test_spreads_remaining_budget(limiter, clock):
+    limiter.update(ratelimit_response(100, 30))
+    assert limiter.total == 100
+    assert limiter.remaining == 30
+
+    limiter.wait()
+    limiter.wait()
+    # 60 seconds left in the window shared between 30 remaining calls
+    assert clock.slept == [pytest.approx(2.0)]
+
+
+def test_reserve(clock):
+    limiter = RateLimiter(reserve=10, clock=clock, sleep=clock.sleep)
+    limiter.update(ratelimit_response(100, 10))
+    limiter.wait()
+    limiter.wait()
+    # Budget exhausted: wait for the window to roll over
+    assert clock.slept == [pytest.approx(60.0)]
+
+
+def test_window_refill_resets_pacing(limiter, clock):
+    limiter.update(ratelimit_response(100, 1))
+    clock.now += 61
+    limiter.update(ratelimit_response(100, 99))
+    limiter.wait()
+    limiter.wait()
+    assert clock.slept == [pytest.approx(60.0 / 99)]
+
+
+def test_retry_after_blocks(limiter, clock):
+    limiter.update(ratelimit_response(100, 0, status_code=429, Retry_After=17))
+    assert limiter.wait() == pytest.approx(17.0)
+    assert clock.slept == [pytest.approx(17.0)]
+
+
+@responses.activate
+def test_api_reads_headers(clock):
+    responses.add(
+        responses.GET,
+        "https://{}/api/v2/tickets/1".format(DOMAIN),
+        json={"id": 1, "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"},
+        headers={"X-RateLimit-Total": "200", "X-RateLimit-Remaining": "150"},
+    )
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    api = API(DOMAIN, "test_key", rate_limiter=limiter)
+    api.tickets.get_ticket(1)
+    assert limiter.total == 200
+    assert limiter.remaining == 150
+
+
+@responses.activate
+def test_api_429_blocks_next_request(clock):
+    responses.add(
+        responses.GET,
+        "https://{}/api/v2/tickets/1".format(DOMAIN),
+        status=429,
+        headers={"Retry-After": "30"},
+    )
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    api = API(DOMAIN, "test_key", rate_limiter=limiter)
+    with pytest.raises(FreshdeskRateLimited):
+        api.tickets.get_ticket(1)
+    with pytest.raises(FreshdeskRateLimited):
+        api.tickets.get_ticket(1)
+    assert clock.slept == [pytest.approx(30.0)]
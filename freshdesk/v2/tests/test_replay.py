@@ -0,0 +1,120 @@
+import gzip
+import json
+
+import pytest
+
+from freshdesk.v2.adapters import CassetteMiss, RecordingAdapter, ReplayAdapter, load_cassette
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskNotFound
+from freshdesk.v2.fakeserver import FakeFreshdesk
+from freshdesk.v2.models import Ticket
+from freshdesk.v2.retry import Retry
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = str(tmp_path / "crawl.jsonl.gz")
+    with FakeFreshdesk(seed=3, latency=0.01) as server:
+        server.populate(tickets=150, contacts=10)
+        api = RecordingAdapter(path).mount(server.client())
+        api.tickets.list_tickets(filter_name=None)
+        api.contacts.get_contact(1)
+        api.tickets.update_ticket(1, subject="First")
+        api.tickets.update_ticket(1, subject="Again")
+        api.tickets.get_ticket(1)
+        with pytest.raises(FreshdeskNotFound):
+            api.contacts.get_contact(999)
+        api._session.close()
+    return path
+
+
+def replay_api(path, **kwargs):
+    return ReplayAdapter(path, **kwargs).mount(API(DOMAIN, API_KEY))
+
+
+def test_cassette_contents(cassette):
+    with gzip.open(cassette, "rb") as f:
+        header = json.loads(f.readline().decode("utf-8"))
+    assert header["cassette"] == 1
+
+    interactions = load_cassette(cassette)
+    assert [i["url"] for i in interactions[:2]] == [
+        "tickets?page=1&per_page=100",
+        "tickets?page=2&per_page=100",
+    ]
+    assert interactions[0]["latency"] >= 0.01
+    assert interactions[0]["headers"]["X-RateLimit-Total"] == "5000"
+    assert "Authorization" not in json.dumps(interactions)
+    assert "fake_api_key" not in json.dumps(interactions)
+
+
+def test_replay(cassette):
+    api = replay_api(cassette, speed=None)
+    tickets = api.tickets.list_tickets(filter_name=None)
+    assert len(tickets) == 150
+    assert isinstance(tickets[0], Ticket)
+    assert api.contacts.get_contact(1).name == "Contact 1"
+    with pytest.raises(FreshdeskNotFound):
+        api.contacts.get_contact(999)
+
+
+def test_replay_matches_bodies_in_order(cassette):
+    api = replay_api(cassette, speed=None)
+    assert api.tickets.update_ticket(1, subject="Again").subject == "Again"
+    assert api.tickets.update_ticket(1, subject="First").subject == "First"
+    # Repeats of the last response once the recorded ones run out
+    assert api.tickets.get_ticket(1).subject == "Again"
+    assert api.tickets.get_ticket(1).subject == "Again"
+
+
+def test_replay_miss(cassette):
+    api = replay_api(cassette, speed=None)
+    with pytest.raises(CassetteMiss):
+        api.groups.list_groups()
+    with pytest.raises(CassetteMiss):
+        api.tickets.update_ticket(1, subject="Never sent")
+
+
+def test_replay_miss_not_retried(cassette):
+    slept = []
+    api = ReplayAdapter(cassette, speed=None).mount(
+        API(DOMAIN, API_KEY, retry=Retry(total=3, sleep=slept.append))
+    )
+    with pytest.raises(CassetteMiss):
+        api.groups.list_groups()
+    assert slept == []
+
+
+@pytest.mark.parametrize("speed,factor", [(1, 1.0), (4, 0.25)])
+def test_replay_latency(cassette, speed, factor):
+    slept = []
+    api = replay_api(cassette, speed=speed, sleep=slept.append)
+    api.contacts.get_contact(1)
+    recorded = [i for i in load_cassette(cassette) if i["url"] == "contacts/1"][0]["latency"]
+    assert slept == [pytest.approx(recorded * factor)]
+
+
+def test_replay_full_speed(cassette):
+    slept = []
+    replay_api(cassette, speed=None, sleep=slept.append).contacts.get_contact(1)
+    assert slept == []
+
+
+def test_uncompressed_cassette(tmp_path):
+    path = str(tmp_path / "crawl.jsonl")
+    with FakeFreshdesk() as server:
+        server.add("groups", name="Support")
+        api = RecordingAdapter(path).mount(server.client())
+        api.groups.get_group(1)
+        api._session.close()
+    with open(path) as f:
+        assert len(f.readlines()) == 2
+    assert replay_api(path, speed=None).groups.get_group(1).name == "Support"
+
+
+def test_not_a_cassette(tmp_path):
+    path = tmp_path / "other.jsonl"
+    path.write_text(u'{"foo": 1}\n')
+    with pytest.raises(ValueError):
+        ReplayAdapter(str(path))
@@ -0,0 +1,136 @@
+import pytest
+import requests
+import responses
+
+from freshdesk.v2.api import API
+from freshdesk.v2.errors import FreshdeskNotFound, FreshdeskRateLimited, FreshdeskServerError
+from freshdesk.v2.retry import Retry
+from freshdesk.v2.tests.conftest import DOMAIN
+
+TICKET_URL = "https://{}/api/v2/tickets/1".format(DOMAIN)
+TICKET = {"id": 1, "subject": "Retried", "created_at": "2020-01-01T00:00:00Z", "updated_at": "2020-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def slept():
+    return []
+
+
+@pytest.fixture
+def retry(slept):
+    return Retry(total=3, sleep=slept.append, random=lambda: 1.0)
+
+
+@pytest.fixture
+def api(retry):
+    return API(DOMAIN, "test_key", retry=retry)
+
+
+@responses.activate
+def test_retries_server_errors(api, slept):
+    responses.add(responses.GET, TICKET_URL, status=502)
+    responses.add(responses.GET, TICKET_URL, status=503)
+    responses.add(responses.GET, TICKET_URL, json=TICKET)
+
+    assert api.tickets.get_ticket(1).subject == "Retried"
+    assert len(responses.calls) == 3
+    # Exponential back-off: 0.5 * 2 ** attempt
+    assert slept == [0.5, 1.0]
+
+
+@responses.activate
+def test_retries_internal_server_error(api, slept):
+    responses.add(responses.GET, TICKET_URL, status=500)
+    responses.add(responses.GET, TICKET_URL, json=TICKET)
+
+    assert api.tickets.get_ticket(1).subject == "Retried"
+    assert len(responses.calls) == 2
+    assert slept == [0.5]
+
+
+@responses.activate
+def test_internal_server_error_is_a_server_error(slept):
+    responses.add(responses.GET, TICKET_URL, status=500)
+
+    with pytest.raises(FreshdeskServerError):
+        API(DOMAIN, "test_key").tickets.get_ticket(1)
+
+
+@responses.activate
+def test_honours_retry_after(api, slept):
+    responses.add(responses.GET, TICKET_URL, status=429, headers={"Retry-After": "12"})
+    responses.add(responses.GET, TICKET_URL, json=TICKET)
+
+    assert api.tickets.get_ticket(1).id == 1
+    assert slept == [12.0]
+
+
+@responses.activate
+def test_retries_connection_errors(api, slept):
+    responses.add(responses.GET, TICKET_URL, body=requests.ConnectionError("Connection reset by peer"))
+    responses.add(responses.GET, TICKET_URL, json=TICKET)
+
+    assert api.tickets.get_ticket(1).id == 1
+    assert len(slept) == 1
+
+
+@responses.activate
+def test_gives_up_after_total(api, slept):
+    for _ in range(4):
+        responses.add(responses.GET, TICKET_URL, status=502)
+
+    with pytest.raises(FreshdeskServerError):
+        api.tickets.get_ticket(1)
+    assert len(responses.calls) == 4
+    assert slept == [0.5, 1.0, 2.0]
+
+
+@responses.activate
+def test_does_not_retry_client_errors(api, slept):
+    responses.add(responses.GET, TICKET_URL, status=404)
+
+    with pytest.raises(FreshdeskNotFound):
+        api.tickets.get_ticket(1)
+    assert slept == []
+
+
+@responses.activate
+def test_put_retried(api):
+    responses.add(responses.PUT, TICKET_URL, status=502)
+    responses.add(responses.PUT, TICKET_URL, json=TICKET)
+
+    assert api.tickets.update_ticket(1, subject="Retried").id == 1
+
+
+@responses.activate
+def test_post_not_retried_by_default(api, slept):
+    responses.add(responses.POST, "https://{}/api/v2/tickets".format(DOMAIN), status=429, headers={"Retry-After": "1"})
+
+    with pytest.raises(FreshdeskRateLimited):
+        api.tickets.create_ticket("Not retried", email="test@example.com")
+    assert slept == []
+
+
+@responses.activate
+def test_post_retried_when_opted_in(slept):
+    api = API(DOMAIN, "test_key", retry=Retry(retry_post=True, sleep=slept.append))
+    url = "https://{}/api/v2/tickets".format(DOMAIN)
+    responses.add(responses.POST, url, status=429, headers={"Retry-After": "1"})
+    responses.add(responses.POST, url, json=TICKET)
+
+    assert api.tickets.create_ticket("Retried", email="test@example.com").id == 1
+    assert slept == [1.0]
+
+
+def test_jitter_is_capped():
+    retry = Retry(backoff_factor=10, max_backoff=15, random=lambda: 1.0)
+    assert retry.backoff(FreshdeskServerError("502"), 5) == 15
+
+
+@responses.activate
+def test_errors_carry_response():
+    responses.add(responses.GET, TICKET_URL, status=429, headers={"Retry-After": "5"})
+    api = API(DOMAIN, "test_key")
+    with pytest.raises(FreshdeskRateLimited) as e:
+        api.tickets.get_ticket(1)
+    assert e.value.response.headers["Retry-After"] == "5"
@@ -0,0 +1,129 @@
+import datetime
+import re
+import warnings
+
+import pytest
+
+from freshdesk.v2.api import API, _partition_query, _split_search
+from freshdesk.v2.errors import FreshdeskBadRequest
+from freshdesk.v2.models import Company, Contact, Ticket
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN
+
+RANGE = re.compile(r"(\w+):>'([\d-]+)' AND \1:<'([\d-]+)'")
+
+
+class SearchAPI(API):
+    """Answers filter queries like Freshdesk: pages of 30 and at most 10 pages, honouring
+    created_at/updated_at ranges (inclusive) and ignoring the rest of the query."""
+
+    def __init__(self, records, *args, **kwargs):
+        super(SearchAPI, self).__init__(*args, **kwargs)
+        self.records = records
+        self.queries = []
+
+    def _get(self, url, params=None):
+        page, query = re.search(r'page=(\d+)&query="(.*)"$', url).groups()
+        page = int(page)
+        self.queries.append((query, page))
+        if page > 10:
+            raise FreshdeskBadRequest("page must be at most 10")
+        matches = self.records
+        for field, start, end in RANGE.findall(query):
+            matches = [r for r in matches if start <= r[field][:10] <= end]
+        return {"results": matches[(page - 1) * 30:page * 30], "total": len(matches)}
+
+
+def records(n, per_day, same_created_day=False):
+    start = datetime.datetime(2020, 1, 1)
+    result = []
+    for i in range(n):
+        created = start if same_created_day else start + datetime.timedelta(days=i // per_day)
+        updated = start + datetime.timedelta(days=i // per_day)
+        result.append(
+            {
+                "id": i + 1,
+                "subject": "Ticket {}".format(i + 1),
+                "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "updated_at": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    return result
+
+
+def test_capped_without_exhaustive():
+    api = SearchAPI(records(500, 50), DOMAIN, API_KEY)
+    with pytest.warns(UserWarning, match="exhaustive=True"):
+        tickets = api.tickets.filter_tickets("status:2")
+    assert len(tickets) == 300
+
+
+def test_exhaustive_fetches_everything():
+    api = SearchAPI(records(1000, 50), DOMAIN, API_KEY)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        tickets = api.tickets.filter_tickets("status:2", exhaustive=True)
+    assert sorted(t.id for t in tickets) == list(range(1, 1001))
+    assert all(isinstance(t, Ticket) for t in tickets)
+    # Every range queried stays within the page limit
+    assert max(page for _, page in api.queries) <= 10
+
+
+def test_exhaustive_small_query_is_not_split():
+    api = SearchAPI(records(45, 50), DOMAIN, API_KEY)
+    contacts = api.contacts.filter_contacts("time_zone:Brisbane", exhaustive=True)
+    assert len(contacts) == 45
+    assert isinstance(contacts[0], Contact)
+    assert api.queries == [("time_zone:Brisbane", 1), ("time_zone:Brisbane", 2)]
+
+
+def test_exhaustive_splits_busy_days_by_updated_at():
+    api = SearchAPI(records(400, 100, same_created_day=True), DOMAIN, API_KEY)
+    companies = api.companies.filter_companies("domain:example.com", exhaustive=True)
+    assert sorted(c.id for c in companies) == list(range(1, 401))
+    assert isinstance(companies[0], Company)
+    assert any("updated_at" in query for query, _ in api.queries)
+
+
+def test_exhaustive_warns_when_a_day_exceeds_the_cap():
+    data = records(350, 350, same_created_day=True)
+    api = SearchAPI(data, DOMAIN, API_KEY)
+    with pytest.warns(UserWarning, match="single day"):
+        tickets = api.tickets.filter_tickets("status:2", exhaustive=True)
+    assert len(tickets) == 300
+
+
+def test_exhaustive_in_parallel():
+    api = SearchAPI(records(1000, 50), DOMAIN, API_KEY, page_concurrency=4)
+    tickets = api.tickets.filter_tickets("status:2", exhaustive=True)
+    assert len(set(t.id for t in tickets)) == len(tickets) == 1000
+
+
+def test_exhaustive_dedupes():
+    data = records(400, 50)
+    # Freshdesk's ranges are inclusive, so a record can match two adjacent ones
+    api = SearchAPI(data + data[:10], DOMAIN, API_KEY)
+    tickets = api.tickets.filter_tickets("status:2", exhaustive=True)
+    assert len(tickets) == 400
+
+
+def test_partition_query():
+    assert _partition_query("status:2", ()) == "status:2"
+    conditions = (("created_at", datetime.date(2020, 1, 1), datetime.date(2020, 1, 31)),)
+    assert _partition_query("status:2", conditions) == (
+        "(status:2) AND created_at:>'2020-01-01' AND created_at:<'2020-01-31'"
+    )
+    with pytest.raises(AttributeError):
+        _partition_query("a" * 500, conditions)
+
+
+def test_split_search():
+    day = datetime.date(2020, 1, 1)
+    first, second = _split_search((("created_at", day, day + datetime.timedelta(days=9)),))
+    assert first == (("created_at", day, day + datetime.timedelta(days=4)),)
+    assert second == (("created_at", day + datetime.timedelta(days=5), day + datetime.timedelta(days=9)),)
+
+    first, second = _split_search((("created_at", day, day),))
+    assert first[0] == ("created_at", day, day)
+    assert first[1][0] == "updated_at" and first[1][1] == day
+
+    assert _split_search((("created_at", day, day), ("updated_at", day, day))) is None
@@ -0,0 +1,140 @@
+import datetime
+import os
+
+import pytest
+from dateutil.tz import tzutc
+
+from freshdesk.v2.api import API
+from freshdesk.v2.fakeserver import FakeFreshdesk
+from freshdesk.v2.sync import (
+    FileCheckpointStore,
+    MemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    TicketSync,
+    format_timestamp,
+)
+from freshdesk.v2.tests.conftest import API_KEY, DOMAIN
+
+
+class TicketStoreAPI(API):
+    """Serves tickets from memory, honouring updated_since and ascending updated_at order."""
+
+    def __init__(self, *args, **kwargs):
+        self.records = {}
+        self.requests = []
+        super(TicketStoreAPI, self).__init__(*args, **kwargs)
+
+    def touch(self, id, updated_at):
+        self.records[id] = {"id": id, "subject": "Ticket %d" % id, "created_at": updated_at, "updated_at": updated_at}
+
+    def _get(self, url, params={}):
+        self.requests.append(dict(params))
+        assert params["order_by"] == "updated_at" and params["order_type"] == "asc"
+        since = params.get("updated_since", "")
+        tickets = sorted(
+            (t for t in self.records.values() if t["updated_at"] >= since), key=lambda t: (t["updated_at"], t["id"])
+        )
+        page = int(url.split("page=")[1].split("&")[0])
+        per_page = params.get("per_page", 100)
+        return tickets[(page - 1) * per_page:page * per_page]
+
+
+@pytest.fixture
+def api():
+    api = TicketStoreAPI(DOMAIN, API_KEY)
+    for i in range(1, 6):
+        api.touch(i, "2020-01-01T00:0%d:00Z" % i)
+    return api
+
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def store(request, tmpdir):
+    if request.param == "memory":
+        return MemoryCheckpointStore()
+    if request.param == "file":
+        return FileCheckpointStore(os.path.join(str(tmpdir), "checkpoints.json"))
+    return SQLiteCheckpointStore(os.path.join(str(tmpdir), "checkpoints.db"))
+
+
+def ids(tickets):
+    return [t.id for t in tickets]
+
+
+def test_format_timestamp():
+    assert format_timestamp(datetime.datetime(2020, 1, 2, 3, 4, 5)) == "2020-01-02T03:04:05Z"
+    aware = datetime.datetime(2020, 1, 2, 13, 4, 5, tzinfo=tzutc())
+    assert format_timestamp(aware) == "2020-01-02T13:04:05Z"
+
+
+def test_first_run_from_start(api, store):
+    sync = TicketSync(api, store, start=datetime.datetime(2019, 1, 1))
+    assert ids(sync.run()) == [1, 2, 3, 4, 5]
+    assert api.requests[0]["updated_since"] == "2019-01-01T00:00:00Z"
+    assert sync.high_water_mark == datetime.datetime(2020, 1, 1, 0, 5, tzinfo=tzutc())
+
+
+def test_incremental_runs(api, store):
+    sync = TicketSync(api, store, overlap=120)
+    list(sync.run())
+
+    assert ids(sync.run()) == []
+    # Resumes from the high-water mark less the overlap
+    assert api.requests[-1]["updated_since"] == "2020-01-01T00:03:00Z"
+
+    api.touch(2, "2020-01-01T00:06:00Z")
+    api.touch(6, "2020-01-01T00:07:00Z")
+    assert ids(sync.run()) == [2, 6]
+
+
+def test_late_commit_inside_overlap(api, store):
+    sync = TicketSync(api, store, overlap=120)
+    list(sync.run())
+    # A ticket whose timestamp is before the high-water mark, but only became visible now
+    api.touch(7, "2020-01-01T00:04:30Z")
+    assert ids(sync.run()) == [7]
+
+
+def test_resume_after_crash(api, store):
+    sync = TicketSync(api, store, overlap=0, checkpoint_every=1)
+    processed = []
+    with pytest.raises(RuntimeError):
+        for ticket in sync.run():
+            if ticket.id == 3:
+                raise RuntimeError("worker crashed")
+            processed.append(ticket.id)
+
+    assert processed == [1, 2]
+    # Ticket 3 was not processed, so it is delivered again
+    assert ids(TicketSync(api, store, overlap=0).run()) == [3, 4, 5]
+
+
+def test_named_checkpoints(api, store):
+    list(TicketSync(api, store, name="a").run())
+    assert ids(TicketSync(api, store, name="b").run()) == [1, 2, 3, 4, 5]
+    assert ids(TicketSync(api, store, name="a").run()) == []
+
+
+def test_ticket_updated_during_crawl(store):
+    with FakeFreshdesk(seed=7) as server:
+        server.populate(tickets=250)
+        api = server.client()
+        sync = TicketSync(api, store, start=datetime.datetime(2000, 1, 1))
+
+        delivered = []
+        for ticket in sync.run():
+            delivered.append(ticket.id)
+            if len(delivered) == 50:
+                # Moves ticket 1 to the end of the updated_at ordering
+                api.tickets.update_ticket(1, subject="Changed mid-crawl")
+
+        assert sorted(set(delivered)) == list(range(1, 251))
+        # The new version of ticket 1 is delivered again, at the end
+        assert delivered[-1] == 1
+        assert ids(sync.run()) == []
+
+
+def test_page_of_tickets_with_the_same_timestamp(api, store):
+    for i in range(6, 12):
+        api.touch(i, "2020-01-01T00:05:00Z")
+    sync = TicketSync(api, store, per_page=2)
+    assert ids(sync.run()) == list(range(1, 12))
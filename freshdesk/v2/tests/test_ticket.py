@@ -81,24 +81,29 @@ def test_create_ticket_with_attachments(api):
             attachments=(attachment_path,),
         )
 
-    post_mock.assert_called_once_with(
-        "tickets",
-        data={
-            "subject": "This is a sample ticket with an attachment",
-            "status": 2,
-            "priority": 1,
-            "description": "This is a sample ticket, feel free to delete it.",
-            "email": "test@example.com",
+    assert post_mock.call_count == 1
+    (url,), kwargs = post_mock.call_args
+    encoder = kwargs["data"]
+    assert url == "tickets"
+    # The multipart/form-data content type (with its boundary) replaces the default of application/json.
+    assert kwargs["headers"] == {"Content-Type": encoder.content_type}
+    assert encoder.content_type.startswith("multipart/form-data; boundary=")
+    assert sorted(encoder.fields) == sorted(
+        [
+            ("subject", b"This is a sample ticket with an attachment"),
+            ("status", b"2"),
+            ("priority", b"1"),
+            ("description", b"This is a sample ticket, feel free to delete it."),
+            ("email", b"test@example.com"),
             # List argument names should be sent as arrays, otherwise it's not deserialized correctly.
-            "cc_emails[]": ["test2@example.com", "test3@example.com"],
+            ("cc_emails[]", b"test2@example.com"),
+            ("cc_emails[]", b"test3@example.com"),
             # Dict arguments must unrolled into indexed arrays to work properly with the form-data encoding.
-            "custom_fields[power]": 11,
-            "custom_fields[importance]": "very",
-        },
-        files=[("attachments[]", ("attachment.txt", ANY, None))],
-        # Content-type should be unset so that `requests` uses "multipart/form-data" instead of application/json.
-        headers={"Content-Type": None},
+            ("custom_fields[power]", b"11"),
+            ("custom_fields[importance]", b"very"),
+        ]
     )
+    assert [(name, attachment.filename) for name, attachment in encoder.files] == [("attachments[]", "attachment.txt")]
 
     assert isinstance(ticket, Ticket)
     assert ticket.subject == "This is a sample ticket"
@@ -216,3 +221,61 @@ def test_updated_since_filter(api):
     tickets = api.tickets.list_tickets(updated_since="2014-01-01")
     assert isinstance(tickets, list)
     assert len(tickets) == 1
+
+
+def test_bulk_update_tickets(api):
+    with patch.object(api, "_post", wraps=api._post) as post_mock:
+        jobs = api.tickets.bulk_update_tickets([1, 2], status=4, tags=["reviewed"])
+
+    post_mock.assert_called_once_with("tickets/bulk_update", data=ANY)
+    assert json.loads(post_mock.call_args[1]["data"]) == {
+        "bulk_action": {"ids": [1, 2], "properties": {"status": 4, "tags": ["reviewed"]}}
+    }
+    assert len(jobs) == 1
+    assert jobs[0]["status"] == "SUCCESS"
+    assert jobs[0]["data"][1] == {"id": 2, "success": True}
+
+
+def test_bulk_delete_tickets_chunks(api):
+    with patch.object(api, "_post", wraps=api._post) as post_mock:
+        jobs = api.tickets.bulk_delete_tickets(range(1, 251), wait=False)
+
+    assert post_mock.call_count == 3
+    chunks = [json.loads(c[1]["data"])["bulk_action"]["ids"] for c in post_mock.call_args_list]
+    assert [len(ids) for ids in chunks] == [100, 100, 50]
+    assert chunks[2][-1] == 250
+    assert [job["job_id"] for job in jobs] == ["e5f7b2a1"] * 3
+
+
+def test_bulk_update_polls_until_finished(api):
+    statuses = iter(["QUEUED", "IN PROGRESS", "SUCCESS"])
+
+    def get_job(job_id):
+        return {"id": job_id, "status": next(statuses)}
+
+    with patch.object(api.jobs, "get_job", side_effect=get_job) as get_job_mock, patch(
+        "freshdesk.v2.api.time.sleep"
+    ) as sleep_mock:
+        jobs = api.tickets.bulk_update_tickets([1], poll_interval=5, priority=4)
+
+    assert get_job_mock.call_count == 3
+    assert sleep_mock.call_count == 2
+    sleep_mock.assert_called_with(5)
+    assert jobs == [{"id": "e5f7b2a1", "status": "SUCCESS"}]
+
+
+def test_bulk_update_gives_up_after_timeout(api):
+    clock = [0.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    with patch.object(api.jobs, "get_job", return_value={"id": "e5f7b2a1", "status": "IN PROGRESS"}) as get_job_mock, patch(
+        "freshdesk.v2.api.time.sleep", side_effect=sleep
+    ), patch("freshdesk.v2.api._monotonic", lambda: clock[0]):
+        jobs = api.tickets.bulk_update_tickets([1], poll_interval=5, timeout=12, priority=4)
+
+    # Polled at 0, 5 and 10 seconds; another wait would pass the timeout
+    assert get_job_mock.call_count == 3
+    assert clock[0] == 10
+    assert jobs == [{"id": "e5f7b2a1", "status": "IN PROGRESS"}]
@@ -10,6 +10,7 @@ setup(
     author_email="sam@sjkwi.com.au",
     description="An API for the Freshdesk helpdesk",
     url="https://github.com/sjkingo/python-freshdesk",
-    install_requires=["requests", "python-dateutil"],
+    install_requires=["requests", "python-dateutil", 'enum34; python_version < "3.4"'],
+    extras_require={"orjson": ["orjson"], "ujson": ["ujson"]},
     packages=find_packages(),
 )